@@ -129,6 +129,11 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("🔄 Shutting down PocketPro:SBA server...")
+    try:
+        from backend.services.sba_async_client import close_async_sba_client
+        await close_async_sba_client()
+    except Exception as e:
+        logger.warning(f"SBA client shutdown error: {e}")
 
 # Root endpoint
 @app.get("/")
@@ -261,27 +266,49 @@ async def decompose_task(task: TaskDecomposition):
         logger.error(f"Task decomposition error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# SBA Content Routes
+# SBA Content Routes (async client: pooled keep-alive/HTTP2 transport, same envelopes as /api/sba)
+def get_sba_client():
+    """Dependency to get the shared async SBA content client"""
+    from backend.services.sba_async_client import get_async_sba_client
+    return get_async_sba_client()
+
 @app.get("/api/sba/articles")
-async def search_sba_articles(q: str = "", limit: int = 10):
+async def search_sba_articles(q: str = "", limit: int = 10, page: int = 1, sba: Any = Depends(get_sba_client)):
     """Search SBA articles"""
     try:
-        # Implement SBA article search
-        return {"articles": [], "query": q, "limit": limit}
+        result = await sba.search_articles(query=q, page=page) if q else await sba.search_articles(page=page)
+        return {**result, "articles": result.get("items", [])[:limit], "query": q, "limit": limit}
     except Exception as e:
         logger.error(f"SBA articles search error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/sba/courses")
-async def search_sba_courses(q: str = "", limit: int = 10):
+async def search_sba_courses(q: str = "", limit: int = 10, page: int = 1, sba: Any = Depends(get_sba_client)):
     """Search SBA courses"""
     try:
-        # Implement SBA course search
-        return {"courses": [], "query": q, "limit": limit}
+        result = await sba.search_courses(query=q, page=page) if q else await sba.search_courses(page=page)
+        return {**result, "courses": result.get("items", [])[:limit], "query": q, "limit": limit}
     except Exception as e:
         logger.error(f"SBA courses search error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/sba/content/{route}")
+async def sba_content(route: str, q: str = "", page: int = 1, fresh: bool = False, sba: Any = Depends(get_sba_client)):
+    """Any SBA browse route (articles, blogs, courses, documents, events, lenders, offices, loans, sbir)"""
+    from backend.services.sba_async_client import ROUTE_METHODS
+    if route not in ROUTE_METHODS:
+        raise HTTPException(status_code=404, detail=f"Unknown SBA content route: {route}")
+    params: Dict[str, Any] = {"page": page}
+    if q:
+        params["query"] = q
+    if fresh:
+        params["fresh"] = True
+    try:
+        return await sba.search(route, **params)
+    except Exception as e:
+        logger.error(f"SBA {route} search error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Helper functions
 async def process_chat_message(message: str, chroma_service) -> str:
     """Process chat message with RAG"""
@@ -341,4 +368,4 @@ if __name__ == "__main__":
         port=port,
         reload=os.environ.get("FLASK_ENV") == "development",
         workers=1 if os.environ.get("FLASK_ENV") == "development" else 4
-    )9
\ No newline at end of file
+    )
\ No newline at end of file
@@ -78,6 +78,12 @@ def create_app(config_name=None):
     app.config.from_object(config_class)
     # Must wrap after app exists; applied so all blueprints see rewritten paths
     app.wsgi_app = CompatPathRewriteMiddleware(app.wsgi_app)
+    # gzip/brotli for bare deployments; registered first so it runs after every other after_request hook
+    try:
+        from backend.services.compression import init_compression
+        init_compression(app)
+    except Exception as e:
+        logger.warning("Response compression not enabled: %s", e)
 
     # Log database configuration
     logger.info(f"Database URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
@@ -398,4 +404,19 @@ def create_app(config_name=None):
         logger.exception('Internal Server Error: %s', error)
         return jsonify({"error": "Internal Server Error"}), 500
 
+    # Build the local knowledge-base index once, before gunicorn forks workers
+    if os.getenv("KB_INDEX_WARM", "true").strip().lower() not in ("0", "false", "no", "off"):
+        try:
+            from backend.routes.rag import _kb_index
+            _kb_index().refresh()
+        except Exception as e:
+            logger.warning("KB index not built at startup: %s", e)
+
+    # Keep SBA catalog routes warm off the request path (SBA_PREWARM_ENABLED=true)
+    try:
+        from backend.services.sba_prewarm import start_prewarmer
+        start_prewarmer(app)
+    except Exception as e:
+        logger.warning("SBA prewarm not started: %s", e)
+
     return app
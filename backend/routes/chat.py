@@ -7,6 +7,7 @@ from backend.services.chat_processing_service import (
     clear_conversation,
     get_concierge,
 )
+from backend.services.sparse_fields import shape_from_request
 
 logger = logging.getLogger(__name__)
 chat_bp = Blueprint('chat', __name__)
@@ -101,7 +102,7 @@ def post_message():
         except Exception as link_err:
             logger.debug('chat link normalize soft-fail: %s', link_err)
         # Return the processed response
-        return jsonify(response), 200 if response.get('success', True) else 500
+        return jsonify(shape_from_request(response)), 200 if response.get('success', True) else 500
 
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
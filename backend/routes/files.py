@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import logging
 import os
+import uuid
 from datetime import datetime, timezone
 
 from flask import Blueprint, request, jsonify
@@ -85,7 +86,9 @@ def process_upload():
     content = _read_text(filepath, filename)
 
     rag_status = "not_available"
-    doc_id = f"doc_{int(datetime.now(timezone.utc).timestamp())}_{filename}"
+    # Unique per upload: chunk ids derive from it, and the same filename can
+    # be uploaded twice within a second
+    doc_id = f"doc_{uuid.uuid4().hex}_{filename}"
     chunks = _estimate_chunks(content, size)
     pages = "Unknown"
 
@@ -99,18 +102,22 @@ def process_upload():
                 "filepath": filepath,
                 "size": size,
                 "uploaded_at": datetime.now(timezone.utc).isoformat(),
+                "doc_id": doc_id,
             }
-            result = rag_manager.add_document(content, metadata)
+            # Chunked, and written/embedded in bulk batches rather than one call per chunk
+            from backend.services.vector_batch import chunk_text
+            texts = chunk_text(content) or [content]
+            result = rag_manager.add_documents_batch(
+                texts,
+                [{**metadata, "chunk_index": i, "total_chunks": len(texts)} for i in range(len(texts))],
+                [f"{doc_id}:{i}" for i in range(len(texts))],
+            )
             if isinstance(result, dict) and result.get("error"):
                 logger.warning("RAG ingest soft-fail: %s", result.get("error"))
                 rag_status = "save_only"
             else:
-                rag_status = "added"
-                if isinstance(result, dict) and result.get("ids"):
-                    ids = result["ids"]
-                    doc_id = ids[0] if isinstance(ids, list) and ids else ids
-                elif isinstance(result, dict) and result.get("id"):
-                    doc_id = result["id"]
+                rag_status = "partial" if isinstance(result, dict) and result.get("errors") else "added"
+                chunks = len(texts)
         else:
             rag_status = "not_available"
     except Exception as e:
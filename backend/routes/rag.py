@@ -9,7 +9,9 @@ from backend.services.api_service import (
     validate_step_service,
     query_documents_service,
 )
+from backend.services.kb_index import get_kb_index, query_terms
 from backend.services.rag import get_rag_manager
+from backend.services.sparse_fields import shape_from_request
 
 logger = logging.getLogger(__name__)
 
@@ -101,9 +103,9 @@ def _static_sba_overview():
     }
 
 
-def _normalize_kb_text(value: str) -> str:
-    """Compact alphanumerics only so 7(a)/7-a/7A all match token 7a."""
-    return re.sub(r"[^a-z0-9]+", "", (value or "").lower())
+def _kb_index():
+    """Process-wide BM25 index over the knowledge-base roots (built at startup)."""
+    return get_kb_index(_knowledge_base_roots)
 
 
 def _local_kb_sba_answer(question: str, max_chunks: int = 4):
@@ -111,74 +113,52 @@ def _local_kb_sba_answer(question: str, max_chunks: int = 4):
     Lightweight keyword retrieval over local knowledge_base text files.
     Used when Gemini embeddings / enhanced RAG are unavailable — no new deps.
     """
-    q_spaced = re.sub(r"[^a-z0-9\s]", " ", (question or "").lower())
-    q_compact = _normalize_kb_text(question)
-    tokens = [t for t in re.findall(r"[a-z0-9]{3,}", q_spaced) if t not in {
-        "the", "and", "for", "what", "how", "are", "with", "from", "this", "that",
-        "can", "does", "about", "loan", "loans", "sba",  # too common in all docs
-    }]
-    # High-signal SBA terms (including short codes like 7a / 504)
-    for keep in ("7a", "504", "microloan", "express", "eligibility", "rate", "rates"):
-        if keep in q_compact and keep not in tokens:
-            tokens.append(keep)
+    tokens = query_terms(question)
 
+    # Index lookup instead of reading every knowledge_base file per question.
+    # Rescans happen on the index's background thread, not here.
+    index = _kb_index()
+    index.ensure_refresher()
+    hits = index.search(tokens) if tokens else [(1.0, doc) for doc in index.documents()]
     scored = []
-    seen_paths = set()
-    for root in _knowledge_base_roots():
-        if not root.exists():
-            continue
-        for path in root.rglob("*.txt"):
-            key = str(path.resolve())
-            if key in seen_paths:
-                continue
-            # Skip ingest manifests (metadata only)
-            if path.name.endswith("__manifest.txt"):
-                continue
-            seen_paths.add(key)
-            try:
-                text = path.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                continue
-            lower = text.lower()
-            compact = _normalize_kb_text(text)
-            score = sum(compact.count(tok) for tok in tokens) if tokens else 1
-            if score <= 0:
-                continue
-            # Boost live API digests written when browsing parent→children
-            path_str = str(path).replace("\\", "/")
-            if "sba_api_live" in path_str or path.name.startswith("api_sba_"):
-                score += 12
-                if "combined" in path.name:
-                    score += 4
-                if "overview" in path.name:
-                    score += 2
-            # Prefer a relevant paragraph/snippet from original text
-            snippet = text.strip()
-            if tokens:
-                idx_candidates = []
-                for tok in tokens:
-                    pos = lower.find(tok)
-                    if pos >= 0:
-                        idx_candidates.append(pos)
-                    else:
-                        # Map compact match approx onto original via digit/letter run
-                        cpos = compact.find(tok)
-                        if cpos >= 0 and tok[:1].isdigit():
-                            m = re.search(r"7\s*[\(\-]?\s*a", lower)
-                            if m:
-                                idx_candidates.append(m.start())
-                idx = min(idx_candidates) if idx_candidates else 0
-                start = max(0, idx - 120)
-                end = min(len(text), start + 600)
-                snippet = text[start:end].strip()
-                if start > 0:
-                    snippet = "..." + snippet
-                if end < len(text):
-                    snippet = snippet + "..."
-            scored.append((score, path.name, snippet, str(path)))
-
+    for score, doc in hits:
+        # Boost live API digests written when browsing parent→children
+        path_str = doc.path.replace("\\", "/")
+        if "sba_api_live" in path_str or doc.name.startswith("api_sba_"):
+            score += 12
+            if "combined" in doc.name:
+                score += 4
+            if "overview" in doc.name:
+                score += 2
+        scored.append((score, doc))
     scored.sort(key=lambda x: x[0], reverse=True)
-    top = scored[:max_chunks]
+
+    top = []
+    for score, doc in scored[:max_chunks]:
+        text = doc.text
+        # Prefer a relevant paragraph/snippet from original text
+        snippet = text.strip()
+        if tokens:
+            lower = text.lower()
+            idx_candidates = []
+            for tok in tokens:
+                pos = lower.find(tok)
+                if pos >= 0:
+                    idx_candidates.append(pos)
+                elif tok[:1].isdigit():
+                    # 7a is indexed from 7(a) / 7-a: locate the original spelling
+                    m = re.search(r"7\s*[\(\-]?\s*a", lower)
+                    if m:
+                        idx_candidates.append(m.start())
+            idx = min(idx_candidates) if idx_candidates else 0
+            start = max(0, idx - 120)
+            end = min(len(text), start + 600)
+            snippet = text[start:end].strip()
+            if start > 0:
+                snippet = "..." + snippet
+            if end < len(text):
+                snippet = snippet + "..."
+        top.append((round(score, 3), doc.name, snippet, doc.path))
 
     if not top:
         overview = _static_sba_overview()
@@ -394,7 +374,7 @@ def rag_root_query():
         except Exception as link_err:
             logger.warning('link enrichment soft-fail: %s', link_err)
 
-        return jsonify({
+        return jsonify(shape_from_request({
             'success': True,
             'query': query,
             'answer': answer,
@@ -405,7 +385,7 @@ def rag_root_query():
             'mode': mode,
             'is_current': bool(is_live),
             'freshness': 'current' if is_live else 'not_current',
-        }), 200
+        })), 200
     except Exception as e:
         logger.exception('POST /api/rag failed')
         return jsonify({
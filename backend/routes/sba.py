@@ -1,14 +1,28 @@
 """SBA content routes — multi-source public API consumption."""
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, g, request, jsonify
+import hashlib
 import logging
+import os
+import re
+import time
 from backend.services.SBA_Content import SBAContentAPI
+from backend.services.bounded_cache import BoundedTTLCache
+from backend.services.frozen_catalog import frozen_catalog, prebuilt_response
+from backend.services.sba_batch import batch_body, batch_stats, parse_entries, resolve_batch
+from backend.services.sparse_fields import compact, shape_options, shape_payload
 
 logger = logging.getLogger(__name__)
 
 sba_bp = Blueprint('sba', __name__)
 sba_api = SBAContentAPI()
 
+# Browser/proxy cache hints for envelope GETs (seconds)
+_ENVELOPE_MAX_AGE = int(os.getenv('SBA_ENVELOPE_MAX_AGE_SECONDS', '60'))
+_ENVELOPE_SWR = int(os.getenv('SBA_ENVELOPE_STALE_WHILE_REVALIDATE_SECONDS', '300'))
+# Build-time stamps (_now_iso: retrieved_at / created) — left out of the ETag hash
+_BUILD_STAMP_RE = re.compile(rb'"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}\+00:00"')
+
 
 def _page_args():
     query = request.args.get('query') or request.args.get('q') or ''
@@ -101,60 +115,131 @@ def _normalize_item(raw, index=0):
     return item
 
 
+# Digest memo: envelopes for the same items + parameters (every page view of a
+# cached catalog) reuse one frozen topic/digestion instead of recomputing it.
+_DIGESTS = BoundedTTLCache(
+    max_bytes=int(os.getenv('SBA_DIGEST_CACHE_MAX_BYTES', str(4 * 1024 * 1024))),
+    max_entries=int(os.getenv('SBA_DIGEST_CACHE_MAX_ENTRIES', '512')),
+    default_ttl=float(os.getenv('SBA_DIGEST_CACHE_TTL_SECONDS', '600')),
+)
+
+
+def _item_type(it):
+    return str((it or {}).get('type') or 'content').strip() or 'content'
+
+
+def _digest_key(items, params):
+    """Hash of the item fields the digest reads, plus the digest parameters."""
+    try:
+        fields = tuple(
+            (
+                it.get('id'), it.get('type'), it.get('title'), it.get('name'),
+                it.get('path'), it.get('url'), it.get('link'), bool(it.get('resources')),
+            )
+            for it in items
+            if isinstance(it, dict)
+        )
+        return (len(items), hash(fields), hash(params))
+    except TypeError:
+        return None  # unhashable field values — compute without the memo
+
+
+def _digest_size(digestion):
+    # Bounded by the 50 ids / 5 previews kept per group; avoids re-serializing to size it
+    return 4096 + sum(48 * len(g['item_ids']) + 320 * len(g['preview']) for g in digestion['groups'])
+
+
 def _digest_payload(normalized_items, *, route='', title='', description='', source='', degraded=False,
                     is_current=False, message='', page=1, total_pages=1, extra=None):
     """
     World-class API digestion layer.
     Turns a raw item list into a topic page model: narrative, facets, groups, next actions.
     Additive — never removes items/results contract fields.
+
+    Memoized by item content + parameters. Returned dicts are fresh shallow copies
+    (callers may set top-level keys); nested values are shared — do not mutate them.
     """
     items = list(normalized_items or [])
+    params = (
+        route, title, description, source, bool(degraded), bool(is_current), message, page, total_pages,
+        tuple(sorted(extra.items())) if isinstance(extra, dict) else None,
+    )
+    key = _digest_key(items, params)
+    hit = _DIGESTS.get(key) if key is not None else None
+    if hit is None:
+        hit = _build_digest(items, *params[:-1], extra=extra)
+        if key is not None:
+            _DIGESTS.set(key, hit, size=_digest_size(hit[1]))
+    topic, digestion = hit
+    return dict(topic), dict(digestion)
+
+
+def _build_digest(items, route, title, description, source, degraded, is_current, message, page,
+                  total_pages, extra=None):
+    """One pass over ``items`` for counts, groups, highlights and related routes."""
     type_counts = {}
+    group_ids = {}
+    group_previews = {}
+    top_titles = []
+    related_routes = []
+    seen_routes = set()
     with_url = 0
     with_path = 0
     with_resources = 0
     for it in items:
-        t = str((it or {}).get('type') or 'content').strip() or 'content'
+        it = it or {}
+        t = _item_type(it)
         type_counts[t] = type_counts.get(t, 0) + 1
-        if (it or {}).get('url') or (it or {}).get('link'):
+        if it.get('url') or it.get('link'):
             with_url += 1
-        if str((it or {}).get('path') or '').startswith('/api/'):
+        p = str(it.get('path') or '').strip()
+        if p.startswith('/api/'):
             with_path += 1
-        if (it or {}).get('resources'):
+        if it.get('resources'):
             with_resources += 1
+        ids = group_ids.setdefault(t, [])
+        if len(ids) < 50:
+            ids.append(it.get('id'))
+        previews = group_previews.setdefault(t, [])
+        if len(previews) < 5:
+            previews.append({
+                'id': it.get('id'),
+                'title': it.get('title') or it.get('name'),
+                'path': it.get('path') or '',
+                'url': it.get('url') or it.get('link') or '',
+            })
+        if len(top_titles) < 6:
+            top_titles.append(str(it.get('title') or it.get('name') or '').strip())
+        # Suggest natural next digests from item paths
+        if len(related_routes) < 8 and p.startswith('/api/') and p not in seen_routes and p != route:
+            seen_routes.add(p)
+            related_routes.append({
+                'path': p,
+                'title': it.get('title') or it.get('name') or p,
+                'type': it.get('type') or 'route',
+            })
 
+    ordered = sorted(type_counts.items(), key=lambda x: (-x[1], x[0]))
     facets = [
         {'id': 'all', 'label': 'All', 'count': len(items)},
     ]
-    for t, c in sorted(type_counts.items(), key=lambda x: (-x[1], x[0])):
+    # Group items by type for sectioned topic pages
+    groups = []
+    for t, c in ordered:
         facets.append({
             'id': t,
             'label': t.replace('_', ' ').title(),
             'count': c,
         })
-
-    # Group items by type for sectioned topic pages
-    groups = []
-    for t, c in sorted(type_counts.items(), key=lambda x: (-x[1], x[0])):
-        group_items = [it for it in items if str(it.get('type') or 'content') == t]
         groups.append({
             'id': t,
             'title': t.replace('_', ' ').title(),
             'count': c,
-            'item_ids': [it.get('id') for it in group_items[:50]],
-            'preview': [
-                {
-                    'id': it.get('id'),
-                    'title': it.get('title') or it.get('name'),
-                    'path': it.get('path') or '',
-                    'url': it.get('url') or it.get('link') or '',
-                }
-                for it in group_items[:5]
-            ],
+            'item_ids': group_ids[t],
+            'preview': group_previews[t],
         })
 
     # Topic narrative (fully develop the subject of this route)
-    top_titles = [str(it.get('title') or it.get('name') or '').strip() for it in items[:6]]
     top_titles = [t for t in top_titles if t]
     brief_bits = []
     if description:
@@ -174,21 +259,6 @@ def _digest_payload(normalized_items, *, route='', title='', description='', sou
         brief_bits.append('No resources were returned for this route yet. Try refresh or another endpoint.')
 
     topic_title = title or (route.rsplit('/', 1)[-1].replace('-', ' ').replace('_', ' ').title() if route else 'SBA Topic')
-    related_routes = []
-    # Suggest natural next digests from item paths
-    seen_routes = set()
-    for it in items:
-        p = str(it.get('path') or '').strip()
-        if p.startswith('/api/') and p not in seen_routes and p != route:
-            seen_routes.add(p)
-            related_routes.append({
-                'path': p,
-                'title': it.get('title') or it.get('name') or p,
-                'type': it.get('type') or 'route',
-            })
-        if len(related_routes) >= 8:
-            break
-
     steps = [
         {'id': 'resolve', 'label': 'Resolve route', 'status': 'done', 'detail': route or 'catalog'},
         {'id': 'fetch', 'label': 'Fetch API', 'status': 'done' if not degraded or items else 'warn',
@@ -285,7 +355,7 @@ def _envelope(result, page=1, *, route='', title=''):
             [], route=route, title=title or 'SBA Topic', degraded=True,
             message='Unexpected SBA client response', page=page, total_pages=0,
         )
-        return {
+        return _remember_envelope({
             'items': [],
             'results': [],
             'totalPages': 0,
@@ -299,7 +369,7 @@ def _envelope(result, page=1, *, route='', title=''):
             'render_policy': 'current_unless_rag',
             'topic': topic,
             'digestion': digestion,
-        }
+        })
 
     # Hard error with no items → still try to surface message; callers may attach fallbacks
     if result.get('error') and not result.get('items') and not result.get('results'):
@@ -309,7 +379,7 @@ def _envelope(result, page=1, *, route='', title=''):
             message=result.get('message') or result.get('error'),
             source=result.get('source', 'unknown'), page=page, total_pages=0,
         )
-        return {
+        return _remember_envelope({
             'items': [],
             'results': [],
             'totalPages': 0,
@@ -323,7 +393,7 @@ def _envelope(result, page=1, *, route='', title=''):
             'render_policy': 'current_unless_rag',
             'topic': topic,
             'digestion': digestion,
-        }
+        })
 
     items = result.get('items')
     if items is None:
@@ -465,7 +535,12 @@ def _envelope(result, page=1, *, route='', title=''):
         from backend.services.sba_rag_ingest import schedule_sba_rag_ingest
 
         if normalized or (topic and (topic.get('description') or topic.get('sections'))):
-            schedule_sba_rag_ingest(env, route=resolved_route, title=resolved_title)
+            try:
+                # Search / filtered views are partial: upsert their chunks but prune nothing
+                filtered = any(request.args.get(k) for k in ('query', 'q', 'cursor', 'agency', 'firm', 'year'))
+            except RuntimeError:
+                filtered = False
+            schedule_sba_rag_ingest(env, route=resolved_route, title=resolved_title, prune=not filtered)
             env['rag_ingest'] = {
                 'scheduled': True,
                 'route': resolved_route,
@@ -475,9 +550,101 @@ def _envelope(result, page=1, *, route='', title=''):
     except Exception as rag_err:
         logger.debug('SBA RAG ingest schedule soft-fail: %s', rag_err)
         env['rag_ingest'] = {'scheduled': False, 'error': str(rag_err)}
+    return _remember_envelope(env)
+
+
+def _remember_envelope(env):
+    """Note the envelope's freshness for the response's Cache-Control (see _conditional_get)."""
+    try:
+        g.sba_envelope = {
+            'is_current': bool(env.get('is_current')),
+            'degraded': bool(env.get('degraded')),
+            'freshness': env.get('freshness'),
+        }
+    except RuntimeError:
+        pass  # built outside a request (prewarm / batch helpers)
     return env
 
 
+def _cache_control(meta):
+    if not meta:
+        return 'no-cache'
+    if meta['is_current'] and not meta['degraded'] and meta['freshness'] == 'current':
+        return f'public, max-age={_ENVELOPE_MAX_AGE}, stale-while-revalidate={_ENVELOPE_SWR}'
+    # Snapshot / static / degraded: keep a copy but revalidate (cheap with the ETag)
+    return 'no-cache'
+
+
+def _prebuilt_json(key, build):
+    """Serve a catalog-only route from its build-once body (strong ETag, 304 via _conditional_get)."""
+    fields, compact_mode = shape_options(request)
+    if compact_mode and not fields:
+        # The compact body is as static as the full one — prebuild it too
+        key, build = f'{key}?compact', (lambda full=build: compact(full()))
+        g.sba_shaped = True
+    pre = prebuilt_response(key, build, current_app.json.dumps)
+    response = current_app.response_class(pre.body, mimetype='application/json')
+    response.set_etag(pre.etag)
+    response.headers['X-Catalog-Version'] = pre.version
+    g.sba_envelope = {'is_current': True, 'degraded': False, 'freshness': 'current'}
+    return response
+
+
+@sba_bp.after_request
+def _conditional_get(response):
+    """
+    Content-hash ETag on JSON GETs, 304 for a matching If-None-Match, and
+    Cache-Control from the envelope's freshness. The ETag is weak: build
+    timestamps are excluded, so an identical catalog rebuilt later still matches.
+    """
+    if (
+        request.method not in ('GET', 'HEAD')
+        or response.status_code != 200
+        or response.mimetype != 'application/json'
+        or response.direct_passthrough
+    ):
+        return response
+    try:
+        if 'ETag' not in response.headers:
+            body = response.get_data()
+            digest = hashlib.sha1(_BUILD_STAMP_RE.sub(b'""', body)).hexdigest()[:32]
+            response.set_etag(digest, weak=True)
+        if 'Cache-Control' not in response.headers:
+            response.headers['Cache-Control'] = _cache_control(g.get('sba_envelope'))
+        response.make_conditional(request)
+    except Exception as e:
+        logger.debug('SBA conditional GET skipped: %s', e)
+    return response
+
+
+@sba_bp.after_request
+def _sparse_fieldsets(response):
+    """
+    ``?fields=`` projection and ``?compact=1`` (see sparse_fields). Registered
+    after _conditional_get so it runs first: the ETag covers the shaped body.
+    """
+    if (
+        response.status_code != 200
+        or response.mimetype != 'application/json'
+        or response.direct_passthrough
+        or g.get('sba_shaped')
+    ):
+        return response
+    fields, compact_mode = shape_options(request)
+    if not (fields or compact_mode):
+        return response
+    try:
+        payload = response.get_json(silent=True)
+        shaped = shape_payload(payload, fields, compact_mode)
+        if shaped is not payload:
+            response.set_data(current_app.json.dumps(shaped))
+            response.headers.pop('ETag', None)  # a prebuilt strong ETag describes the full body
+    except Exception as e:
+        logger.debug('SBA sparse fieldset skipped: %s', e)
+    return response
+
+
+@frozen_catalog
 def _sba_program_cards():
     """Cards for SBA Programs tab (prebuilt SPA + SBAContent)."""
     site = 'https://www.sba.gov'
@@ -602,6 +769,7 @@ def _lifecycle_option(name, description, url, opt_type='guide', path=''):
     }
 
 
+@frozen_catalog
 def _sba_lifecycle_cards():
     """Cards for Business Lifecycle tab. Each has assigned resources for drill-down."""
     site = 'https://www.sba.gov'
@@ -793,6 +961,7 @@ def _lifecycle_stage_by_id(stage_id):
     return None
 
 
+@frozen_catalog
 def _sba_local_resource_cards():
     """Cards for Local Resources tab."""
     site = 'https://www.sba.gov'
@@ -942,7 +1111,12 @@ def list_resources():
     2) Prebuilt SPA SBA Programs panel expects:
          sbaPrograms, businessLifecycleStages, localResourceTypes
        (fetched via GET /api/sba/resources — without these keys the cards render blank).
+    Body is catalog-only, so it is built and serialized once per process.
     """
+    return _prebuilt_json('resources', _resources_payload)
+
+
+def _resources_payload():
     resources = [
         {
             'id': 'loans',
@@ -1070,7 +1244,7 @@ def list_resources():
     # Do NOT flatten loan children into the programs catalog — parent SBA Loans
     # owns children via path=/api/sba/content/loans (parent → children navigation).
 
-    return jsonify({
+    return {
         # Browse / resources.html navigation
         'resources': resources,
         'count': len(resources),
@@ -1089,12 +1263,16 @@ def list_resources():
         'programs': sba_programs,
         'lifecycle': lifecycle,
         'local': local,
-    }), 200
+    }
 
 
 @sba_bp.route('/programs', methods=['GET'])
 def list_sba_program_cards():
     """Dedicated programs cards endpoint — fully digested topic list."""
+    return _prebuilt_json('programs', _programs_envelope)
+
+
+def _programs_envelope():
     cards = _sba_program_cards()
     raw = {
         'items': cards,
@@ -1109,12 +1287,16 @@ def list_sba_program_cards():
     }
     env = _envelope(raw, 1, route='/api/sba/programs', title='SBA Programs')
     env['status'] = 'ok'
-    return jsonify(env), 200
+    return env
 
 
 @sba_bp.route('/lifecycle', methods=['GET'])
 def list_sba_lifecycle_cards():
     """Business lifecycle cards — digested for topic navigation."""
+    return _prebuilt_json('lifecycle', _lifecycle_envelope)
+
+
+def _lifecycle_envelope():
     cards = _sba_lifecycle_cards()
     raw = {
         'items': cards,
@@ -1129,7 +1311,7 @@ def list_sba_lifecycle_cards():
     }
     env = _envelope(raw, 1, route='/api/sba/lifecycle', title='Business Lifecycle')
     env['status'] = 'ok'
-    return jsonify(env), 200
+    return env
 
 
 @sba_bp.route('/lifecycle/<stage_id>', methods=['GET'])
@@ -1285,6 +1467,10 @@ def get_sba_lifecycle_stage(stage_id):
 @sba_bp.route('/local-resources', methods=['GET'])
 def list_sba_local_cards():
     """Local resource partner cards — digested topic list."""
+    return _prebuilt_json('local-resources', _local_resources_envelope)
+
+
+def _local_resources_envelope():
     cards = _sba_local_resource_cards()
     raw = {
         'items': cards,
@@ -1299,7 +1485,7 @@ def list_sba_local_cards():
     }
     env = _envelope(raw, 1, route='/api/sba/local-resources', title='Local Resources')
     env['status'] = 'ok'
-    return jsonify(env), 200
+    return env
 
 
 @sba_bp.route('/sources', methods=['GET'])
@@ -1312,6 +1498,38 @@ def source_status():
         return jsonify({'error': str(e)}), 500
 
 
+@sba_bp.route('/sources/cache', methods=['GET'])
+def source_cache_stats():
+    """In-process SBA cache counters (no upstream probes)."""
+    from backend.services.SBA_Content import sba_cache_stats
+    from backend.services.compression import compression_stats
+    from backend.services.frozen_catalog import prebuilt_stats
+    from backend.services.sba_prewarm import prewarm_status
+    return jsonify({**sba_cache_stats(), 'prewarm': prewarm_status(), 'frozen_catalogs': prebuilt_stats(),
+                    'digests': _DIGESTS.stats(), 'compression': compression_stats(),
+                    'batch': batch_stats()}), 200
+
+
+@sba_bp.route('/batch', methods=['POST'])
+def batch_routes():
+    """
+    Resolve several GET /api/sba/* routes in one round trip (see sba_batch).
+
+    Body: {"requests": ["/api/sba/programs",
+                        {"path": "/api/sba/content/articles", "params": {"page": 2}, "key": "articles"}],
+           "compact": true}
+    Returns {"responses": {key: {"path", "status", "etag", "body"}}, "count", "failed", ...}.
+    """
+    entries, error = parse_entries(request.get_json(silent=True))
+    if error:
+        return jsonify({'success': False, 'error': error, 'responses': {}}), 400
+    started = time.monotonic()
+    results = resolve_batch(current_app._get_current_object(), entries, request.headers)
+    body = batch_body(entries, results, (time.monotonic() - started) * 1000)
+    g.sba_shaped = True  # entries were shaped individually
+    return current_app.response_class(body, mimetype='application/json'), 200
+
+
 @sba_bp.route('/content/articles', methods=['GET'])
 def search_articles():
     query, page, force_fresh = _page_args()
@@ -1408,6 +1626,7 @@ def _with_child_paths(parent_path, items):
     return out
 
 
+@frozen_catalog
 def _contracting_children():
     """Government Contracting parent → certification/program children."""
     site = 'https://www.sba.gov'
@@ -1481,6 +1700,7 @@ def _contracting_children():
     return _with_child_paths(parent, items)
 
 
+@frozen_catalog
 def _disaster_children():
     """Disaster Assistance parent → disaster resource children."""
     site = 'https://www.sba.gov'
@@ -1721,6 +1941,10 @@ def _explore_as_parent(parent_key, child_id):
 @sba_bp.route('/content/contracting', methods=['GET'])
 def list_contracting():
     """Government Contracting parent → contract programs/certifications children."""
+    return _prebuilt_json('contracting', _contracting_envelope)
+
+
+def _contracting_envelope():
     items = _contracting_children()
     raw = {
         'items': items,
@@ -1734,7 +1958,7 @@ def list_contracting():
         'is_current': True,
         'message': f'{len(items)} contracting programs under Government Contracting.',
     }
-    return jsonify(_envelope(raw, 1, route='/api/sba/content/contracting', title='Government Contracting')), 200
+    return _envelope(raw, 1, route='/api/sba/content/contracting', title='Government Contracting')
 
 
 @sba_bp.route('/content/contracting/<child_id>', methods=['GET'])
@@ -1752,6 +1976,10 @@ def explore_contracting_child(child_id):
 @sba_bp.route('/content/disaster', methods=['GET'])
 def list_disaster():
     """Disaster Assistance parent → disaster loan/resource children."""
+    return _prebuilt_json('disaster', _disaster_envelope)
+
+
+def _disaster_envelope():
     items = _disaster_children()
     raw = {
         'items': items,
@@ -1765,7 +1993,7 @@ def list_disaster():
         'is_current': True,
         'message': f'{len(items)} disaster resources under Disaster Assistance.',
     }
-    return jsonify(_envelope(raw, 1, route='/api/sba/content/disaster', title='Disaster Assistance')), 200
+    return _envelope(raw, 1, route='/api/sba/content/disaster', title='Disaster Assistance')
 
 
 @sba_bp.route('/content/disaster/<child_id>', methods=['GET'])
@@ -1873,7 +2101,8 @@ def search_sbir():
     """
     SBIR/STTR public awards API.
     Docs: https://www.sbir.gov/api
-    Query params: query/firm, agency, year, page, rows, fresh
+    Query params: query/firm, agency, year, page, rows, fresh, cursor
+    (``cursor`` = a previous response's ``next_cursor``; it carries the filters)
     """
     query, page, force_fresh = _page_args()
     agency = request.args.get('agency')
@@ -1896,8 +2125,11 @@ def search_sbir():
             firm=firm,
             rows=rows,
             page=page,
+            fresh=force_fresh,
+            cursor=request.args.get('cursor') or None,
         )
         env = _envelope(result, page)
+        env['next_cursor'] = (result or {}).get('next_cursor')
         return jsonify(env), 200
     except Exception as e:
         logger.error("Error searching SBIR awards: %s", e)
@@ -46,21 +46,54 @@ Normalized response shape for route handlers:
     "degraded": bool,   # True when not live primary API
     "message": optional str
   }
+
+Caching (per upstream URL):
+  per-process _CACHE (SBA_CACHE_TTL_SECONDS; LRU within SBA_CACHE_MAX_BYTES)
+    → shared cross-worker store (sba_http_cache; ETag / Last-Modified revalidation)
+    → stale-while-revalidate until SBA_CACHE_STALE_SECONDS, refreshed off-thread
+  ?fresh=1 skips cached bodies and revalidates synchronously.
+  search_* browse pages are kept in an offline snapshot (sba_snapshot) so a
+  cold or cut-off worker serves last-known-live pages, rebuilding off-thread.
+  Upstream hosts are paced by token buckets (SBA_RATE_LIMITS) that honor
+  Retry-After; background refreshes are shed instead of queued.
+  Per-source circuit breakers (legacy_json / sbir / sba_html) skip upstreams
+  that keep failing; 404/410 URLs are negatively cached (SBA_NEGATIVE_CACHE_SECONDS).
+  Multi-page routes fetch their URLs concurrently (SBA_FETCH_WORKERS) under a
+  per-request deadline (SBA_FETCH_DEADLINE_SECONDS); output keeps URL order.
 """
 
 from __future__ import annotations
 
+import contextvars
+import functools
+import hashlib
 import logging
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from html.parser import HTMLParser
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlencode
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlencode, urlparse
 
 import requests
 
+from backend.services.bounded_cache import BoundedTTLCache
+from backend.services.catalog_index import IndexCache, rank_items
+from backend.services.circuit_breaker import OPEN, CircuitBreaker
+from backend.services.paginator import decode_cursor, encode_cursor, prefetching_pages
+from backend.services.rate_limiter import HostRateLimiter, parse_retry_after
+from backend.services.sba_http_cache import (
+    conditional_headers,
+    entry_age,
+    get_http_cache,
+    make_entry,
+)
+from backend.services.sba_snapshot import VERSION as SNAPSHOT_VERSION, get_snapshot_store
+from backend.services.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 # --- Public bases (overridable via env for future portal keys / mirrors) ---
@@ -85,8 +118,19 @@ DEFAULT_HEADERS = {
 
 # Short TTL so non-RAG rendered SBA info stays current.
 # Static/RAG content is never claimed as "current".
-_CACHE: Dict[str, Tuple[float, Any]] = {}
+# Per-process L1 (byte-budgeted LRU, see bounded_cache); the cross-worker
+# store (with ETag/Last-Modified) lives in sba_http_cache and is consulted on
+# L1 miss.
 _CACHE_TTL = int(os.getenv("SBA_CACHE_TTL_SECONDS", "90"))
+_CACHE = BoundedTTLCache(
+    max_bytes=int(os.getenv("SBA_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    max_entries=int(os.getenv("SBA_CACHE_MAX_ENTRIES", "2000")),
+    default_ttl=_CACHE_TTL,
+)
+# Stale-while-revalidate window: past the TTL but inside this hard bound an
+# entry is served immediately and refreshed in the background; past it the
+# request blocks on upstream again.
+_CACHE_STALE_SECONDS = max(_CACHE_TTL, int(os.getenv("SBA_CACHE_STALE_SECONDS", "900")))
 _LIVE_SOURCES = frozenset({"legacy_json", "sbir", "sba_html", "sba_html+live"})
 
 
@@ -94,19 +138,22 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _stable_id(*parts: Any) -> int:
+    """Deterministic numeric id (``hash()`` is salted per process under PYTHONHASHSEED=random)."""
+    raw = "\x1f".join(str(p) for p in parts)
+    return int(hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12], 16) % (10**10)
+
+
+def _json_cache_key(url: str, params: Optional[dict] = None) -> str:
+    return f"json:{url}?{urlencode(params or {}, doseq=True)}"
+
+
 def _cache_get(key: str) -> Optional[Any]:
-    item = _CACHE.get(key)
-    if not item:
-        return None
-    expires, value = item
-    if time.time() > expires:
-        _CACHE.pop(key, None)
-        return None
-    return value
+    return _CACHE.get(key)
 
 
 def _cache_set(key: str, value: Any, ttl: int = _CACHE_TTL) -> None:
-    _CACHE[key] = (time.time() + ttl, value)
+    _CACHE.set(key, value, ttl=ttl)
 
 
 def clear_sba_cache() -> None:
@@ -114,6 +161,292 @@ def clear_sba_cache() -> None:
     _CACHE.clear()
 
 
+def sba_cache_stats() -> Dict[str, Any]:
+    """Per-process cache counters (hits/misses/evictions/bytes) for sizing workers."""
+    return {
+        "l1": _CACHE.stats(),
+        "shared_backend": getattr(get_http_cache(), "backend", "unknown"),
+        "single_flight": _inflight.stats(),
+        "rate_limits": _RATE_LIMITER.stats(),
+        "catalog_index": _INDEXES.stats(),
+        "snapshot": (get_snapshot_store().stats() if get_snapshot_store() else {"enabled": False}),
+    }
+
+
+def _shared_lookup(
+    cache_key: str, force_fresh: bool
+) -> Tuple[Optional[Dict[str, Any]], Any, bool]:
+    """
+    Consult the cross-worker HTTP cache.
+
+    Returns (entry, value, stale):
+      - value set, stale False → inside TTL, serve as-is
+      - value set, stale True  → past TTL but inside the hard bound; serve now,
+        caller schedules a background refresh
+      - value None             → miss, hard-expired, or force_fresh; fetch now.
+    entry is returned either way so its validators go on the revalidation request.
+    """
+    entry = get_http_cache().get(cache_key)
+    if not entry or force_fresh:
+        return entry, None, False
+    age = entry_age(entry)
+    if age <= _CACHE_TTL:
+        return entry, entry.get("value"), False
+    if age <= _CACHE_STALE_SECONDS:
+        return entry, entry.get("value"), True
+    return entry, None, False
+
+
+# One upstream fetch per cache key at a time; concurrent misses wait on it.
+_inflight = SingleFlight()
+
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refreshing: set = set()
+_refresh_lock = threading.Lock()
+
+
+def _schedule_refresh(cache_key: str, refresh) -> None:
+    """Run ``refresh()`` off the request thread; at most one per cache key."""
+    global _refresh_executor
+    with _refresh_lock:
+        if cache_key in _refreshing:
+            return
+        _refreshing.add(cache_key)
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("SBA_REFRESH_WORKERS", "2")),
+                thread_name_prefix="sba-refresh",
+            )
+
+    def _run():
+        try:
+            refresh()
+        except Exception as e:
+            logger.debug("SBA background refresh failed %s: %s", cache_key, e)
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(cache_key)
+
+    try:
+        _refresh_executor.submit(_run)
+    except RuntimeError as e:
+        # Executor shut down (interpreter exit) — stale value is still served
+        with _refresh_lock:
+            _refreshing.discard(cache_key)
+        logger.debug("SBA background refresh not scheduled: %s", e)
+
+
+# Per-source circuit breakers: a dead or throttling upstream costs no network
+# time until its cool-down lets one probe through. Defaults reflect known
+# behaviour — the legacy JSON API has been 404ing, SBIR rate-limits often.
+def _source_breaker(name: str, threshold: int, cooldown: float) -> CircuitBreaker:
+    env = name.upper()
+    return CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv(f"SBA_BREAKER_{env}_THRESHOLD", str(threshold))),
+        cooldown_seconds=float(os.getenv(f"SBA_BREAKER_{env}_COOLDOWN", str(cooldown))),
+    )
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {
+    "legacy_json": _source_breaker("legacy_json", 1, 600),
+    "sbir": _source_breaker("sbir", 2, 120),
+    "sba_html": _source_breaker("sba_html", 5, 30),
+}
+# 404/410 for a specific URL is remembered this long (no refetch).
+_NEGATIVE_TTL = int(os.getenv("SBA_NEGATIVE_CACHE_SECONDS", "300"))
+# Statuses that mean "source unhealthy" rather than "bad request".
+_BREAKER_STATUSES = frozenset({404, 408, 410, 429, 500, 502, 503, 504})
+
+
+# Client-side pacing per upstream host; SBIR publishes no limit but 429s
+# readily, so it gets a slow bucket. Override with SBA_RATE_LIMITS.
+_RATE_LIMITER = HostRateLimiter(
+    {(urlparse(SBIR_API_BASE).hostname or "").lower(): (1.0, 3)},
+    default=(8.0, 16),
+    overrides=os.getenv("SBA_RATE_LIMITS", ""),
+)
+
+
+# Browse pages (no free-text filters) of each search_* route are kept in the
+# offline snapshot; a newer-than-this snapshot is served at once while the
+# route rebuilds in the background, an older one only when live sources fail.
+_SNAPSHOT_MAX_AGE = int(os.getenv("SBA_SNAPSHOT_MAX_AGE_SECONDS", str(24 * 3600)))
+_SNAPSHOT_KEY_PARAMS = frozenset({"page", "rows", "start"})
+
+
+def _snapshot_key(route: str, args: tuple, params: Dict[str, Any]) -> Optional[str]:
+    if args:
+        return None
+    keyed = {k: v for k, v in params.items() if v and k not in ("fresh", "force_fresh")}
+    if set(keyed) - _SNAPSHOT_KEY_PARAMS:
+        return None
+    keyed["page"] = int(keyed.get("page") or 1)
+    return f"route:{route}?{urlencode(sorted(keyed.items()))}"
+
+
+def _is_live_page(result: Any) -> bool:
+    return (
+        isinstance(result, dict)
+        and bool(result.get("items"))
+        and bool(result.get("is_current"))
+        and not result.get("degraded")
+    )
+
+
+def _from_snapshot(entry: Dict[str, Any], *, current: bool) -> Dict[str, Any]:
+    page = dict(entry["page"])
+    page["freshness"] = "snapshot"
+    page["snapshot"] = {
+        "stored_at": entry.get("stored_at"),
+        "age_seconds": int(entry_age(entry)),
+        "version": SNAPSHOT_VERSION,
+    }
+    if not current:
+        page["is_current"] = False
+        page["degraded"] = True
+        page["message"] = (
+            "Live SBA sources unavailable; showing last-known live content "
+            f"retrieved {page.get('retrieved_at') or 'earlier'}."
+        )
+    return page
+
+
+def _snapshot_route(route: str):
+    """
+    Wrap a ``search_*`` method so its browse pages survive cold starts and outages:
+    L1 route result → snapshot (served now, rebuilt off-thread) → live build,
+    with the snapshot replacing a static fallback when live sources fail.
+    """
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **params):
+            key = _snapshot_key(route, args, params)
+            store = get_snapshot_store() if key else None
+            if store is None:
+                return fn(self, *args, **params)
+            force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
+            if not force_fresh:
+                cached = _cache_get(key)
+                if cached is not None:
+                    return cached
+
+            def build():
+                result = fn(self, *args, **params)
+                if _is_live_page(result):
+                    _cache_set(key, result, ttl=_CACHE_TTL)
+                    store.put(key, result)
+                return result
+
+            snap = store.get(key)
+            if snap and not force_fresh and entry_age(snap) <= _SNAPSHOT_MAX_AGE:
+                _schedule_refresh(key, build)
+                return _from_snapshot(snap, current=True)
+            result = build()
+            if snap and not _is_live_page(result):
+                return _from_snapshot(snap, current=False)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+# Source status: status key → (breaker, base URL getter). Active probe
+# results are cached; passive health is read from the breakers.
+_STATUS_SOURCES = {
+    "legacy_content_api": ("legacy_json", lambda api: api.base_url),
+    "sbir_api": ("sbir", lambda api: SBIR_API_BASE),
+    "sba_html": ("sba_html", lambda api: SBA_SITE),
+}
+_PROBE_TTL = float(os.getenv("SBA_STATUS_PROBE_TTL_SECONDS", "60"))
+_PROBE_DEADLINE = float(os.getenv("SBA_STATUS_PROBE_DEADLINE_SECONDS", "3"))
+_probe_results: Dict[str, Dict[str, Any]] = {}
+_probe_lock = threading.Lock()
+
+
+def _probe_due(name: str) -> bool:
+    """Probe only when neither real traffic nor a probe has checked it within the TTL."""
+    now = time.time()
+    outcome = _BREAKERS[_STATUS_SOURCES[name][0]].last_outcome()
+    if outcome and now - outcome[1] <= _PROBE_TTL:
+        return False
+    with _probe_lock:
+        probe = _probe_results.get(name)
+    return not probe or now - probe["checked_at"] > _PROBE_TTL
+
+
+def _merged_health(name: str, base: str, breaker: CircuitBreaker) -> Dict[str, Any]:
+    """Newest of passive (real traffic) and active (probe) outcomes."""
+    health: Dict[str, Any] = {"base": base, "ok": False, "circuit": breaker.state}
+    with _probe_lock:
+        probe = dict(_probe_results.get(name) or {})
+    outcome = breaker.last_outcome()
+    if outcome and (not probe or outcome[1] >= probe.get("checked_at", 0)):
+        health.update({"ok": outcome[0], "checked_at": outcome[1], "via": "passive"})
+        if not outcome[0]:
+            health["error"] = breaker.snapshot().get("last_error")
+    elif probe:
+        health.update(probe)
+        health["via"] = "probe"
+    else:
+        health["via"] = "pending"
+    return health
+
+
+def reset_sba_breakers() -> None:
+    """Close every source breaker (tests / manual recovery)."""
+    for breaker in _BREAKERS.values():
+        breaker.reset()
+
+
+# Multi-page routes (loans, articles, offices, ...) fetch their URLs on this
+# bounded pool so a cold request costs roughly the slowest page, not the sum.
+_FETCH_WORKERS = max(1, int(os.getenv("SBA_FETCH_WORKERS", "6")))
+_FETCH_DEADLINE_SECONDS = float(os.getenv("SBA_FETCH_DEADLINE_SECONDS", "15"))
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+_fetch_executor_lock = threading.Lock()
+
+
+def _get_fetch_executor() -> ThreadPoolExecutor:
+    global _fetch_executor
+    if _fetch_executor is None:
+        with _fetch_executor_lock:
+            if _fetch_executor is None:
+                _fetch_executor = ThreadPoolExecutor(
+                    max_workers=_FETCH_WORKERS, thread_name_prefix="sba-fetch"
+                )
+    return _fetch_executor
+
+
+def _sbir_rows(data: Any) -> Optional[List[Any]]:
+    """Award rows of one SBIR API page; None when the fetch failed."""
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict) or data.get("error"):
+        return None
+    rows = data.get("awards") or data.get("results") or []
+    return rows if isinstance(rows, list) else []
+
+
+def _sbir_page_size(data: Any) -> Optional[int]:
+    rows = _sbir_rows(data)
+    return None if rows is None else len(rows)
+
+
+def _shared_store(cache_key: str, response: requests.Response, value: Any) -> None:
+    """Persist a 200 body plus its validators for every worker."""
+    get_http_cache().set(
+        cache_key,
+        make_entry(
+            value,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        ),
+    )
+
+
 class _PageContentParser(HTMLParser):
     """Extract links, headings, meta description, and visible paragraph text."""
 
@@ -266,6 +599,28 @@ def _snippet_from_parser(parser: _PageContentParser, max_len: int = 480) -> str:
     return text
 
 
+class _PageModel(NamedTuple):
+    """What the extractors use from a parsed page (far smaller than its HTML)."""
+
+    title: str
+    headings: Tuple[str, ...]
+    meta_description: str
+    paragraphs: Tuple[str, ...]
+    links: Tuple[Dict[str, str], ...]
+    snippet: str
+
+    @classmethod
+    def from_parser(cls, parser: _PageContentParser) -> "_PageModel":
+        return cls(
+            title=parser.title,
+            headings=tuple(parser.headings),
+            meta_description=parser.meta_description,
+            paragraphs=tuple(parser.paragraphs),
+            links=tuple(parser.links),
+            snippet=_snippet_from_parser(parser),
+        )
+
+
 def _as_card(
     raw: Any,
     index: int = 0,
@@ -341,7 +696,7 @@ def _as_card(
     if item_id in (None, ""):
         item_id = raw.get("nid") or raw.get("uuid")
     if item_id in (None, ""):
-        item_id = abs(hash((title.lower(), url))) % (10**10) or (index + 1)
+        item_id = _stable_id(title.lower(), url) or (index + 1)
 
     body_html = str(raw.get("body") or "").strip()
     if not body_html:
@@ -473,25 +828,18 @@ def _normalize_page(
     return out
 
 
+# Catalog token indexes, reused while a catalog's content is unchanged.
+_INDEXES = IndexCache(max_entries=int(os.getenv("SBA_INDEX_CACHE_ENTRIES", "64")))
+
+
 def _filter_items(items: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
     q = (query or "").strip().lower()
     # Empty, *, or wildcard-only → return full catalog (populate cards)
-    if not q or q in {"*", "%", "all", "any"}:
+    if not q or q in {"*", "%", "all", "any"} or not items:
         return items
-    tokens = [t for t in re.findall(r"[a-z0-9]{2,}", q) if t not in {"the", "and", "for", "sba"}]
-    if not tokens:
-        return items
-    scored = []
-    for item in items:
-        blob = " ".join(
-            str(item.get(k, "")) for k in ("title", "name", "description", "summary", "body", "url", "type")
-        ).lower()
-        score = sum(1 for t in tokens if t in blob)
-        if score:
-            scored.append((score, item))
-    scored.sort(key=lambda x: x[0], reverse=True)
+    ranked = rank_items(items, q, _INDEXES)
     # Prefer matches, but never empty the catalog — cards are the product surface
-    return [i for _, i in scored] if scored else items
+    return ranked or items
 
 
 class SBAContentAPI:
@@ -512,6 +860,34 @@ class SBAContentAPI:
         "loans_hub": f"{SBA_SITE}/funding-programs/loans",
     }
 
+    # Official pages each HTML-backed search_* route reads (async prefetch uses these too)
+    ROUTE_PAGES = {
+        "articles": [
+            f"{SBA_SITE}/business-guide",
+            f"{SBA_SITE}/funding-programs/loans",
+            f"{SBA_SITE}/federal-contracting",
+        ],
+        "blogs": [
+            f"{SBA_SITE}/blog",
+            f"{SBA_SITE}/about-sba/sba-newsroom/press-releases-media-advisories",
+        ],
+        "courses": [
+            f"{SBA_SITE}/sba-learning-platform",
+            f"{SBA_SITE}/local-assistance",
+            f"{SBA_SITE}/business-guide",
+        ],
+        "documents": [f"{SBA_SITE}/document", f"{SBA_SITE}/funding-programs/loans"],
+        "events": [
+            f"{SBA_SITE}/events",
+            f"{SBA_SITE}/local-assistance/find",
+            f"{SBA_SITE}/about-sba/sba-newsroom",
+        ],
+        "offices": [f"{SBA_SITE}/about-sba/sba-locations", f"{SBA_SITE}/local-assistance/find"],
+        "loans": list(LOAN_PAGES.values()),
+    }
+    # Routes that still try the legacy JSON search first
+    LEGACY_ROUTES = frozenset({"articles", "blogs", "courses", "documents", "events", "lenders", "offices"})
+
     def __init__(
         self,
         base_url: str = SBA_CONTENT_BASE,
@@ -533,23 +909,83 @@ class SBAContentAPI:
         params: Optional[dict] = None,
         timeout: int = 12,
         force_fresh: bool = False,
+        priority: str = "normal",
     ) -> Any:
-        cache_key = f"json:{url}?{urlencode(params or {}, doseq=True)}"
+        cache_key = _json_cache_key(url, params)
         if not force_fresh:
             cached = _cache_get(cache_key)
             if cached is not None:
                 return cached
+        entry, shared, stale = _shared_lookup(cache_key, force_fresh)
+        if shared is not None:
+            if stale:
+                _schedule_refresh(
+                    cache_key,
+                    lambda: _inflight.do(
+                        cache_key, lambda: self._fetch_json(cache_key, url, params, timeout, entry, "low")
+                    ),
+                )
+            else:
+                _cache_set(cache_key, shared, ttl=_CACHE_TTL)
+            return shared
+        return _inflight.do(
+            cache_key, lambda: self._fetch_json(cache_key, url, params, timeout, entry, priority)
+        )
+
+    def _fetch_json(
+        self,
+        cache_key: str,
+        url: str,
+        params: Optional[dict],
+        timeout: int,
+        entry: Optional[Dict[str, Any]] = None,
+        priority: str = "normal",
+    ) -> Any:
+        """Upstream JSON GET (conditional when ``entry`` carries validators)."""
+        breaker = self._breaker_for(url)
+        negative = _cache_get(f"neg:{cache_key}")
+        if negative is not None:
+            return {"error": f"HTTP {negative}", "status_code": negative, "success": False, "cached": True}
+        if breaker.state == OPEN:
+            return {"error": "circuit_open", "source": breaker.name, "success": False}
+        acquired, wait = _RATE_LIMITER.for_url(url).acquire(priority)
+        if not acquired:
+            return {"error": "rate_limited", "status_code": 429, "success": False, "shed": True, "retry_after": round(wait, 1)}
+        if not breaker.allow():
+            return {"error": "circuit_open", "source": breaker.name, "success": False}
         try:
-            response = self.session.get(url, params=params, timeout=timeout)
+            validators = conditional_headers(entry)
+            if validators:
+                response = self.session.get(url, params=params, timeout=timeout, headers=validators)
+            else:
+                response = self.session.get(url, params=params, timeout=timeout)
+            if response.status_code == 304 and entry:
+                # Unchanged upstream — reuse stored body, only headers crossed the wire
+                breaker.record_success()
+                get_http_cache().touch(cache_key)
+                _cache_set(cache_key, entry.get("value"), ttl=_CACHE_TTL)
+                return entry.get("value")
+            retry_after = self._honor_retry_after(url, response)
             if response.status_code == 429:
-                return {"error": "rate_limited", "status_code": 429, "success": False}
+                self._record_upstream_failure(breaker, cache_key, 429)
+                return {"error": "rate_limited", "status_code": 429, "success": False, "retry_after": retry_after}
+            if response.status_code in _BREAKER_STATUSES:
+                self._record_upstream_failure(breaker, cache_key, response.status_code)
+            else:
+                breaker.record_success()  # the source answered (even a 4xx is a live server)
             response.raise_for_status()
             data = response.json()
             _cache_set(cache_key, data, ttl=_CACHE_TTL)
+            _shared_store(cache_key, response, data)
             return data
+        except requests.HTTPError as e:
+            return {"error": str(e), "success": False}
         except requests.RequestException as e:
+            breaker.record_failure(str(e))
             return {"error": str(e), "success": False}
         except ValueError as e:
+            # HTML error page instead of JSON — treat the source as unhealthy
+            breaker.record_failure(f"invalid_json: {e}")
             return {"error": f"invalid_json: {e}", "success": False}
 
     def _get_html(
@@ -557,27 +993,208 @@ class SBAContentAPI:
         url: str,
         timeout: int = 15,
         force_fresh: bool = False,
+        priority: str = "normal",
     ) -> Optional[str]:
         cache_key = f"html:{url}"
         if not force_fresh:
             cached = _cache_get(cache_key)
             if cached is not None:
                 return cached
+        entry, shared, stale = _shared_lookup(cache_key, force_fresh)
+        if shared is not None:
+            if stale:
+                _schedule_refresh(
+                    cache_key,
+                    lambda: _inflight.do(
+                        cache_key, lambda: self._fetch_html(cache_key, url, timeout, entry, "low")
+                    ),
+                )
+            else:
+                _cache_set(cache_key, shared, ttl=_CACHE_TTL)
+            return shared
+        return _inflight.do(
+            cache_key, lambda: self._fetch_html(cache_key, url, timeout, entry, priority)
+        )
+
+    def _fetch_html(
+        self,
+        cache_key: str,
+        url: str,
+        timeout: int,
+        entry: Optional[Dict[str, Any]] = None,
+        priority: str = "normal",
+    ) -> Optional[str]:
+        """Upstream HTML GET (conditional when ``entry`` carries validators)."""
+        breaker = self._breaker_for(url)
+        if _cache_get(f"neg:{cache_key}") is not None or breaker.state == OPEN:
+            return None
+        acquired, wait = _RATE_LIMITER.for_url(url).acquire(priority)
+        if not acquired:
+            logger.debug("SBA HTML fetch shed (%s, wait %.1fs): %s", priority, wait, url)
+            return None
+        if not breaker.allow():
+            logger.debug("SBA HTML fetch skipped (%s circuit open): %s", breaker.name, url)
+            return None
         try:
             response = self.session.get(
                 url,
                 timeout=timeout,
-                headers={**DEFAULT_HEADERS, "Accept": "text/html,application/xhtml+xml"},
+                headers={
+                    **DEFAULT_HEADERS,
+                    "Accept": "text/html,application/xhtml+xml",
+                    **conditional_headers(entry),
+                },
             )
+            if response.status_code == 304 and entry:
+                breaker.record_success()
+                get_http_cache().touch(cache_key)
+                _cache_set(cache_key, entry.get("value"), ttl=_CACHE_TTL)
+                return entry.get("value")
+            self._honor_retry_after(url, response)
+            if response.status_code in _BREAKER_STATUSES:
+                self._record_upstream_failure(breaker, cache_key, response.status_code)
+            else:
+                breaker.record_success()
             response.raise_for_status()
             text = response.text
             # Keep live page HTML fresh (short TTL) so rendered SBA info stays current
             _cache_set(cache_key, text, ttl=_CACHE_TTL)
+            _shared_store(cache_key, response, text)
             return text
+        except requests.HTTPError as e:
+            logger.warning("SBA HTML fetch failed %s: %s", url, e)
+            return None
         except requests.RequestException as e:
+            breaker.record_failure(str(e))
             logger.warning("SBA HTML fetch failed %s: %s", url, e)
             return None
 
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        if url.startswith(self.base_url):
+            return _BREAKERS["legacy_json"]
+        if url.startswith(SBIR_API_BASE):
+            return _BREAKERS["sbir"]
+        return _BREAKERS["sba_html"]
+
+    def _honor_retry_after(self, url: str, response) -> Optional[float]:
+        """On 429/503, pause the host's bucket for the server's Retry-After."""
+        if response.status_code not in (429, 503):
+            return None
+        retry_after = parse_retry_after((response.headers or {}).get("Retry-After"))
+        if retry_after is None and response.status_code == 429:
+            retry_after = 5.0
+        if retry_after:
+            _RATE_LIMITER.for_url(url).block_for(retry_after)
+        return retry_after
+
+    def _record_upstream_failure(self, breaker: CircuitBreaker, cache_key: str, status: int) -> None:
+        """Count an unhealthy status; remember 404/410 for this URL."""
+        if status in (404, 410):
+            _cache_set(f"neg:{cache_key}", status, ttl=_NEGATIVE_TTL)
+            if breaker.name == "sba_html":
+                # One missing page says nothing about the rest of sba.gov
+                return
+        breaker.record_failure(f"HTTP {status}")
+
+    def _get_html_many(
+        self,
+        urls: List[str],
+        force_fresh: bool = False,
+        deadline: Optional[float] = None,
+    ) -> List[Optional[str]]:
+        """Fetch several pages concurrently; results line up with ``urls``."""
+        return self._fan_out(self._get_html, urls, force_fresh=force_fresh, deadline=deadline)
+
+    def _fan_out(
+        self,
+        fetch,
+        urls: List[str],
+        force_fresh: bool = False,
+        deadline: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Run ``fetch(url, force_fresh=...)`` for each URL on the fetch pool.
+
+        Pages that fail, or are still loading when ``deadline`` seconds pass,
+        come back as None. Late fetches keep running and land in the caches
+        for the next request.
+        """
+        if len(urls) <= 1:
+            return [fetch(url, force_fresh=force_fresh) for url in urls]
+        deadline = _FETCH_DEADLINE_SECONDS if deadline is None else deadline
+        try:
+            executor = _get_fetch_executor()
+            # Each task runs in a copy of the caller's context (rate-limit priority cap)
+            futures = [
+                executor.submit(contextvars.copy_context().run, fetch, url, force_fresh=force_fresh)
+                for url in urls
+            ]
+        except RuntimeError as e:
+            # Executor shut down (interpreter exit) — fall back to serial
+            logger.debug("SBA fan-out unavailable, fetching serially: %s", e)
+            return [fetch(url, force_fresh=force_fresh) for url in urls]
+        done, pending = wait(futures, timeout=deadline)
+        if pending:
+            logger.warning(
+                "SBA fan-out deadline (%.1fs) hit; %d of %d pages still loading",
+                deadline, len(pending), len(urls),
+            )
+        results: List[Any] = []
+        for url, future in zip(urls, futures):
+            if future not in done:
+                future.cancel()
+                results.append(None)
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning("SBA HTML fetch failed %s: %s", url, e)
+                results.append(None)
+        return results
+
+    def _get_page(self, url: str, force_fresh: bool = False) -> Optional[_PageModel]:
+        """
+        Parsed model of a live sba.gov page.
+
+        Models are cached by URL + content hash, so a warm request (or a 304 /
+        unchanged body) skips HTML parsing; the raw HTML is dropped from L1
+        once its model exists.
+        """
+        pointer_key = f"page:{url}"
+        if not force_fresh:
+            digest = _cache_get(pointer_key)
+            model = _cache_get(f"model:{url}:{digest}") if digest else None
+            if model is not None:
+                return model
+        html = self._get_html(url, force_fresh=force_fresh)
+        if not html:
+            return None
+        digest = hashlib.sha1(html.encode("utf-8", "replace")).hexdigest()
+        model_key = f"model:{url}:{digest}"
+        model = _cache_get(model_key)
+        if model is None:
+            model = _PageModel.from_parser(self._parse_page(html))
+            # Outlives the pointer so a revalidated, unchanged body reuses it
+            _cache_set(model_key, model, ttl=_CACHE_STALE_SECONDS)
+        _cache_set(pointer_key, digest, ttl=_CACHE_TTL)
+        _CACHE.delete(f"html:{url}")
+        return model
+
+    def _get_pages(self, urls: List[str], force_fresh: bool = False) -> List[Optional[_PageModel]]:
+        """Parsed models for ``urls`` (in order); only cold pages hit the fetch pool."""
+        pages: List[Optional[_PageModel]] = [None] * len(urls)
+        cold: List[int] = []
+        for i, url in enumerate(urls):
+            digest = None if force_fresh else _cache_get(f"page:{url}")
+            model = _cache_get(f"model:{url}:{digest}") if digest else None
+            if model is None:
+                cold.append(i)
+            pages[i] = model
+        fetched = self._fan_out(self._get_page, [urls[i] for i in cold], force_fresh=force_fresh)
+        for i, model in zip(cold, fetched):
+            pages[i] = model
+        return pages
+
     def _parse_page(self, html: str) -> _PageContentParser:
         parser = _PageContentParser()
         try:
@@ -599,11 +1216,10 @@ class SBAContentAPI:
             ("loans_hub", "SBA-backed loans overview", self.LOAN_PAGES["loans_hub"]),
         ]
         items: List[Dict[str, Any]] = []
-        for pid, fallback_title, url in programs:
-            html = self._get_html(url, force_fresh=force_fresh)
-            if not html:
+        pages = self._get_pages([url for _, _, url in programs], force_fresh=force_fresh)
+        for (pid, fallback_title, url), parser in zip(programs, pages):
+            if parser is None:
                 continue
-            parser = self._parse_page(html)
             title = fallback_title
             # Prefer first H1 when it looks like a page title
             for h in parser.headings[:3]:
@@ -615,7 +1231,7 @@ class SBAContentAPI:
                 t = parser.title.split("|")[0].strip()
                 if t:
                     title = t
-            description = _snippet_from_parser(parser)
+            description = parser.snippet
             if not description:
                 continue
             items.append(
@@ -817,10 +1433,9 @@ class SBAContentAPI:
         description = base.get("description") or base.get("summary") or ""
         # Prefer live page text when possible
         if url:
-            html = self._get_html(url, force_fresh=force_fresh)
-            if html:
-                parser = self._parse_page(html)
-                live_snip = _snippet_from_parser(parser)
+            parser = self._get_page(url, force_fresh=force_fresh)
+            if parser is not None:
+                live_snip = parser.snippet
                 if live_snip:
                     description = live_snip
                 # Extract child-like headings as section items
@@ -1071,12 +1686,10 @@ class SBAContentAPI:
         retrieved_at = _now_iso()
         page_summaries: List[Dict[str, Any]] = []
 
-        for url in urls:
-            html = self._get_html(url, force_fresh=force_fresh)
-            if not html:
+        for url, parser in zip(urls, self._get_pages(urls, force_fresh=force_fresh)):
+            if parser is None:
                 continue
-            parser = self._parse_page(html)
-            page_snippet = _snippet_from_parser(parser)
+            page_snippet = parser.snippet
 
             # One current page-level card from live meta/lead text
             if page_snippet:
@@ -1087,7 +1700,7 @@ class SBAContentAPI:
                         break
                 page_summaries.append(
                     {
-                        "id": abs(hash(("page", url))) % (10**10),
+                        "id": _stable_id("page", url),
                         "title": page_title,
                         "description": page_snippet,
                         "summary": page_snippet,
@@ -1124,7 +1737,7 @@ class SBAContentAPI:
                 )
                 items.append(
                     {
-                        "id": abs(hash(key)) % (10**10),
+                        "id": _stable_id(*key),
                         "title": title,
                         "description": desc,
                         "summary": desc,
@@ -1155,8 +1768,8 @@ class SBAContentAPI:
     # ------------------------------------------------------------------
     # SBIR public API
     # ------------------------------------------------------------------
-    def search_sbir_awards(
-        self,
+    @staticmethod
+    def _sbir_award_params(
         query: str = "",
         agency: Optional[str] = None,
         year: Optional[int] = None,
@@ -1165,14 +1778,13 @@ class SBAContentAPI:
         start: int = 0,
         page: int = 1,
     ) -> Dict[str, Any]:
-        """
-        Consume SBIR/STTR awards API.
-        Docs: https://www.sbir.gov/api
-        Example: https://api.www.sbir.gov/public/api/awards?agency=DOE&year=2010&rows=100
-        """
+        """Query string for GET /awards (shared with the async prefetch)."""
+        # Cards are served 50 per page at most (_normalize_page); larger upstream pages would be cut
+        capped = max(1, min(int(rows or 20), 50))
         params: Dict[str, Any] = {
-            "rows": max(1, min(rows, 100)),
-            "start": max(0, start if start else (max(page, 1) - 1) * rows),
+            "rows": capped,
+            # Offset from the capped size, so every page is reachable and distinct
+            "start": max(0, start if start else (max(page, 1) - 1) * capped),
         }
         if agency:
             params["agency"] = agency
@@ -1183,8 +1795,117 @@ class SBAContentAPI:
         # Free-text: map to firm search when query looks like a company, else no filter
         if query and not firm and not agency:
             params["firm"] = query
+        return params
+
+    def _sbir_request(
+        self,
+        query: str = "",
+        agency: Optional[str] = None,
+        year: Optional[int] = None,
+        firm: Optional[str] = None,
+        rows: int = 20,
+        start: int = 0,
+        page: int = 1,
+        cursor: Optional[str] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """(query, GET /awards params); a valid ``cursor`` replaces the filters and offset."""
+        state = decode_cursor(cursor)
+        saved = state.get("params") if state else None
+        if isinstance(saved, dict):
+            params = self._sbir_award_params(
+                "",
+                saved.get("agency"),
+                saved.get("year"),
+                saved.get("firm"),
+                int(saved.get("rows") or rows),
+                int(saved.get("start") or 0),
+            )
+            return str(state.get("query") or ""), params
+        return query, self._sbir_award_params(query, agency, year, firm, rows, start, page)
+
+    def iter_sbir_pages(
+        self, params: Dict[str, Any], fresh: bool = False, max_pages: Optional[int] = None
+    ):
+        """
+        Raw SBIR award pages from ``params["start"]`` on, as ``(start, data)``.
+        The next page is fetched (low priority, cached per offset) while the
+        current one is handled; iteration stops at a failed or short page.
+        """
+        url = f"{SBIR_API_BASE}/awards"
+        first = params["start"]
+
+        def fetch(offset: int, background: bool) -> Any:
+            return self._get_json(
+                url,
+                params={**params, "start": offset},
+                timeout=20,
+                force_fresh=fresh and offset == first,
+                priority="low" if background else "normal",
+            )
+
+        return prefetching_pages(
+            fetch,
+            _sbir_page_size,
+            first=first,
+            step=params["rows"],
+            executor=_get_fetch_executor(),
+            max_pages=max_pages,
+            timeout=_FETCH_DEADLINE_SECONDS,
+        )
+
+    def iter_sbir_awards(self, max_pages: Optional[int] = None, **filters):
+        """Award items across upstream pages (constant memory; see ``iter_sbir_pages``)."""
+        _, params = self._sbir_request(**filters)
+        for _, data in self.iter_sbir_pages(params, max_pages=max_pages):
+            for raw in _sbir_rows(data) or []:
+                if isinstance(raw, dict):
+                    yield self._sbir_award_item(raw)
+
+    @staticmethod
+    def _sbir_award_item(raw: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": raw.get("contract") or raw.get("agency_tracking_number"),
+            "title": raw.get("award_title") or raw.get("title") or "SBIR Award",
+            "description": (raw.get("abstract") or "")[:500],
+            "summary": (raw.get("abstract") or raw.get("award_title") or "SBIR award")[:240],
+            "url": raw.get("award_link") or "https://www.sbir.gov/awards",
+            "type": "sbir_award",
+            "agency": raw.get("agency"),
+            "firm": raw.get("firm"),
+            "phase": raw.get("phase"),
+            "program": raw.get("program"),
+            "award_amount": raw.get("award_amount"),
+            "award_year": raw.get("award_year"),
+            "raw": raw,
+        }
+
+    @_snapshot_route("sbir")
+    def search_sbir_awards(
+        self,
+        query: str = "",
+        agency: Optional[str] = None,
+        year: Optional[int] = None,
+        firm: Optional[str] = None,
+        rows: int = 20,
+        start: int = 0,
+        page: int = 1,
+        fresh: bool = False,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Consume SBIR/STTR awards API.
+        Docs: https://www.sbir.gov/api
+        Example: https://api.www.sbir.gov/public/api/awards?agency=DOE&year=2010&rows=100
 
-        data = self._get_json(f"{SBIR_API_BASE}/awards", params=params, timeout=20)
+        Live pages carry ``next_cursor`` while more awards remain; passing it
+        back as ``cursor`` continues the scroll (the next page is already
+        being fetched when this one is returned).
+        """
+        query, params = self._sbir_request(query, agency, year, firm, rows, start, page, cursor)
+        page = params["start"] // params["rows"] + 1
+        pages = self.iter_sbir_pages(params, fresh=fresh)
+        _, data = next(pages)
+        pages.close()  # read-ahead (if any) keeps running and lands in the cache
         if isinstance(data, dict) and data.get("error"):
             # Always populate cards — rate limits must not empty the UI
             return _normalize_page(
@@ -1193,31 +1914,12 @@ class SBAContentAPI:
                 source="static",
                 degraded=True,
                 is_current=False,
-                message=f"SBIR API unavailable ({data.get('error')}); showing official SBIR resource cards.",
+                message=f"SBIR API unavailable ({data.get('error')}); showing official SBIR resource cards."
+                + (f" Live awards retry in ~{int(data['retry_after'])}s." if data.get("retry_after") else ""),
             )
 
-        rows_data = data if isinstance(data, list) else data.get("awards") or data.get("results") or []
-        items = []
-        for raw in rows_data if isinstance(rows_data, list) else []:
-            if not isinstance(raw, dict):
-                continue
-            items.append(
-                {
-                    "id": raw.get("contract") or raw.get("agency_tracking_number"),
-                    "title": raw.get("award_title") or raw.get("title") or "SBIR Award",
-                    "description": (raw.get("abstract") or "")[:500],
-                    "summary": (raw.get("abstract") or raw.get("award_title") or "SBIR award")[:240],
-                    "url": raw.get("award_link") or "https://www.sbir.gov/awards",
-                    "type": "sbir_award",
-                    "agency": raw.get("agency"),
-                    "firm": raw.get("firm"),
-                    "phase": raw.get("phase"),
-                    "program": raw.get("program"),
-                    "award_amount": raw.get("award_amount"),
-                    "award_year": raw.get("award_year"),
-                    "raw": raw,
-                }
-            )
+        rows_data = _sbir_rows(data) or []
+        items = [self._sbir_award_item(raw) for raw in rows_data if isinstance(raw, dict)]
         items = _filter_items(items, query) if query and "firm" not in params else items
         if not items:
             return _normalize_page(
@@ -1228,15 +1930,25 @@ class SBAContentAPI:
                 is_current=False,
                 message="SBIR API returned no awards; showing official SBIR resource cards.",
             )
-        return _normalize_page(
+        # ``items`` is already the upstream page — normalize it as one page, then label it
+        out = _normalize_page(
             items,
-            page=page,
+            page=1,
             page_size=params["rows"],
             source="sbir",
             degraded=False,
             is_current=True,
             message=None,
         )
+        more = len(rows_data) >= params["rows"]
+        out["currentPage"] = page
+        out["total_pages"] = out["totalPages"] = page + 1 if more else page
+        out["next_cursor"] = (
+            encode_cursor({"query": query, "params": {**params, "start": params["start"] + params["rows"]}})
+            if more
+            else None
+        )
+        return out
 
     def get_content_detail(self, content_type: str, item_id: Any) -> Dict[str, Any]:
         """
@@ -1323,9 +2035,11 @@ class SBAContentAPI:
     # ------------------------------------------------------------------
     # Public search methods used by routes
     # ------------------------------------------------------------------
+    @_snapshot_route("articles")
     def search_articles(self, **params) -> Dict[str, Any]:
         page = int(params.get("page") or 1)
         query = params.get("query") or params.get("q") or ""
+        force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
 
         legacy = self._items_from_legacy(self._legacy_search("articles", **params), page)
         if legacy and legacy.get("items") is not None and not legacy.get("degraded"):
@@ -1333,14 +2047,11 @@ class SBAContentAPI:
 
         curated = self._static_article_like()
         html = self._extract_from_html_pages(
-            [
-                f"{SBA_SITE}/business-guide",
-                f"{SBA_SITE}/funding-programs/loans",
-                f"{SBA_SITE}/federal-contracting",
-            ],
+            self.ROUTE_PAGES["articles"],
             item_type="article",
             query=query,
             page=1,
+            force_fresh=force_fresh,
         )
         extra = html.get("items") if isinstance(html, dict) else None
         items = self._merge_cards(curated, extra or [])
@@ -1366,9 +2077,11 @@ class SBAContentAPI:
             return detail
         return {"error": "Article not found", "success": False}
 
+    @_snapshot_route("blogs")
     def search_blogs(self, **params) -> Dict[str, Any]:
         page = int(params.get("page") or 1)
         query = params.get("query") or params.get("q") or ""
+        force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
 
         legacy = self._items_from_legacy(self._legacy_search("blogs", **params), page)
         if legacy and legacy.get("items"):
@@ -1398,10 +2111,11 @@ class SBAContentAPI:
             },
         ] + self._static_article_like()[:5]
         html = self._extract_from_html_pages(
-            [f"{SBA_SITE}/blog", f"{SBA_SITE}/about-sba/sba-newsroom/press-releases-media-advisories"],
+            self.ROUTE_PAGES["blogs"],
             item_type="blog",
             query=query,
             page=1,
+            force_fresh=force_fresh,
         )
         extra = html.get("items") if isinstance(html, dict) else None
         items = self._merge_cards(curated, extra or [])
@@ -1483,23 +2197,22 @@ class SBAContentAPI:
                 break
         return out
 
+    @_snapshot_route("courses")
     def search_courses(self, **params) -> Any:
         page = int(params.get("page") or 1)
         query = params.get("query") or ""
+        force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
         legacy = self._items_from_legacy(self._legacy_search("courses", **params), page)
         if legacy and legacy.get("items"):
             return legacy
 
         curated = self._static_course_items()
         html = self._extract_from_html_pages(
-            [
-                f"{SBA_SITE}/sba-learning-platform",
-                f"{SBA_SITE}/local-assistance",
-                f"{SBA_SITE}/business-guide",
-            ],
+            self.ROUTE_PAGES["courses"],
             item_type="course",
             query=query,
             page=1,
+            force_fresh=force_fresh,
         )
         extra = html.get("items") if isinstance(html, dict) else None
         items = self._merge_cards(curated, extra or [])
@@ -1522,18 +2235,21 @@ class SBAContentAPI:
             return detail
         return self._get_json(f"{self.base_url}/course.json", {"pathname": pathname})
 
+    @_snapshot_route("documents")
     def search_documents(self, **params) -> Any:
         page = int(params.get("page") or 1)
         query = params.get("query") or ""
+        force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
         legacy = self._items_from_legacy(self._legacy_search("documents", **params), page)
         if legacy and legacy.get("items"):
             return legacy
         curated = self._static_document_items()
         html = self._extract_from_html_pages(
-            [f"{SBA_SITE}/document", f"{SBA_SITE}/funding-programs/loans"],
+            self.ROUTE_PAGES["documents"],
             item_type="document",
             query=query,
             page=1,
+            force_fresh=force_fresh,
         )
         extra = html.get("items") if isinstance(html, dict) else None
         items = self._merge_cards(curated, extra or [])
@@ -1547,23 +2263,22 @@ class SBAContentAPI:
             message="Document cards from official SBA forms/program pages.",
         )
 
+    @_snapshot_route("events")
     def search_events(self, **params) -> Any:
         page = int(params.get("page") or 1)
         query = params.get("query") or ""
+        force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
         legacy = self._items_from_legacy(self._legacy_search("events", **params), page)
         if legacy and legacy.get("items"):
             return legacy
 
         curated = self._static_event_items()
         html = self._extract_from_html_pages(
-            [
-                f"{SBA_SITE}/events",
-                f"{SBA_SITE}/local-assistance/find",
-                f"{SBA_SITE}/about-sba/sba-newsroom",
-            ],
+            self.ROUTE_PAGES["events"],
             item_type="event",
             query=query,
             page=1,
+            force_fresh=force_fresh,
         )
         extra = html.get("items") if isinstance(html, dict) else None
         items = self._merge_cards(curated, extra or [])
@@ -1577,6 +2292,7 @@ class SBAContentAPI:
             message="Event cards from official SBA events and partner training pages.",
         )
 
+    @_snapshot_route("lenders")
     def search_lenders(self, **params) -> Any:
         page = int(params.get("page") or 1)
         query = params.get("query") or ""
@@ -1894,19 +2610,22 @@ class SBAContentAPI:
             },
         ]
 
+    @_snapshot_route("offices")
     def search_offices(self, **params) -> Any:
         page = int(params.get("page") or 1)
         query = params.get("query") or ""
+        force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
         legacy = self._items_from_legacy(self._legacy_search("offices", **params), page)
         if legacy and legacy.get("items"):
             return legacy
 
         curated = self._static_office_items()
         html = self._extract_from_html_pages(
-            [f"{SBA_SITE}/about-sba/sba-locations", f"{SBA_SITE}/local-assistance/find"],
+            self.ROUTE_PAGES["offices"],
             item_type="office",
             query=query,
             page=1,
+            force_fresh=force_fresh,
         )
         extra = html.get("items") if isinstance(html, dict) else None
         items = self._merge_cards(curated, extra or [])
@@ -1926,6 +2645,7 @@ class SBAContentAPI:
     def search_taxonomys(self, **params) -> Any:
         return self._legacy_search("taxonomys", **params)
 
+    @_snapshot_route("loans")
     def search_loans(self, **params) -> Dict[str, Any]:
         """
         Loan program catalog for rendered UI.
@@ -2041,36 +2761,83 @@ class SBAContentAPI:
         )
 
     def get_source_status(self) -> Dict[str, Any]:
-        """Health snapshot of external public sources."""
-        status = {
-            "legacy_content_api": {"base": self.base_url, "ok": False},
-            "sbir_api": {"base": SBIR_API_BASE, "ok": False},
-            "sba_html": {"base": SBA_SITE, "ok": False},
-            "api_key_configured": bool(SBA_API_KEY),
-        }
-        # Lightweight probes (short timeout)
-        try:
-            r = self.session.get(f"{self.base_url}/articles.json", params={"page": 1}, timeout=6)
-            status["legacy_content_api"]["status_code"] = r.status_code
-            status["legacy_content_api"]["ok"] = r.status_code == 200
-        except requests.RequestException as e:
-            status["legacy_content_api"]["error"] = str(e)
+        """
+        Health snapshot of external public sources (answers from memory).
 
-        try:
-            r = self.session.get(f"{SBIR_API_BASE}/awards", params={"rows": 1}, timeout=8)
-            status["sbir_api"]["status_code"] = r.status_code
-            status["sbir_api"]["ok"] = r.status_code == 200
-        except requests.RequestException as e:
-            status["sbir_api"]["error"] = str(e)
+        Passive health comes from real fetch outcomes (the source breakers);
+        an active probe only runs for a source with no traffic inside
+        SBA_STATUS_PROBE_TTL_SECONDS, concurrently and off the request thread.
+        Only the very first call in a process waits, bounded by
+        SBA_STATUS_PROBE_DEADLINE_SECONDS.
+        """
+        due = [name for name in _STATUS_SOURCES if _probe_due(name)]
+        if due:
+            with _probe_lock:
+                first = not _probe_results
+            if first:
+                self._run_probes(due, deadline=_PROBE_DEADLINE)
+            else:
+                _schedule_refresh("status:probes", lambda: self._run_probes(due))
+
+        status: Dict[str, Any] = {}
+        for name, (breaker_name, base) in _STATUS_SOURCES.items():
+            status[name] = _merged_health(name, base(self), _BREAKERS[breaker_name])
+        status.update(
+            {
+                "api_key_configured": bool(SBA_API_KEY),
+                # Concurrent identical upstream fetches collapsed onto one request
+                "single_flight": _inflight.stats(),
+                "cache": _CACHE.stats(),
+                "breakers": {name: b.snapshot() for name, b in _BREAKERS.items()},
+                "rate_limits": _RATE_LIMITER.stats(),
+            }
+        )
+        return status
 
+    def _probe_one(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        One active health check. An open breaker is reported without a request;
+        probes are paced like background traffic, and None means the probe was
+        shed (no token free) and the previous result stands.
+        """
+        url, params, timeout = {
+            "legacy_content_api": (f"{self.base_url}/articles.json", {"page": 1}, 6),
+            "sbir_api": (f"{SBIR_API_BASE}/awards", {"rows": 1}, 8),
+            "sba_html": (self.LOAN_PAGES["loans_hub"], None, 8),
+        }[name]
+        result: Dict[str, Any] = {"checked_at": time.time()}
+        if _BREAKERS[_STATUS_SOURCES[name][0]].state == OPEN:
+            result.update(ok=False, error="circuit_open")
+            return result
+        acquired, _ = _RATE_LIMITER.for_url(url).acquire("low")
+        if not acquired:
+            return None
         try:
-            r = self.session.get(self.LOAN_PAGES["loans_hub"], timeout=8)
-            status["sba_html"]["status_code"] = r.status_code
-            status["sba_html"]["ok"] = r.status_code == 200
+            r = self.session.get(url, params=params, timeout=timeout)
+            result["status_code"] = r.status_code
+            result["ok"] = r.status_code == 200
+            self._honor_retry_after(url, r)
         except requests.RequestException as e:
-            status["sba_html"]["error"] = str(e)
+            result["ok"] = False
+            result["error"] = str(e)
+        return result
+
+    def _run_probes(self, names: List[str], deadline: Optional[float] = None) -> None:
+        """Probe ``names`` concurrently; results land in the probe cache."""
+        def _probe(name: str) -> None:
+            result = self._probe_one(name)
+            if result is None:
+                return
+            with _probe_lock:
+                _probe_results[name] = result
 
-        return status
+        try:
+            executor = _get_fetch_executor()
+            futures = [executor.submit(_probe, name) for name in names]
+        except RuntimeError as e:
+            logger.debug("SBA status probes not run: %s", e)
+            return
+        wait(futures, timeout=deadline)
 
     # Back-compat private name used earlier
     def _get(self, url: str, params: Optional[dict] = None) -> Any:
@@ -0,0 +1,140 @@
+"""
+Byte-budgeted LRU + TTL cache for per-process SBA content.
+
+Replaces a plain dict whose expired keys were only dropped on read: every
+distinct query string added a ``json:`` key and raw HTML pages stayed resident
+until touched again, so worker RSS grew with query variety. Here each entry
+carries an approximate size; inserting past ``max_bytes`` (or ``max_entries``)
+evicts expired entries first, then least-recently-used ones.
+
+Sizes are estimates (UTF-8-ish string length, serialized length for JSON
+payloads) — good enough for sizing a worker, not exact RSS.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def approx_size(value: Any) -> int:
+    """Rough byte size of a cached value."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class BoundedTTLCache:
+    """Thread-safe LRU cache with per-entry TTL and a total byte budget."""
+
+    def __init__(self, max_bytes: int, max_entries: int = 0, default_ttl: float = 90) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_entries = max(0, int(max_entries))
+        self.default_ttl = default_ttl
+        # key -> (expires_at, size, value); order = recency (last = most recent)
+        self._data: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            expires, size, value = item
+            if time.time() > expires:
+                self._drop(key, size)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> None:
+        """Store ``value``; pass ``size`` when the caller has a cheaper estimate than ``approx_size``."""
+        size = approx_size(value) if size is None else max(0, int(size))
+        expires = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if self.max_bytes and size > self.max_bytes:
+                # A single value larger than the whole budget would flush everything
+                self._stats["rejected"] += 1
+                return
+            self._data[key] = (expires, size, value)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                self._drop(key, item[1])
+
+    def clear(self) -> None:
+        """Drop every entry; the counters keep accumulating (see ``reset_stats``)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/eviction counters without touching the entries."""
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else None,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    # -- internals (caller holds the lock) ---------------------------------
+    def _drop(self, key: str, size: int) -> None:
+        self._data.pop(key, None)
+        self._bytes -= size
+
+    def _over_budget(self) -> bool:
+        return bool(
+            (self.max_bytes and self._bytes > self.max_bytes)
+            or (self.max_entries and len(self._data) > self.max_entries)
+        )
+
+    def _evict(self) -> None:
+        if not self._over_budget():
+            return
+        now = time.time()
+        for key, (expires, size, _) in list(self._data.items()):
+            if expires < now:
+                self._drop(key, size)
+                self._stats["expirations"] += 1
+        while self._over_budget() and self._data:
+            key, (_, size, _) = next(iter(self._data.items()))
+            self._drop(key, size)
+            self._stats["evictions"] += 1
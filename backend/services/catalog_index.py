@@ -0,0 +1,159 @@
+"""
+Token index + BM25 ranking for SBA card catalogs.
+
+``_filter_items`` used to lowercase and concatenate every card's text on every
+request and substring-scan it per query token. Here a catalog is tokenized
+once into an inverted index (term → {doc: tf}) with a sorted vocabulary for
+prefix lookups ("loan" matches "loans", "lender" matches "lenders"); queries
+then only touch the postings of matching terms.
+
+Indexes are cached by a content fingerprint of the catalog, so the many
+per-request list rebuilds of the same cards (static catalogs, parsed-page
+link cards, SBIR rows) reuse one index, and a changed catalog gets a new one.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+STOPWORDS = frozenset({"the", "and", "for", "sba"})
+# Field → weight (title-ish fields count double)
+FIELDS: Tuple[Tuple[str, int], ...] = (
+    ("title", 2),
+    ("name", 2),
+    ("description", 1),
+    ("summary", 1),
+    ("body", 1),
+    ("url", 1),
+    ("type", 1),
+)
+_PREFIX_WEIGHT = 0.7
+_MAX_PREFIX_TERMS = 50
+_K1 = 1.2
+_B = 0.75
+
+
+def query_tokens(query: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall((query or "").lower()) if t not in STOPWORDS]
+
+
+class CatalogIndex:
+    """Inverted index over a list of card dicts (positions match the input order)."""
+
+    def __init__(self, items: Sequence[Dict[str, Any]]) -> None:
+        self.size = len(items)
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: List[int] = []
+        for pos, item in enumerate(items):
+            length = 0
+            for field, weight in FIELDS:
+                value = item.get(field) if isinstance(item, dict) else None
+                if not value:
+                    continue
+                for term in TOKEN_RE.findall(str(value).lower()):
+                    postings = self._postings.setdefault(term, {})
+                    postings[pos] = postings.get(pos, 0) + weight
+                    length += weight
+            self._lengths.append(length)
+        self._vocab = sorted(self._postings)
+        self._avg_len = (sum(self._lengths) / self.size) if self.size else 0.0
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Exact term plus vocabulary terms starting with ``token``."""
+        out: List[Tuple[str, float]] = []
+        if token in self._postings:
+            out.append((token, 1.0))
+        i = bisect_left(self._vocab, token)
+        while i < len(self._vocab) and self._vocab[i].startswith(token) and len(out) < _MAX_PREFIX_TERMS:
+            term = self._vocab[i]
+            if term != token:
+                out.append((term, _PREFIX_WEIGHT))
+            i += 1
+        return out
+
+    def search(self, tokens: Sequence[str]) -> List[Tuple[int, float]]:
+        """(position, BM25 score) for docs matching any token, best first."""
+        scores: Dict[int, float] = {}
+        n = self.size
+        for token in tokens:
+            best: Dict[int, float] = {}
+            for term, weight in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for pos, tf in postings.items():
+                    norm = tf * (_K1 + 1) / (
+                        tf + _K1 * (1 - _B + _B * self._lengths[pos] / (self._avg_len or 1))
+                    )
+                    score = weight * idf * norm
+                    # A token counts once per doc (its best-matching term)
+                    if score > best.get(pos, 0.0):
+                        best[pos] = score
+            for pos, score in best.items():
+                scores[pos] = scores.get(pos, 0.0) + score
+        # Stable: equal scores keep catalog order
+        return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+
+
+def catalog_fingerprint(items: Sequence[Dict[str, Any]]) -> int:
+    """Cheap content key for a catalog (str hashes are cached by CPython)."""
+    return hash(
+        tuple(
+            tuple(str(item.get(field) or "") for field, _ in FIELDS) if isinstance(item, dict) else ()
+            for item in items
+        )
+    )
+
+
+class IndexCache:
+    """Small LRU of CatalogIndex by catalog fingerprint."""
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._data: "OrderedDict[Tuple[int, int], CatalogIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "builds": 0, "evictions": 0}
+
+    def get(self, items: Sequence[Dict[str, Any]]) -> CatalogIndex:
+        key = (len(items), catalog_fingerprint(items))
+        with self._lock:
+            index = self._data.get(key)
+            if index is not None:
+                self._data.move_to_end(key)
+                self._stats["hits"] += 1
+                return index
+        index = CatalogIndex(items)
+        with self._lock:
+            self._data[key] = index
+            self._stats["builds"] += 1
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._data)}
+
+
+def rank_items(
+    items: List[Dict[str, Any]], query: str, cache: Optional[IndexCache] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Items matching ``query`` ranked by BM25 (prefix-aware).
+    None when the query has no usable tokens; [] when nothing matches.
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return None
+    index = cache.get(items) if cache is not None else CatalogIndex(items)
+    return [items[pos] for pos, _ in index.search(tokens)]
@@ -133,6 +133,75 @@ class ChromaService:
             logger.error(f"Failed to add documents: {str(e)}")
             return {"error": str(e)}
     
+    def add_documents_batch(self, texts, metadatas=None, ids=None, *, upsert=False,
+                            batch_size=None, concurrency=None):
+        """Add (or upsert) many documents in bulk slices, embedding each slice in one call"""
+        if not self.initialized or "documents" not in self.collections:
+            return {"error": "ChromaDB not initialized"}
+        if not texts:
+            return {"success": True, "count": 0, "ids": [], "batches": 0}
+        
+        from backend.services.vector_batch import write_batches
+        
+        collection = self.collections["documents"]
+        store = collection.upsert if upsert else collection.add
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in range(len(texts))]
+        
+        def write(batch, metas, batch_ids, embeddings):
+            kwargs = {"documents": batch, "metadatas": metas, "ids": batch_ids}
+            if embeddings is not None:
+                kwargs["embeddings"] = embeddings
+            store(**kwargs)
+        
+        result = write_batches(
+            write, texts, metadatas, ids,
+            embed=self.embedding_function,
+            batch_size=batch_size,
+            concurrency=concurrency,
+        )
+        if result.get("errors"):
+            logger.error(f"Batch write partially failed: {result['errors']}")
+        return result
+    
+    def upsert_documents(self, texts, metadatas, ids):
+        """Insert or replace documents by id (stable ids make re-ingest idempotent)"""
+        return self.add_documents_batch(texts, metadatas, ids, upsert=True)
+    
+    def get_document_metadata(self, where):
+        """Metadata of documents matching a where filter, keyed by id"""
+        if not self.initialized or "documents" not in self.collections:
+            return {"error": "ChromaDB not initialized"}
+        
+        try:
+            found = self.collections["documents"].get(where=where, include=["metadatas"])
+            ids = found.get("ids") or []
+            metas = found.get("metadatas") or []
+            return {
+                "success": True,
+                "documents": {doc_id: (metas[i] if i < len(metas) else None) or {} for i, doc_id in enumerate(ids)}
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get document metadata: {str(e)}")
+            return {"error": str(e)}
+    
+    def delete_documents(self, ids):
+        """Delete documents by id"""
+        if not self.initialized or "documents" not in self.collections:
+            return {"error": "ChromaDB not initialized"}
+        
+        try:
+            if ids:
+                self.collections["documents"].delete(ids=list(ids))
+            return {
+                "success": True,
+                "count": len(ids or [])
+            }
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {str(e)}")
+            return {"error": str(e)}
+    
     def query_documents(self, query_text, n_results=5):
         """Query documents collection"""
         if not self.initialized or "documents" not in self.collections:
@@ -0,0 +1,135 @@
+"""
+Circuit breakers for flaky or dead upstreams.
+
+States:
+  closed     — calls go through; consecutive failures are counted
+  open       — calls are refused without touching the network until the
+               cool-down passes (the failure itself is the negative cache)
+  half_open  — one probe call is let through; success closes the breaker,
+               failure re-opens it for another cool-down. A probe that never
+               reports back (cancelled task, unexpected exception) is treated
+               as abandoned after one cool-down and another probe is allowed.
+
+Thread-safe; never raises to callers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 60) -> None:
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = float(cooldown_seconds)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+        self._last_error: Optional[str] = None
+        self._last_success_at: Optional[float] = None
+        self._last_failure_at: Optional[float] = None
+        self._stats = {"allowed": 0, "short_circuited": 0, "successes": 0, "failures": 0, "opens": 0,
+                       "abandoned_probes": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.time())
+
+    def allow(self) -> bool:
+        """True when a call may go to the network now."""
+        with self._lock:
+            now = time.time()
+            state = self._current_state(now)
+            if state == CLOSED:
+                self._stats["allowed"] += 1
+                return True
+            probe_expired = now - self._probe_started_at >= self.cooldown_seconds
+            if state == HALF_OPEN and self._probe_in_flight and probe_expired:
+                # The probe never recorded an outcome; without this the breaker would refuse forever
+                self._probe_in_flight = False
+                self._stats["abandoned_probes"] += 1
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._state = HALF_OPEN
+                self._probe_in_flight = True
+                self._probe_started_at = now
+                self._stats["allowed"] += 1
+                return True
+            self._stats["short_circuited"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats["successes"] += 1
+            self._last_success_at = time.time()
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, reason: str = "") -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+            self._last_failure_at = time.time()
+            self._failures += 1
+            self._last_error = reason or None
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+            if was_probe or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._stats["opens"] += 1
+                self._state = OPEN
+                self._opened_at = time.time()
+
+    def last_outcome(self) -> Optional[tuple]:
+        """(ok, at) for the most recent real call, or None if there was none."""
+        with self._lock:
+            success, failure = self._last_success_at, self._last_failure_at
+        if success is None and failure is None:
+            return None
+        if failure is None or (success is not None and success >= failure):
+            return True, success
+        return False, failure
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+            self._last_error = None
+            self._last_success_at = None
+            self._last_failure_at = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            state = self._current_state(now)
+            retry_in = None
+            if state == OPEN:
+                retry_in = round(max(0.0, self._opened_at + self.cooldown_seconds - now), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "cooldown_seconds": self.cooldown_seconds,
+                "retry_in_seconds": retry_in,
+                "last_error": self._last_error,
+                "last_success_at": self._last_success_at,
+                "last_failure_at": self._last_failure_at,
+                **self._stats,
+            }
+
+    def _current_state(self, now: float) -> str:
+        # Caller holds the lock. An open breaker becomes probe-able after the cool-down.
+        if self._state == OPEN and now - self._opened_at >= self.cooldown_seconds:
+            return HALF_OPEN
+        return self._state
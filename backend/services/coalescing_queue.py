@@ -0,0 +1,145 @@
+"""
+Bounded, key-coalescing work queue with a fixed worker pool.
+
+Background work that is keyed (one SBA route -> one ingest) should not
+start a thread per submission. Here a fixed number of daemon workers drain
+a bounded queue:
+
+- submitting a key that is already queued replaces its payload (latest
+  wins) and keeps its place in line, so a hot route cannot starve others;
+- submitting past ``max_pending`` drops the oldest queued key (its next
+  submission re-queues it);
+- workers start lazily on first submit and are restarted after a fork
+  (gunicorn ``preload_app`` forks after import).
+
+``stats()`` reports depth, lag (age of the oldest queued item) and
+counters. Handler errors are logged and counted; never raises to submitters.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    __slots__ = ("payload", "queued_at")
+
+    def __init__(self, payload: Any, queued_at: float) -> None:
+        self.payload = payload
+        self.queued_at = queued_at
+
+
+class CoalescingQueue:
+    """``submit(key, payload)`` -> ``handler(key, payload)`` on one of ``workers`` threads."""
+
+    def __init__(
+        self,
+        handler: Callable[[Hashable, Any], Any],
+        *,
+        workers: int = 2,
+        max_pending: int = 64,
+        name: str = "work",
+    ) -> None:
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[Hashable, _Pending]" = OrderedDict()
+        self._threads: List[threading.Thread] = []
+        self._pid = os.getpid()
+        self._busy = 0
+        self._last_wait = 0.0
+        self._max_wait = 0.0
+        self._stats = {"submitted": 0, "coalesced": 0, "dropped": 0, "processed": 0, "errors": 0}
+
+    def submit(self, key: Hashable, payload: Any) -> bool:
+        """Queue ``payload`` for ``key``; False if it replaced a queued payload (coalesced)."""
+        with self._cond:
+            self._ensure_workers()
+            self._stats["submitted"] += 1
+            queued = self._pending.get(key)
+            if queued is not None:
+                queued.payload = payload
+                self._stats["coalesced"] += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                dropped, _ = self._pending.popitem(last=False)
+                self._stats["dropped"] += 1
+                logger.debug("%s queue full; dropped oldest %r", self.name, dropped)
+            self._pending[key] = _Pending(payload, time.monotonic())
+            self._cond.notify_all()  # join() waits on the same condition
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            oldest = next(iter(self._pending.values()), None)
+            return {
+                **self._stats,
+                "depth": len(self._pending),
+                "max_pending": self.max_pending,
+                "workers": self.workers,
+                "busy": self._busy,
+                "lag_seconds": round(time.monotonic() - oldest.queued_at, 3) if oldest else 0.0,
+                "last_wait_seconds": round(self._last_wait, 3),
+                "max_wait_seconds": round(self._max_wait, 3),
+            }
+
+    def pending_keys(self) -> List[Hashable]:
+        with self._cond:
+            return list(self._pending)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until nothing is queued or running (tests / shutdown); False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def _ensure_workers(self) -> None:
+        # Caller holds self._cond
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._threads = []
+            self._busy = 0
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            t = threading.Thread(
+                target=self._work, name=f"{self.name}-{len(self._threads)}", daemon=True
+            )
+            t.start()
+            self._threads.append(t)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                key, item = self._pending.popitem(last=False)
+                self._busy += 1
+                waited = time.monotonic() - item.queued_at
+                self._last_wait = waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                self.handler(key, item.payload)
+                failed = False
+            except Exception as e:
+                failed = True
+                logger.warning("%s queue handler failed for %r: %s", self.name, key, e)
+            with self._cond:
+                self._busy -= 1
+                self._stats["processed"] += 1
+                if failed:
+                    self._stats["errors"] += 1
+                self._cond.notify_all()
@@ -0,0 +1,167 @@
+"""
+In-app response compression (gzip, plus brotli when installed).
+
+nginx compresses in the Docker stack, but the app is also run bare
+(gunicorn / ``python run.py`` / PaaS), where the JSON envelopes and chat
+answers went out uncompressed. ``init_compression(app)`` adds an
+``after_request`` hook that negotiates ``Accept-Encoding`` and compresses
+JSON/text bodies of at least ``COMPRESSION_MIN_BYTES``.
+
+Responses with a strong ETag (the prebuilt catalog routes) are
+content-addressed, so their compressed bytes are cached per
+``(etag, encoding)`` and compressed once, at a higher level. Other bodies
+are compressed per request at a fast level. A strong ETag is weakened on
+the compressed variant, as nginx does; If-None-Match still matches because
+it uses weak comparison.
+
+Knobs: COMPRESSION_ENABLED, COMPRESSION_MIN_BYTES, COMPRESSION_GZIP_LEVEL,
+COMPRESSION_BROTLI_QUALITY, COMPRESSION_CACHE_MAX_BYTES.
+Never raises: on any error the response goes out uncompressed.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from backend.services.bounded_cache import BoundedTTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # optional
+    try:
+        import brotlicffi as brotli  # type: ignore
+    except ImportError:
+        brotli = None
+
+MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSIBLE = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# Compressed bodies of strong-ETag (static) responses
+_precompressed = BoundedTTLCache(
+    max_bytes=int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+    max_entries=256,
+    default_ttl=24 * 3600,
+)
+
+_lock = threading.Lock()
+_stats: Dict[str, int] = {
+    "compressed": 0,
+    "precompressed_hits": 0,
+    "skipped_small": 0,
+    "not_accepted": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+}
+
+
+def _count(**deltas: int) -> None:
+    with _lock:
+        for key, value in deltas.items():
+            _stats[key] = _stats.get(key, 0) + value
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, *, static: bool = False) -> bytes:
+    """``data`` encoded as ``br`` or ``gzip``; static bodies use the maximum level."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if static else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if static else GZIP_LEVEL, mtime=0)
+
+
+def _compressible(response) -> bool:
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE or mimetype.endswith("+json")
+
+
+def compress_response(response, request):
+    """Compress ``response`` in place for ``request``'s Accept-Encoding (after_request hook)."""
+    if (
+        request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not _compressible(response)
+    ):
+        return response
+    try:
+        data = response.get_data()
+        if len(data) < MIN_BYTES:
+            _count(skipped_small=1)
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if not encoding:
+            _count(not_accepted=1)
+            return response
+        etag, weak = response.get_etag()
+        body: Optional[bytes] = None
+        if etag and not weak:
+            key = f"{encoding}:{etag}"
+            body = _precompressed.get(key)
+            if body is None:
+                body = compress(data, encoding, static=True)
+                _precompressed.set(key, body, size=len(body))
+            else:
+                _count(precompressed_hits=1)
+        else:
+            body = compress(data, encoding)
+        if len(body) >= len(data):
+            return response
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        _count(compressed=1, bytes_in=len(data), bytes_out=len(body))
+    except Exception as e:
+        logger.debug("Response compression skipped: %s", e)
+    return response
+
+
+def compression_stats() -> Dict[str, Any]:
+    with _lock:
+        stats = dict(_stats)
+    stats["bytes_saved"] = stats["bytes_in"] - stats["bytes_out"]
+    stats["ratio"] = round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else None
+    stats["encodings"] = list(available_encodings())
+    stats["min_bytes"] = MIN_BYTES
+    stats["precompressed"] = _precompressed.stats()
+    return stats
+
+
+def reset_compression_stats() -> None:
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+    _precompressed.clear()
+
+
+def init_compression(app) -> None:
+    """Register the compression hook on ``app`` (COMPRESSION_ENABLED=false to leave it to a proxy)."""
+    if os.getenv("COMPRESSION_ENABLED", "true").strip().lower() in ("0", "false", "no", "off"):
+        logger.info("Response compression disabled (COMPRESSION_ENABLED)")
+        return
+    from flask import request
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, request)
+
+    logger.info("Response compression enabled: %s (min %d bytes)", ", ".join(available_encodings()), MIN_BYTES)
@@ -0,0 +1,150 @@
+"""
+Build-once, read-only catalogs and prebuilt JSON responses.
+
+The hard-coded SBA catalogs (programs, lifecycle stages, local resources,
+contracting/disaster children) used to be rebuilt as fresh lists of dicts
+on every call. ``frozen_catalog`` turns such a builder into a per-process
+constant: built on first use, deep-frozen (``FrozenDict`` / ``FrozenList`` —
+still ``dict``/``list`` for readers and JSON), and content-hashed into a version.
+
+``prebuilt_response`` goes one step further for routes whose whole body
+depends only on those catalogs: the envelope is built and serialized once,
+and every later request gets the same bytes with a strong ETag. ETags and
+``catalog_version()`` are derived from the catalog content, so a code change
+that edits a catalog invalidates client and proxy caches on the next deploy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("frozen catalog entries are read-only; copy with dict()/list() first")
+
+
+class FrozenDict(dict):
+    """A dict that refuses mutation (copy with ``dict(d)`` to edit)."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """A list that refuses mutation (``+`` and ``list(l)`` give ordinary lists)."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly  # type: ignore[assignment]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def content_hash(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+_registry: Dict[str, "FrozenCatalog"] = {}
+_registry_lock = threading.Lock()
+
+
+class FrozenCatalog:
+    """Callable stand-in for a catalog builder; returns the same frozen list every call."""
+
+    def __init__(self, build: Callable[[], Any], name: Optional[str] = None) -> None:
+        self._build = build
+        self.name = name or build.__name__.lstrip("_")
+        self.__doc__ = build.__doc__
+        self.__name__ = build.__name__
+        self._items: Optional[FrozenList] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry[self.name] = self
+
+    def __call__(self) -> FrozenList:
+        if self._items is None:
+            with self._lock:
+                if self._items is None:
+                    items = freeze(self._build())
+                    self._version = content_hash(items)
+                    self._items = items
+        return self._items
+
+    @property
+    def version(self) -> str:
+        self()
+        return self._version or ""
+
+
+def frozen_catalog(build: Callable[[], Any]) -> FrozenCatalog:
+    """Decorator: ``@frozen_catalog def _cards(): return [...]``."""
+    return FrozenCatalog(build)
+
+
+def catalog_version() -> str:
+    """One hash over every registered catalog (changes when any catalog's code/content does)."""
+    with _registry_lock:
+        catalogs = sorted(_registry.items())
+    return content_hash({name: cat.version for name, cat in catalogs})
+
+
+class Prebuilt(NamedTuple):
+    body: bytes
+    etag: str
+    version: str
+
+
+_prebuilt: Dict[str, Prebuilt] = {}
+_prebuilt_lock = threading.Lock()
+
+
+def prebuilt_response(key: str, build: Callable[[], Any], dumps: Callable[[Any], str]) -> Prebuilt:
+    """Serialized body + ETag for ``key``, built on first use with ``build()`` / ``dumps``."""
+    hit = _prebuilt.get(key)
+    if hit is not None:
+        return hit
+    with _prebuilt_lock:
+        hit = _prebuilt.get(key)
+        if hit is None:
+            body = dumps(build()).encode("utf-8")
+            version = catalog_version()
+            etag = hashlib.sha1(body).hexdigest()[:32]
+            hit = _prebuilt[key] = Prebuilt(body, etag, version)
+            logger.debug("Prebuilt %s (%d bytes, catalog %s)", key, len(body), version)
+    return hit
+
+
+def prebuilt_stats() -> Dict[str, Any]:
+    return {
+        "version": catalog_version(),
+        "catalogs": {name: cat.version for name, cat in sorted(_registry.items())},
+        "responses": {key: len(p.body) for key, p in _prebuilt.items()},
+    }
+
+
+def clear_prebuilt() -> None:
+    """Drop prebuilt bodies (tests; catalogs themselves stay frozen)."""
+    with _prebuilt_lock:
+        _prebuilt.clear()
@@ -0,0 +1,323 @@
+"""
+Process-level BM25 index over the local knowledge-base text files.
+
+``_local_kb_sba_answer`` used to ``rglob`` every knowledge-base root per
+query, read and normalize every file and substring-count the query tokens.
+Here the files are tokenized once into an inverted index (term → {doc: tf})
+and kept current incrementally:
+
+- ``refresh()`` re-walks the roots at most every KB_INDEX_REFRESH_SECONDS
+  (default 30) and re-reads only files whose mtime/size changed (new files
+  are added, deleted ones dropped). Other workers' writes are picked up
+  this way. It runs at startup and on a background thread per worker
+  (``ensure_refresher``), never on the query path.
+- ``update_paths(paths)`` re-indexes specific files right away. The SBA
+  ingest calls it through ``notify_changed`` after writing sba_api_live
+  files, so a browsed route is searchable on the next question.
+
+Scoring is BM25 with prefix expansion, the same as ``catalog_index``
+("microloan" matches "microloans"). "7(a)", "7-a" and "7 a" all index as
+``7a``. Never raises: unreadable files are skipped.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = float(os.getenv("KB_INDEX_REFRESH_SECONDS", "30"))
+TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+_SEVEN_A_RE = re.compile(r"\b7\s*[(\-]?\s*a\b\)?")
+# Too common in every SBA document to rank by
+QUERY_STOPWORDS = frozenset({
+    "the", "and", "for", "what", "how", "are", "with", "from", "this", "that",
+    "can", "does", "about", "loan", "loans", "sba",
+})
+# High-signal short terms kept despite the 3-char minimum
+QUERY_KEEP = frozenset({"7a", "504"})
+_PREFIX_WEIGHT = 0.7
+_MAX_PREFIX_TERMS = 50
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(_SEVEN_A_RE.sub(" 7a ", (text or "").lower()))
+
+
+def query_terms(question: str) -> List[str]:
+    """Distinct ranking terms of a question (stopwords and short words dropped)."""
+    out: List[str] = []
+    for term in tokenize(question):
+        if (len(term) >= 3 or term in QUERY_KEEP) and term not in QUERY_STOPWORDS and term not in out:
+            out.append(term)
+    return out
+
+
+class KBDoc:
+    __slots__ = ("path", "name", "text", "length", "mtime_ns", "size")
+
+    def __init__(self, path: str, text: str, length: int, mtime_ns: int, size: int) -> None:
+        self.path = path
+        self.name = os.path.basename(path)
+        self.text = text
+        self.length = length
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+
+class KBIndex:
+    """Incrementally maintained inverted index over ``*.txt`` files under ``roots``."""
+
+    def __init__(
+        self,
+        roots: Callable[[], Iterable[Path]],
+        *,
+        refresh_seconds: float = REFRESH_SECONDS,
+        skip: Callable[[str], bool] = lambda name: name.endswith("__manifest.txt"),
+    ) -> None:
+        self.roots = roots
+        self.refresh_seconds = refresh_seconds
+        self.skip = skip
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._docs: Dict[str, KBDoc] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_len = 0
+        self._vocab: Optional[List[str]] = None  # sorted lazily after changes
+        self._last_refresh = 0.0
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_pid = 0
+        self._stats = {"builds": 0, "refreshes": 0, "files_indexed": 0, "files_removed": 0, "queries": 0}
+
+    # -- maintenance -------------------------------------------------------
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Resolved path -> (mtime_ns, size) for every indexable file."""
+        found: Dict[str, Tuple[int, int]] = {}
+        for root in self.roots():
+            try:
+                if not root.exists():
+                    continue
+                for path in root.rglob("*.txt"):
+                    if self.skip(path.name):
+                        continue
+                    key = str(path.resolve())
+                    if key in found:
+                        continue
+                    st = path.stat()
+                    found[key] = (st.st_mtime_ns, st.st_size)
+            except OSError as e:
+                logger.debug("KB index scan of %s incomplete: %s", root, e)
+        return found
+
+    def _remove(self, key: str) -> None:
+        # Caller holds self._lock
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for term in set(tokenize(doc.text)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+                    self._vocab = None
+        self._total_len -= doc.length
+
+    def _add(self, key: str, text: str, mtime_ns: int, size: int) -> None:
+        # Caller holds self._lock
+        self._remove(key)
+        terms = tokenize(text)
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocab = None
+            postings[key] = tf
+        self._docs[key] = KBDoc(key, text, len(terms), mtime_ns, size)
+        self._total_len += len(terms)
+        self._stats["files_indexed"] += 1
+
+    def _apply(self, stats: Dict[str, Tuple[int, int]], removed: Iterable[str] = ()) -> int:
+        """Re-index files in ``stats`` whose mtime/size changed; returns how many."""
+        changed = []
+        with self._lock:
+            for key in removed:
+                if key in self._docs:
+                    self._remove(key)
+                    self._stats["files_removed"] += 1
+            for key, (mtime_ns, size) in stats.items():
+                doc = self._docs.get(key)
+                if doc is None or (doc.mtime_ns, doc.size) != (mtime_ns, size):
+                    changed.append(key)
+        loaded = []
+        for key in changed:  # read outside the lock; queries keep running
+            try:
+                loaded.append((key, Path(key).read_text(encoding="utf-8", errors="replace")))
+            except OSError:
+                continue
+        with self._lock:
+            for key, text in loaded:
+                mtime_ns, size = stats[key]
+                self._add(key, text, mtime_ns, size)
+            for key in set(changed) - {key for key, _ in loaded}:
+                if key in self._docs:  # vanished or unreadable since the stat
+                    self._remove(key)
+                    self._stats["files_removed"] += 1
+        return len(loaded)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-walk the roots if the refresh interval has passed (or ``force``). True if walked."""
+        def due() -> bool:
+            return force or not self._last_refresh or time.monotonic() - self._last_refresh >= self.refresh_seconds
+
+        if not due():
+            return False
+        # The first build blocks other callers; later refreshes are skipped while one runs
+        if not self._refresh_lock.acquire(blocking=not self._last_refresh):
+            return False
+        try:
+            if not due():
+                return False
+            found = self._scan()
+            with self._lock:
+                removed = [key for key in self._docs if key not in found]
+            self._apply(found, removed)
+            with self._lock:
+                self._stats["refreshes" if self._last_refresh else "builds"] += 1
+            self._last_refresh = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning("KB index refresh failed: %s", e)
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def ensure_refresher(self) -> None:
+        """
+        Start the background rescan thread for this process if it is not
+        running. Cheap enough for every query; threads do not survive the
+        gunicorn fork, hence the pid check.
+        """
+        if self.refresh_seconds <= 0:
+            return
+        pid = os.getpid()
+        with self._lock:
+            if self._refresher_pid == pid and self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher_pid = pid
+            self._refresher = threading.Thread(target=self._refresh_loop, name="kb-index-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            self.refresh()
+            time.sleep(max(1.0, self.refresh_seconds))
+
+    def update_paths(self, paths: Iterable[str]) -> int:
+        """Re-index (or drop) specific files now, e.g. after an ingest wrote them."""
+        stats: Dict[str, Tuple[int, int]] = {}
+        removed = []
+        for raw in paths:
+            path = Path(raw)
+            if path.suffix != ".txt" or self.skip(path.name):
+                continue
+            key = str(path.resolve())
+            try:
+                st = path.stat()
+                stats[key] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                removed.append(key)
+        try:
+            return self._apply(stats, removed)
+        except Exception as e:
+            logger.debug("KB index update failed: %s", e)
+            return 0
+
+    # -- queries -----------------------------------------------------------
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        # Caller holds self._lock
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        out: List[Tuple[str, float]] = []
+        if token in self._postings:
+            out.append((token, 1.0))
+        i = bisect_left(self._vocab, token)
+        while i < len(self._vocab) and self._vocab[i].startswith(token) and len(out) < _MAX_PREFIX_TERMS:
+            if self._vocab[i] != token:
+                out.append((self._vocab[i], _PREFIX_WEIGHT))
+            i += 1
+        return out
+
+    def search(self, terms: Sequence[str]) -> List[Tuple[float, KBDoc]]:
+        """(BM25 score, doc) for docs matching any term, best first."""
+        with self._lock:
+            self._stats["queries"] += 1
+            n = len(self._docs)
+            avg_len = (self._total_len / n) if n else 1.0
+            scores: Dict[str, float] = {}
+            for token in terms:
+                best: Dict[str, float] = {}
+                for term, weight in self._expand(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, tf in postings.items():
+                        norm = tf * (_K1 + 1) / (
+                            tf + _K1 * (1 - _B + _B * self._docs[key].length / (avg_len or 1))
+                        )
+                        score = weight * idf * norm
+                        # A token counts once per doc (its best-matching term)
+                        if score > best.get(key, 0.0):
+                            best[key] = score
+                for key, score in best.items():
+                    scores[key] = scores.get(key, 0.0) + score
+            ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+            return [(score, self._docs[key]) for key, score in ranked]
+
+    def documents(self) -> List[KBDoc]:
+        with self._lock:
+            return [self._docs[key] for key in sorted(self._docs)]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._stats,
+                "files": len(self._docs),
+                "terms": len(self._postings),
+                "bytes": sum(doc.size for doc in self._docs.values()),
+                "refresh_seconds": self.refresh_seconds,
+            }
+
+
+_index: Optional[KBIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_kb_index(roots: Optional[Callable[[], Iterable[Path]]] = None) -> Optional[KBIndex]:
+    """The process-wide index (created on first call with ``roots``)."""
+    global _index
+    with _index_lock:
+        if _index is None and roots is not None:
+            _index = KBIndex(roots)
+        return _index
+
+
+def notify_changed(paths: Iterable[str]) -> None:
+    """Ingest hook: re-index ``paths`` if the index exists (no-op before first use)."""
+    index = _index
+    if index is not None:
+        index.update_paths(paths)
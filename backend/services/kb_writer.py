@@ -0,0 +1,189 @@
+"""
+Atomic, change-aware writer for the live SBA knowledge-base files.
+
+Each ingest rewrote the combined, overview, child and manifest files of a
+route with plain ``write_text``. Two ingests of one route could interleave
+and ``_local_kb_sba_answer`` could read a half-written file. ``KBWriter``:
+
+- writes each file to a temp file in the same directory and ``os.replace``s
+  it into place, so readers see the old or the new file, never a mix;
+- skips files whose content hash is unchanged (checked against a cached
+  hash, re-validated with one ``stat`` so other workers' writes are seen),
+  and rewrites the manifest only when something changed;
+- serializes writers of the same route within the process;
+- appends one JSON line per change to ``<slug>__journal.jsonl`` (rotated to
+  ``.1`` past KB_JOURNAL_MAX_BYTES). Temp and journal names do not end in
+  ``.txt``, so the keyword retriever never picks them up.
+
+Never raises: a failed file is counted and the rest are still written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MAX_BYTES = int(os.getenv("KB_JOURNAL_MAX_BYTES", str(256 * 1024)))
+_MAX_TRACKED_FILES = 20000
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def write_atomic(path: Path, data: bytes) -> bool:
+    """Replace ``path`` with ``data`` via a same-directory temp file; False on error."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        return True
+    except OSError as e:
+        logger.warning("KB write failed (%s): %s", path, e)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+
+class KBWriter:
+    """``write_route(directory, slug, route, files)`` -> what was written/unchanged."""
+
+    def __init__(self, journal_max_bytes: int = JOURNAL_MAX_BYTES) -> None:
+        self.journal_max_bytes = journal_max_bytes
+        self._lock = threading.Lock()
+        self._route_locks: Dict[str, threading.Lock] = {}
+        # path -> (content hash, mtime_ns, size) as last written/seen by this process
+        self._known: Dict[str, Tuple[str, int, int]] = {}
+        self._stats = {"files_written": 0, "files_unchanged": 0, "bytes_written": 0,
+                       "errors": 0, "routes_changed": 0, "routes_unchanged": 0}
+
+    def _route_lock(self, slug: str) -> threading.Lock:
+        with self._lock:
+            return self._route_locks.setdefault(slug, threading.Lock())
+
+    def _current_hash(self, path: Path) -> Optional[str]:
+        """Hash of ``path`` on disk (None if missing); reads only when its stat changed."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        known = self._known.get(str(path))
+        if known and known[1:] == (st.st_mtime_ns, st.st_size):
+            return known[0]
+        try:
+            digest = _digest(path.read_bytes())
+        except OSError:
+            return None
+        self._remember(path, digest)
+        return digest
+
+    def _remember(self, path: Path, digest: str) -> None:
+        try:
+            st = path.stat()
+        except OSError:
+            return
+        with self._lock:
+            if len(self._known) >= _MAX_TRACKED_FILES:
+                self._known.clear()
+            self._known[str(path)] = (digest, st.st_mtime_ns, st.st_size)
+
+    def _put(self, path: Path, text: str) -> Optional[bool]:
+        """True written, False unchanged, None failed."""
+        data = text.encode("utf-8")
+        digest = _digest(data)
+        if self._current_hash(path) == digest:
+            return False
+        if not write_atomic(path, data):
+            return None
+        self._remember(path, digest)
+        with self._lock:
+            self._stats["bytes_written"] += len(data)
+        return True
+
+    def _journal(self, directory: Path, slug: str, entry: Dict[str, Any]) -> None:
+        path = directory / f"{slug}__journal.jsonl"
+        line = (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        try:
+            if path.exists() and path.stat().st_size + len(line) > self.journal_max_bytes:
+                os.replace(path, path.with_name(path.name + ".1"))
+            # One O_APPEND write per entry: lines from concurrent workers do not interleave
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug("KB journal append failed (%s): %s", path, e)
+
+    def write_route(
+        self,
+        directory: Path,
+        slug: str,
+        route: str,
+        files: List[Tuple[str, str]],
+        *,
+        chunks: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Sync ``files`` (``(name, text)`` pairs) for one route, then its
+        manifest when anything changed. Returns ``dir``, ``files`` (all
+        current paths), ``count``, ``written``, ``unchanged`` and ``errors``.
+        """
+        written: List[str] = []
+        unchanged: List[str] = []
+        failed: List[str] = []
+        with self._route_lock(slug):
+            for name, text in files:
+                outcome = self._put(directory / name, text)
+                (written if outcome else unchanged if outcome is False else failed).append(name)
+            paths = [str(directory / name) for name, _ in files]
+            if written or failed or not (directory / f"{slug}__manifest.txt").exists():
+                lines = [
+                    f"route={route}",
+                    f"chunks={chunks}",
+                    f"files={len(paths)}",
+                    f"updated={time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}",
+                    *paths,
+                ]
+                manifest = f"{slug}__manifest.txt"
+                if self._put(directory / manifest, "\n".join(lines)) is None:
+                    failed.append(manifest)
+                else:
+                    written.append(manifest)
+                self._journal(directory, slug, {
+                    "ts": round(time.time(), 3),
+                    "route": route,
+                    "pid": os.getpid(),
+                    "written": written,
+                    "unchanged": len(unchanged),
+                    "failed": failed,
+                })
+        with self._lock:
+            self._stats["files_written"] += len(written)
+            self._stats["files_unchanged"] += len(unchanged)
+            self._stats["errors"] += len(failed)
+            self._stats["routes_changed" if written else "routes_unchanged"] += 1
+        paths.append(str(directory / f"{slug}__manifest.txt"))
+        return {
+            "dir": str(directory),
+            "files": paths,
+            "count": len(paths),
+            "written": len(written),
+            "unchanged": len(unchanged),
+            "errors": len(failed),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "tracked_files": len(self._known)}
@@ -0,0 +1,101 @@
+"""
+Offset-paged upstream walking with one page of read-ahead.
+
+``prefetching_pages`` is a generator over an offset-paged API (SBIR awards:
+``start`` + ``rows``). While the caller handles page N, page N+1 is already
+being fetched on a worker pool, so upstream latency overlaps with serving.
+Only the current and the next page are held, so walking thousands of rows
+uses constant memory. Pages themselves are cached by the fetch function
+(one cache key per offset).
+
+Cursors are opaque URL-safe tokens carrying the query state plus the next
+offset, so clients can keep scrolling without re-sending filters.
+Never raises to callers.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CURSOR_VERSION = 1
+
+# fetch(offset, background) -> upstream result; size(result) -> rows on the page, None on failure
+Fetch = Callable[[int, bool], Any]
+Size = Callable[[Any], Optional[int]]
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps({"v": CURSOR_VERSION, **state}, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """State from ``encode_cursor``; None for a missing, malformed or foreign-version token."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(str(token) + "=" * (-len(str(token)) % 4))
+        state = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.debug("Ignoring malformed cursor %r: %s", token, e)
+        return None
+    if not isinstance(state, dict) or state.pop("v", None) != CURSOR_VERSION:
+        return None
+    return state
+
+
+def _resolve(future: Future, timeout: Optional[float]) -> Any:
+    try:
+        return future.result(timeout=timeout)
+    except Exception as e:  # timeout or fetch error — caller refetches inline
+        logger.debug("Prefetched page unavailable: %s", e)
+        return None
+
+
+def prefetching_pages(
+    fetch: Fetch,
+    size: Size,
+    *,
+    first: int,
+    step: int,
+    executor: Executor,
+    max_pages: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield ``(offset, result)`` per page starting at ``first``.
+
+    The next page is submitted to ``executor`` (``fetch(offset, True)``)
+    before the current one is yielded. A failed read-ahead is retried inline
+    (``fetch(offset, False)``). Stops after a failed or short page, or after
+    ``max_pages``. A read-ahead still running when the caller stops is left
+    to finish, so the next request for that page finds it cached.
+    """
+    step = max(1, int(step))
+    offset = max(0, int(first))
+    pending: Optional[Future] = None
+    served = 0
+    while max_pages is None or served < max_pages:
+        result = _resolve(pending, timeout) if pending is not None else None
+        if pending is None or size(result) is None:
+            result = fetch(offset, False)
+        pending = None
+        rows = size(result)
+        more = rows is not None and rows >= step and (max_pages is None or served + 1 < max_pages)
+        if more:
+            try:
+                pending = executor.submit(fetch, offset + step, True)
+            except RuntimeError as e:
+                # Pool shut down (interpreter exit) — the next page is fetched inline
+                logger.debug("Page read-ahead not scheduled: %s", e)
+        yield offset, result
+        served += 1
+        if not more:
+            return
+        offset += step
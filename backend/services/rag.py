@@ -87,6 +87,46 @@ class RAGManager:
             logger.error(f"Failed to add document: {str(e)}")
             return {"error": str(e)}
     
+    def add_documents_batch(self, texts, metadatas=None, ids=None, **options):
+        """Add many documents in bulk writes (options: upsert, batch_size, concurrency)"""
+        if not self.is_available():
+            return {"error": "RAG system not available"}
+        
+        try:
+            return self.chroma_service.add_documents_batch(texts, metadatas, ids, **options)
+            
+        except Exception as e:
+            logger.error(f"Failed to add document batch: {str(e)}")
+            return {"error": str(e)}
+    
+    def upsert_documents(self, texts, metadatas, ids):
+        """Insert or replace documents by stable id"""
+        return self.add_documents_batch(texts, metadatas, ids, upsert=True)
+    
+    def get_document_metadata(self, where):
+        """Metadata (by id) of stored documents matching a where filter"""
+        if not self.is_available():
+            return {"error": "RAG system not available"}
+        
+        try:
+            return self.chroma_service.get_document_metadata(where)
+            
+        except Exception as e:
+            logger.error(f"Failed to get document metadata: {str(e)}")
+            return {"error": str(e)}
+    
+    def delete_documents(self, ids):
+        """Delete stored documents by id"""
+        if not self.is_available():
+            return {"error": "RAG system not available"}
+        
+        try:
+            return self.chroma_service.delete_documents(ids)
+            
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {str(e)}")
+            return {"error": str(e)}
+    
     def query_documents(self, query_text, n_results=5):
         """Query documents for RAG"""
         if not self.is_available():
@@ -0,0 +1,203 @@
+"""
+Client-side pacing for upstream hosts (token bucket per host).
+
+Each host gets a bucket refilled at ``rate`` tokens/second up to ``burst``.
+A caller reserves a token; if none is free it is told how long to wait.
+How long a caller may wait depends on its priority:
+
+  high    — user-facing request that must show live data when possible
+  normal  — ordinary route traffic
+  low     — background refresh / pre-warm; shed rather than queued
+
+A 429/503 ``Retry-After`` from the host blocks the whole bucket until that
+time, so queued callers stop hammering a limit the server already told us about.
+
+Config: ``SBA_RATE_LIMITS="api.www.sbir.gov=0.5:2,www.sba.gov=8:16"``
+(host=rate:burst). Never raises to callers.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Longest a caller of each priority will queue for a token (seconds).
+PRIORITY_MAX_WAIT = {"high": 8.0, "normal": 3.0, "low": 0.0}
+
+# Upper bound on the priority of every acquire in the current context (see priority_cap)
+_priority_cap: ContextVar[Optional[str]] = ContextVar("rate_priority_cap", default=None)
+
+
+@contextmanager
+def priority_cap(priority: str) -> Iterator[None]:
+    """
+    Run a block at no more than ``priority``: acquires inside it that ask for
+    a longer wait are lowered. Used for background walks (pre-warm) that go
+    through route handlers, which acquire at "normal".
+    """
+    token = _priority_cap.set(priority)
+    try:
+        yield
+    finally:
+        _priority_cap.reset(token)
+
+
+def _budget(priority: str) -> float:
+    return PRIORITY_MAX_WAIT.get(priority, PRIORITY_MAX_WAIT["normal"])
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (now or time.time()))
+
+
+class TokenBucket:
+    """Thread-safe token bucket with reservations and a Retry-After block."""
+
+    def __init__(self, host: str, rate: float, burst: int) -> None:
+        self.host = host
+        self.rate = max(0.01, float(rate))
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "queued": 0, "shed": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0}
+
+    def acquire(self, priority: str = "normal", max_wait: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Take a token, sleeping if needed. Returns (acquired, waited_seconds).
+        When the wait would exceed the priority's budget the call is shed.
+        """
+        acquired, wait = self.reserve(priority, max_wait)
+        if acquired and wait > 0:
+            time.sleep(wait)
+        return acquired, wait
+
+    def reserve(self, priority: str = "normal", max_wait: Optional[float] = None) -> Tuple[bool, float]:
+        """Like ``acquire`` but returns the wait instead of sleeping (asyncio callers)."""
+        if max_wait is None:
+            cap = _priority_cap.get()
+            budget = _budget(priority) if cap is None else min(_budget(priority), _budget(cap))
+        else:
+            budget = max_wait
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Refill only resumes when a Retry-After block ends (block_for moves
+            # _updated there), so the deficit is paid off after the block, not during it
+            wait = max(0.0, self._blocked_until - now) + max(0.0, (1 - self._tokens) / self.rate)
+            if wait > budget:
+                self._stats["shed"] += 1
+                return False, wait
+            # Reserve now (tokens may go negative) so later callers queue behind us
+            self._tokens -= 1
+            self._stats["acquired"] += 1
+            if wait > 0:
+                self._stats["queued"] += 1
+                self._stats["wait_seconds_total"] += wait
+                self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], wait)
+        return True, wait
+
+    def block_for(self, seconds: float) -> None:
+        """Honor a server ``Retry-After``: no tokens until ``seconds`` from now."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._blocked_until:
+                self._blocked_until = until
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = max(self._updated, until)
+        logger.info("Upstream %s asked to retry after %.1fs", self.host, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            acquired = self._stats["acquired"]
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "tokens": round(max(self._tokens, 0.0), 2),
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - now), 1),
+                "avg_wait_seconds": round(self._stats["wait_seconds_total"] / acquired, 3) if acquired else 0.0,
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self._stats.items()},
+            }
+
+    def _refill(self, now: float) -> None:
+        # Caller holds the lock
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._updated = now
+
+
+class HostRateLimiter:
+    """Lazily creates one TokenBucket per host."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        default: Tuple[float, int] = (8.0, 16),
+        overrides: str = "",
+    ) -> None:
+        self._limits = dict(limits or {})
+        self._limits.update(self._parse(overrides))
+        self._default = default
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> TokenBucket:
+        host = (urlparse(url).hostname or "").lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self._limits.get(host, self._default)
+                bucket = TokenBucket(host, rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: b.snapshot() for host, b in buckets.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    @staticmethod
+    def _parse(spec: str) -> Dict[str, Tuple[float, int]]:
+        out: Dict[str, Tuple[float, int]] = {}
+        for part in (spec or "").split(","):
+            if "=" not in part:
+                continue
+            host, _, value = part.partition("=")
+            rate, _, burst = value.partition(":")
+            try:
+                out[host.strip().lower()] = (float(rate), int(burst or max(1, float(rate))))
+            except ValueError:
+                logger.warning("Ignoring malformed rate limit %r", part)
+        return out
@@ -0,0 +1,374 @@
+"""
+Async SBA content client for the FastAPI app and asyncio workers.
+
+``AsyncSBAContentAPI`` returns exactly what ``SBAContentAPI`` returns (the
+``_normalize_page`` envelope): a route's upstream bodies are first pulled
+concurrently over one pooled ``httpx.AsyncClient`` into the same caches the
+sync client reads (L1, the shared cross-worker store, negative cache), then
+the sync builder runs in a thread and finds everything warm. Parsing,
+ranking, snapshot and fallback logic therefore live in one place.
+
+This is a prefetch-then-sync hybrid, not a fully non-blocking client: when a
+prefetch misses (shed, breaker open, upstream error) the sync builder in the
+worker thread fetches what is still cold with ``requests``. That thread runs
+under ``priority_cap(priority)``, so a low-priority caller's fallback is shed
+rather than queued, like its prefetch.
+
+Transport:
+  - bounded pool (``SBA_ASYNC_MAX_CONNECTIONS`` / ``SBA_ASYNC_MAX_KEEPALIVE``)
+    with keep-alive; HTTP/2 when the ``h2`` package is installed
+  - per-host concurrency cap (``SBA_ASYNC_PER_HOST``) on top of the shared
+    token-bucket pacing, circuit breakers and Retry-After handling
+  - concurrent misses for one cache key share a single request
+
+Never raises to callers for upstream failures (they degrade like the sync client).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from backend.services import SBA_Content as sba
+from backend.services.rate_limiter import priority_cap
+from backend.services.sba_http_cache import conditional_headers, entry_age, get_http_cache
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional outside the FastAPI image
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+_MAX_CONNECTIONS = int(os.getenv("SBA_ASYNC_MAX_CONNECTIONS", "20"))
+_MAX_KEEPALIVE = int(os.getenv("SBA_ASYNC_MAX_KEEPALIVE", "10"))
+_PER_HOST = int(os.getenv("SBA_ASYNC_PER_HOST", "4"))
+_TIMEOUT = float(os.getenv("SBA_ASYNC_TIMEOUT_SECONDS", "15"))
+
+# Route → SBAContentAPI method (same names as /api/sba/content/<route>)
+ROUTE_METHODS = {
+    "articles": "search_articles",
+    "blogs": "search_blogs",
+    "courses": "search_courses",
+    "documents": "search_documents",
+    "events": "search_events",
+    "lenders": "search_lenders",
+    "offices": "search_offices",
+    "loans": "search_loans",
+    "sbir": "search_sbir_awards",
+}
+_SBIR_PARAMS = ("query", "agency", "year", "firm", "rows", "start", "page", "cursor")
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncSBAContentAPI:
+    def __init__(
+        self,
+        sync: Optional[sba.SBAContentAPI] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        *,
+        max_connections: int = _MAX_CONNECTIONS,
+        max_keepalive: int = _MAX_KEEPALIVE,
+        per_host: int = _PER_HOST,
+        timeout: float = _TIMEOUT,
+    ) -> None:
+        if httpx is None and client is None:
+            raise RuntimeError("AsyncSBAContentAPI needs httpx (pip install httpx; add h2 for HTTP/2)")
+        self.sync = sync or sba.SBAContentAPI()
+        self.max_connections = max(1, int(max_connections))
+        self.max_keepalive = max(0, int(max_keepalive))
+        self.per_host = max(1, int(per_host))
+        self.timeout = float(timeout)
+        self.http2 = False
+        self._client = client
+        self._owns_client = client is None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self._stats = {"prefetched": 0, "warm": 0, "coalesced": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Public API — same envelopes as SBAContentAPI
+    # ------------------------------------------------------------------
+    async def search(self, route: str, *, priority: str = "normal", **params) -> Dict[str, Any]:
+        """
+        Envelope for ``route``. ``priority`` is the rate-limit priority of the
+        prefetch; the sync fallback is capped at it (see the module docstring).
+        """
+        method = ROUTE_METHODS.get(route)
+        if method is None:
+            raise KeyError(f"Unknown SBA route: {route}")
+        force_fresh = bool(params.get("fresh") or params.get("force_fresh"))
+        if force_fresh or not self._route_warm(route, params):
+            await self._prefetch_route(route, params, force_fresh, priority)
+        # to_thread copies this context, so the cap applies to the sync builder's fetches
+        with priority_cap(priority):
+            return await asyncio.to_thread(getattr(self.sync, method), **params)
+
+    async def search_articles(self, **params) -> Dict[str, Any]:
+        return await self.search("articles", **params)
+
+    async def search_blogs(self, **params) -> Dict[str, Any]:
+        return await self.search("blogs", **params)
+
+    async def search_courses(self, **params) -> Dict[str, Any]:
+        return await self.search("courses", **params)
+
+    async def search_documents(self, **params) -> Dict[str, Any]:
+        return await self.search("documents", **params)
+
+    async def search_events(self, **params) -> Dict[str, Any]:
+        return await self.search("events", **params)
+
+    async def search_lenders(self, **params) -> Dict[str, Any]:
+        return await self.search("lenders", **params)
+
+    async def search_offices(self, **params) -> Dict[str, Any]:
+        return await self.search("offices", **params)
+
+    async def search_loans(self, **params) -> Dict[str, Any]:
+        return await self.search("loans", **params)
+
+    async def search_sbir_awards(self, **params) -> Dict[str, Any]:
+        return await self.search("sbir", **params)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "per_host": self.per_host,
+            "in_flight": len(self._inflight),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+        self._loop = None
+
+    async def __aenter__(self) -> "AsyncSBAContentAPI":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    # ------------------------------------------------------------------
+    # Prefetch into the shared caches
+    # ------------------------------------------------------------------
+    def _route_warm(self, route: str, params: Dict[str, Any]) -> bool:
+        """The sync route would answer from L1 or a young snapshot without fetching."""
+        key = sba._snapshot_key(route, (), params)
+        if not key:
+            return False
+        if sba._cache_get(key) is not None:
+            return True
+        store = sba.get_snapshot_store()
+        snap = store.get(key) if store else None
+        return bool(snap) and entry_age(snap) <= sba._SNAPSHOT_MAX_AGE
+
+    async def _prefetch_route(
+        self, route: str, params: Dict[str, Any], force_fresh: bool, priority: str = "normal"
+    ) -> None:
+        jobs: List[Awaitable[None]] = []
+        if route in self.sync.LEGACY_ROUTES:
+            jobs.append(
+                self._prefetch(f"{self.sync.base_url}/{route}.json", "json", params=params, priority=priority)
+            )
+        if route == "sbir":
+            args = {k: params[k] for k in _SBIR_PARAMS if k in params}
+            jobs.append(
+                self._prefetch(
+                    f"{sba.SBIR_API_BASE}/awards",
+                    "json",
+                    params=self.sync._sbir_request(**args)[1],
+                    force_fresh=force_fresh,
+                    timeout=20,
+                    priority=priority,
+                )
+            )
+        for url in self.sync.ROUTE_PAGES.get(route, []):
+            jobs.append(self._prefetch(url, "html", force_fresh=force_fresh, priority=priority))
+        if jobs:
+            await asyncio.gather(*jobs)
+
+    async def _prefetch(
+        self,
+        url: str,
+        kind: str,
+        params: Optional[dict] = None,
+        force_fresh: bool = False,
+        timeout: Optional[float] = None,
+        priority: str = "normal",
+    ) -> None:
+        cache_key = sba._json_cache_key(url, params) if kind == "json" else f"html:{url}"
+        if not force_fresh and self._warm(cache_key, url, kind):
+            self._stats["warm"] += 1
+            return
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            await asyncio.shield(task)
+            return
+        task = asyncio.ensure_future(
+            self._fetch(cache_key, url, kind, params, timeout or self.timeout, priority)
+        )
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda _t: self._inflight.pop(cache_key, None))
+        await asyncio.shield(task)
+
+    @staticmethod
+    def _warm(cache_key: str, url: str, kind: str) -> bool:
+        # Stale shared entries count: the sync path serves them and refreshes off-thread
+        if sba._cache_get(cache_key) is not None:
+            return True
+        if kind == "html" and sba._cache_get(f"page:{url}") is not None:
+            return True
+        entry = get_http_cache().get(cache_key)
+        return bool(entry) and entry_age(entry) <= sba._CACHE_STALE_SECONDS
+
+    async def _fetch(
+        self,
+        cache_key: str,
+        url: str,
+        kind: str,
+        params: Optional[dict],
+        timeout: float,
+        priority: str = "normal",
+    ) -> None:
+        """Async mirror of ``SBAContentAPI._fetch_json`` / ``_fetch_html`` (results go to the caches)."""
+        breaker = self.sync._breaker_for(url)
+        if sba._cache_get(f"neg:{cache_key}") is not None or breaker.state == sba.OPEN:
+            return
+        acquired, wait = sba._RATE_LIMITER.for_url(url).reserve(priority)
+        if not acquired:
+            logger.debug("SBA async fetch shed (%s, wait %.1fs): %s", priority, wait, url)
+            return
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if not breaker.allow():
+            return
+        entry = get_http_cache().get(cache_key)
+        headers = dict(conditional_headers(entry))
+        if kind == "html":
+            headers["Accept"] = "text/html,application/xhtml+xml"
+        try:
+            async with self._host_limit(url):
+                response = await self._get_client().get(url, params=params, headers=headers, timeout=timeout)
+            if response.status_code == 304 and entry:
+                breaker.record_success()
+                get_http_cache().touch(cache_key)
+                sba._cache_set(cache_key, entry.get("value"), ttl=sba._CACHE_TTL)
+                return
+            self.sync._honor_retry_after(url, response)
+            if response.status_code in sba._BREAKER_STATUSES:
+                self.sync._record_upstream_failure(breaker, cache_key, response.status_code)
+                return
+            breaker.record_success()
+            if response.status_code >= 400:
+                return
+            value = response.json() if kind == "json" else response.text
+        except httpx.HTTPError as e:
+            breaker.record_failure(str(e))
+            self._stats["errors"] += 1
+            logger.warning("SBA async fetch failed %s: %s", url, e)
+            return
+        except ValueError as e:
+            breaker.record_failure(f"invalid_json: {e}")
+            self._stats["errors"] += 1
+            return
+        sba._cache_set(cache_key, value, ttl=sba._CACHE_TTL)
+        sba._shared_store(cache_key, response, value)
+        self._stats["prefetched"] += 1
+
+    # ------------------------------------------------------------------
+    # Pooled client, bound to the running loop
+    # ------------------------------------------------------------------
+    def _get_client(self) -> "httpx.AsyncClient":
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores/connections belong to one loop; a new loop (tests, asyncio.run) gets fresh ones
+            old_loop, self._loop = self._loop, loop
+            self._host_limits = {}
+            if self._owns_client and self._client is not None:
+                self._close_stale(self._client, old_loop, loop)
+                self._client = None
+        if self._client is None:
+            self.http2 = http2_available()
+            headers = dict(sba.DEFAULT_HEADERS)
+            if sba.SBA_API_KEY:
+                headers["X-Api-Key"] = sba.SBA_API_KEY
+                headers["Authorization"] = f"Bearer {sba.SBA_API_KEY}"
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                headers=headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+            )
+        return self._client
+
+    def _close_stale(
+        self,
+        client: "httpx.AsyncClient",
+        old_loop: Optional[asyncio.AbstractEventLoop],
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Close a client left behind by a previous loop, so its connection pool is released."""
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            try:
+                asyncio.run_coroutine_threadsafe(_aclose_quietly(client), old_loop)
+                return
+            except RuntimeError:
+                pass  # closed in between: close from this loop instead
+        task = loop.create_task(_aclose_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        self._get_client()  # resets per-loop state first
+        host = (urlparse(url).hostname or "").lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return limit
+
+
+async def _aclose_quietly(client: "httpx.AsyncClient") -> None:
+    try:
+        await client.aclose()
+    except Exception as e:  # connections of a closed loop may fail to shut down cleanly
+        logger.debug("Stale SBA async client close failed: %s", e)
+
+
+_default: Optional[AsyncSBAContentAPI] = None
+
+
+def get_async_sba_client() -> AsyncSBAContentAPI:
+    """Process-wide async client (lazy)."""
+    global _default
+    if _default is None:
+        _default = AsyncSBAContentAPI()
+    return _default
+
+
+async def close_async_sba_client() -> None:
+    global _default
+    if _default is not None:
+        await _default.aclose()
+        _default = None
@@ -0,0 +1,245 @@
+"""
+In-process batch resolution for ``POST /api/sba/batch``.
+
+The SPA's first paint needs resources, programs, lifecycle, local
+resources and a few content parents — five or more round trips through
+CompatPathRewriteMiddleware. A batch resolves those GETs concurrently on a
+small worker pool through the real app (``app.test_client()``, like the
+prewarmer). Every sub-request therefore gets the same middleware, caches,
+single-flight upstream fetches, ETags and ``fields``/``compact`` shaping
+as a direct call.
+
+Sub-requests carry an allow-listed set of the batch request's headers
+(``FORWARDED_HEADERS``: language, auth, cookies, proxy headers), so an entry
+answers what the same GET made directly would. Each entry gets at most
+``ENTRY_TIMEOUT`` seconds from when it starts running; ``TIMEOUT`` only
+bounds the whole batch.
+
+Identical entries in one batch run once. Concurrent batches asking for
+the same route (same query, ETag and forwarded headers) share one
+in-flight resolution.
+Sub-response bodies are spliced into the batch body as raw JSON bytes
+instead of being parsed and re-serialized. Never raises: per-entry
+failures become ``status`` 4xx/5xx entries.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from backend.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUESTS = int(os.getenv("SBA_BATCH_MAX_REQUESTS", "16"))
+TIMEOUT = float(os.getenv("SBA_BATCH_TIMEOUT_SECONDS", "25"))
+ENTRY_TIMEOUT = float(os.getenv("SBA_BATCH_ENTRY_TIMEOUT_SECONDS", "8"))
+# Outer request headers that can change a sub-response. Not Accept-Encoding:
+# bodies are spliced in raw, and the batch response is compressed as a whole.
+FORWARDED_HEADERS = (
+    "Accept-Language", "Authorization", "Cookie",
+    "X-Forwarded-For", "X-Forwarded-Host", "X-Forwarded-Proto", "X-Forwarded-Prefix", "X-Real-IP",
+)
+_POLL_SECONDS = 0.05
+_ALLOWED_PREFIXES = ("/api/sba/", "/api/sba-content/", "/sba-content/")
+_BLOCKED = frozenset({"/api/sba/batch"})
+
+_flight = SingleFlight()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class BatchEntry(NamedTuple):
+    key: str
+    path: str
+    query: str
+    etag: Optional[str]
+
+
+class BatchResult(NamedTuple):
+    status: int
+    body: Optional[bytes]  # raw JSON (None for 304 / timeouts)
+    etag: Optional[str]
+    error: Optional[str] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("SBA_BATCH_WORKERS", "8")),
+                thread_name_prefix="sba-batch",
+            )
+        return _executor
+
+
+def parse_entries(payload: Any) -> Tuple[List[BatchEntry], Optional[str]]:
+    """
+    ``{"requests": [...]}`` (or a bare list) -> entries, or an error message.
+    Each request is a path string (query allowed) or
+    ``{"path", "params"?, "key"?, "etag"?}``. Top-level ``fields`` / ``compact``
+    apply to every entry that does not set its own.
+    """
+    raw = payload.get("requests") if isinstance(payload, dict) else payload
+    defaults = {
+        k: payload[k] for k in ("fields", "compact") if isinstance(payload, dict) and payload.get(k) not in (None, "")
+    }
+    if not isinstance(raw, list) or not raw:
+        return [], "Body must be {\"requests\": [<path> | {\"path\": ..., \"params\": {...}}, ...]}"
+    if len(raw) > MAX_REQUESTS:
+        return [], f"At most {MAX_REQUESTS} requests per batch"
+    entries: List[BatchEntry] = []
+    keys: Dict[str, Tuple[BatchEntry, bool]] = {}
+    for i, spec in enumerate(raw):
+        if isinstance(spec, str):
+            spec = {"path": spec}
+        if not isinstance(spec, dict) or not isinstance(spec.get("path"), str):
+            return [], f"requests[{i}] needs a string path"
+        parts = urlsplit(spec["path"].strip())
+        path = parts.path
+        if path.rstrip("/") in _BLOCKED or not path.startswith(_ALLOWED_PREFIXES):
+            return [], f"requests[{i}]: only GET routes under /api/sba/ can be batched"
+        params = dict(spec.get("params")) if isinstance(spec.get("params"), dict) else {}
+        for name, value in defaults.items():
+            if name not in params and f"{name}=" not in parts.query:
+                params[name] = (",".join(value) if isinstance(value, list) else
+                                ("1" if value is True else str(value)))
+        query = "&".join(q for q in (parts.query, urlencode(sorted(params.items()), doseq=True)) if q)
+        key = str(spec.get("key") or (f"{path}?{query}" if query else path))
+        etag = spec.get("etag") if isinstance(spec.get("etag"), str) else None
+        entry = BatchEntry(key, path, query, etag)
+        explicit = bool(spec.get("key"))
+        if key in keys:
+            # Identical unkeyed entries collapse into one response; anything else would hide one
+            other, other_explicit = keys[key]
+            if explicit or other_explicit or other != entry:
+                return [], f"requests[{i}]: duplicate key {key!r}"
+        keys[key] = (entry, explicit)
+        entries.append(entry)
+    return entries, None
+
+
+def forwarded_headers(headers: Mapping[str, str]) -> Tuple[Tuple[str, str], ...]:
+    """The ``FORWARDED_HEADERS`` present on the batch request, as a hashable tuple."""
+    return tuple((name, headers[name]) for name in FORWARDED_HEADERS if headers.get(name))
+
+
+def _resolve_one(app, entry: BatchEntry, forwarded: Tuple[Tuple[str, str], ...] = ()) -> BatchResult:
+    headers = dict(forwarded)
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    with app.test_client() as client:
+        resp = client.get(entry.path, query_string=entry.query, headers=headers)
+        etag = resp.headers.get("ETag")
+        if resp.status_code == 304:
+            return BatchResult(304, None, etag)
+        if resp.mimetype != "application/json":
+            body = json.dumps(resp.get_data(as_text=True)).encode("utf-8")
+        else:
+            body = resp.get_data() or b"null"
+        return BatchResult(resp.status_code, body, etag)
+
+
+def _resolve_shared(app, entry: BatchEntry, forwarded: Tuple[Tuple[str, str], ...] = ()) -> BatchResult:
+    flight_key = (entry.path, entry.query, entry.etag, forwarded)
+    try:
+        return _flight.do(flight_key, lambda: _resolve_one(app, entry, forwarded))
+    except Exception as e:
+        logger.warning("SBA batch entry %s failed: %s", entry.path, e)
+        return BatchResult(500, None, None, str(e))
+
+
+def resolve_batch(
+    app,
+    entries: List[BatchEntry],
+    headers: Optional[Mapping[str, str]] = None,
+    *,
+    timeout: float = TIMEOUT,
+    entry_timeout: float = ENTRY_TIMEOUT,
+) -> Dict[str, BatchResult]:
+    """
+    Results keyed by entry key (request order). An entry still running
+    ``entry_timeout`` after it started, or not finished within the batch
+    ``timeout``, is a 504.
+    """
+    forwarded = forwarded_headers(headers or {})
+    unique: Dict[Tuple[str, str, Optional[str]], Future] = {}
+    started: Dict[Tuple[str, str, Optional[str]], float] = {}
+    executor = _get_executor()
+
+    def run(ident, entry: BatchEntry) -> BatchResult:
+        started[ident] = time.monotonic()
+        return _resolve_shared(app, entry, forwarded)
+
+    for entry in entries:
+        ident = (entry.path, entry.query, entry.etag)
+        if ident not in unique:
+            unique[ident] = executor.submit(run, ident, entry)
+
+    deadline = time.monotonic() + timeout
+    pending = dict(unique)
+    expired = set()
+    while pending:
+        now = time.monotonic()
+        for ident in [i for i in pending if i in started and now - started[i] >= entry_timeout]:
+            if not pending.pop(ident).done():
+                expired.add(ident)
+        if not pending or now >= deadline:
+            break
+        running = [started[i] + entry_timeout for i in pending if i in started]
+        # Queued entries have no deadline of their own yet: poll until they start
+        until = min([deadline, *running] + ([now + _POLL_SECONDS] if len(running) < len(pending) else []))
+        done, _ = wait(list(pending.values()), timeout=max(0.0, until - now), return_when=FIRST_COMPLETED)
+        for ident in [i for i, f in pending.items() if f in done]:
+            del pending[ident]
+    for future in pending.values():
+        # Not started yet: drop it so abandoned work cannot fill the pool. Entries
+        # already running cannot be cancelled and still fill the caches.
+        future.cancel()
+
+    results: Dict[str, BatchResult] = {}
+    for entry in entries:
+        ident = (entry.path, entry.query, entry.etag)
+        future = unique[ident]
+        if ident not in expired and future.done() and not future.cancelled():
+            results[entry.key] = future.result()
+        else:
+            limit = entry_timeout if ident in expired else timeout
+            results[entry.key] = BatchResult(504, None, None, f"Timed out after {limit:g}s")
+    return results
+
+
+def batch_body(entries: List[BatchEntry], results: Dict[str, BatchResult], elapsed_ms: float) -> bytes:
+    """The batch JSON, with sub-response bodies spliced in as raw bytes."""
+    chunks = []
+    seen = set()
+    for entry in entries:
+        if entry.key in seen:
+            continue
+        seen.add(entry.key)
+        res = results[entry.key]
+        meta = {"path": entry.path, "status": res.status, "etag": res.etag}
+        if res.error:
+            meta["error"] = res.error
+        head = json.dumps(meta, separators=(",", ":"))[:-1]  # reopen the object for "body"
+        chunks.append(b"%s:%s,\"body\":%s}" % (
+            json.dumps(entry.key).encode("utf-8"), head.encode("utf-8"), res.body or b"null",
+        ))
+    failed = sum(1 for r in results.values() if r.status >= 400)
+    summary = json.dumps({
+        "success": True, "count": len(seen), "failed": failed, "elapsed_ms": round(elapsed_ms, 1),
+    }, separators=(",", ":"))[:-1]
+    return b"%s,\"responses\":{%s}}" % (summary.encode("utf-8"), b",".join(chunks))
+
+
+def batch_stats() -> Dict[str, Any]:
+    return {"max_requests": MAX_REQUESTS, "timeout_seconds": TIMEOUT, "entry_timeout_seconds": ENTRY_TIMEOUT,
+            "single_flight": _flight.stats()}
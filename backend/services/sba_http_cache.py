@@ -0,0 +1,282 @@
+"""
+Shared HTTP response cache for SBA upstream fetches.
+
+The in-process ``_CACHE`` in SBA_Content only helps the worker that filled it;
+every gunicorn worker would otherwise re-download the same sba.gov pages.
+This module stores upstream bodies together with their validators
+(``ETag`` / ``Last-Modified``) in a store all workers on a host share:
+
+  - SQLite file (default; WAL mode, one connection per thread)
+  - Redis when ``USE_REDIS=true`` (same switch as ConversationStore)
+  - in-memory dict (tests / when neither is usable)
+
+Entries outlive their freshness TTL (``SBA_HTTP_CACHE_RETAIN_SECONDS``) so an
+expired page can still be revalidated with ``If-None-Match`` /
+``If-Modified-Since``; a 304 then only costs a header round trip.
+
+Never raises to callers — a broken store degrades to "cache miss".
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long entries (and their validators) are kept after the last store/revalidate.
+_RETAIN_SECONDS = int(os.getenv("SBA_HTTP_CACHE_RETAIN_SECONDS", str(24 * 3600)))
+_DEFAULT_SQLITE_PATH = os.path.join(tempfile.gettempdir(), "pocketpro_sba_http_cache.sqlite3")
+
+
+def make_entry(
+    value: Any,
+    *,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    stored_at: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Build a cache entry dict (JSON-serializable)."""
+    return {
+        "value": value,
+        "etag": etag or None,
+        "last_modified": last_modified or None,
+        "stored_at": stored_at if stored_at is not None else time.time(),
+    }
+
+
+def entry_age(entry: Optional[Dict[str, Any]], now: Optional[float] = None) -> float:
+    """Seconds since the entry was stored or last revalidated (inf when missing)."""
+    if not entry:
+        return float("inf")
+    try:
+        return max(0.0, (now or time.time()) - float(entry.get("stored_at") or 0))
+    except (TypeError, ValueError):
+        return float("inf")
+
+
+def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for revalidating an entry."""
+    headers: Dict[str, str] = {}
+    if not entry:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = str(entry["etag"])
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = str(entry["last_modified"])
+    return headers
+
+
+class MemoryHTTPCache:
+    """Per-process fallback store (same interface as the shared backends)."""
+
+    backend = "memory"
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._data.get(key)
+        if entry and entry_age(entry) > _RETAIN_SECONDS:
+            self.delete(key)
+            return None
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = entry
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry:
+                entry["stored_at"] = time.time()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteHTTPCache:
+    """File-backed store shared by every worker process on the host."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = _DEFAULT_SQLITE_PATH) -> None:
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            " key TEXT PRIMARY KEY,"
+            " entry TEXT NOT NULL,"
+            " stored_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            parent = os.path.dirname(self.path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.DatabaseError:
+                pass
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            row = self._conn().execute(
+                "SELECT entry, stored_at FROM http_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("SBA http cache read failed: %s", e)
+            return None
+        if not row:
+            return None
+        if time.time() - float(row[1]) > _RETAIN_SECONDS:
+            self.delete(key)
+            return None
+        try:
+            entry = json.loads(row[0])
+        except ValueError:
+            return None
+        entry["stored_at"] = float(row[1])
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache (key, entry, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(entry), float(entry.get("stored_at") or time.time())),
+            )
+            conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.debug("SBA http cache write failed: %s", e)
+
+    def touch(self, key: str) -> None:
+        try:
+            conn = self._conn()
+            conn.execute("UPDATE http_cache SET stored_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug("SBA http cache touch failed: %s", e)
+
+    def delete(self, key: str) -> None:
+        try:
+            conn = self._conn()
+            conn.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug("SBA http cache delete failed: %s", e)
+
+    def clear(self) -> None:
+        try:
+            conn = self._conn()
+            conn.execute("DELETE FROM http_cache")
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug("SBA http cache clear failed: %s", e)
+
+
+class RedisHTTPCache:
+    """Redis-backed store (``USE_REDIS=true``); entries expire after the retain window."""
+
+    backend = "redis"
+    _prefix = "sba_http:"
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.client.get(self._prefix + key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.debug("SBA http cache redis read failed: %s", e)
+            return None
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        try:
+            self.client.setex(self._prefix + key, _RETAIN_SECONDS, json.dumps(entry))
+        except Exception as e:
+            logger.debug("SBA http cache redis write failed: %s", e)
+
+    def touch(self, key: str) -> None:
+        entry = self.get(key)
+        if entry:
+            entry["stored_at"] = time.time()
+            self.set(key, entry)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self._prefix + key)
+        except Exception as e:
+            logger.debug("SBA http cache redis delete failed: %s", e)
+
+    def clear(self) -> None:
+        try:
+            for k in self.client.scan_iter(f"{self._prefix}*"):
+                self.client.delete(k)
+        except Exception as e:
+            logger.debug("SBA http cache redis clear failed: %s", e)
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def _build_http_cache():
+    choice = os.getenv("SBA_HTTP_CACHE_BACKEND", "").strip().lower()
+    use_redis = os.getenv("USE_REDIS", "false").lower() == "true"
+    if choice == "redis" or (not choice and use_redis):
+        try:
+            import redis
+
+            client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
+            client.ping()
+            logger.info("SBA http cache: Redis")
+            return RedisHTTPCache(client)
+        except Exception as e:
+            logger.warning("SBA http cache could not use Redis: %s. Falling back to SQLite.", e)
+    if choice != "memory":
+        try:
+            return SQLiteHTTPCache(os.getenv("SBA_HTTP_CACHE_PATH", _DEFAULT_SQLITE_PATH))
+        except Exception as e:
+            logger.warning("SBA http cache could not open SQLite store: %s. Using memory.", e)
+    return MemoryHTTPCache()
+
+
+def get_http_cache():
+    """Process-wide shared cache backend (lazy)."""
+    global _http_cache
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                _http_cache = _build_http_cache()
+    return _http_cache
+
+
+def set_http_cache(cache) -> None:
+    """Swap the backend (tests, or apps wiring their own store)."""
+    global _http_cache
+    with _http_cache_lock:
+        _http_cache = cache
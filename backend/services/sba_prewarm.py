@@ -0,0 +1,263 @@
+"""
+Background pre-warmer for the SBA catalog routes.
+
+Walks the parent catalog published by ``GET /api/sba/resources`` and, for
+each parent content route (loans, lenders, offices, articles, sbir, ...), the
+child routes its items link to (``/api/sba/content/loans/7a``, contracting
+children, ...). Each walk goes through the real route handlers, so upstream
+bodies, parsed page models and the shared cross-worker store are refreshed
+before a user asks — cold fetches move off the request path.
+
+Two ways to run it:
+  - in-process: ``SBA_PREWARM_ENABLED=true``; create_app starts one daemon
+    thread per host (a lock file keeps extra gunicorn workers from duplicating it)
+  - sidecar:    ``python -m backend.services.sba_prewarm --base-url http://localhost:5000``
+
+Cadence is ``SBA_PREWARM_INTERVAL_SECONDS`` (default 240, kept inside the
+stale-while-revalidate window) with ``SBA_PREWARM_JITTER`` (fraction, default
+0.2) so hosts do not stampede sba.gov in lock-step. Never raises to callers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.services.rate_limiter import priority_cap
+
+logger = logging.getLogger(__name__)
+
+_INTERVAL = float(os.getenv("SBA_PREWARM_INTERVAL_SECONDS", "240"))
+_JITTER = float(os.getenv("SBA_PREWARM_JITTER", "0.2"))
+_MAX_CHILDREN = int(os.getenv("SBA_PREWARM_MAX_CHILDREN", "12"))
+_LOCK_PATH = os.path.join(tempfile.gettempdir(), "pocketpro_sba_prewarm.lock")
+
+CATALOG_PATH = "/api/sba/resources"
+# Parents that are probes or are not cacheable content
+_SKIP_PATHS = frozenset({"/api/sba/sources"})
+
+Fetch = Callable[[str], Optional[Dict[str, Any]]]
+
+
+def parent_paths(catalog: Optional[Dict[str, Any]]) -> List[str]:
+    """Content routes listed in the /api/sba/resources payload (in catalog order)."""
+    out: List[str] = []
+    for res in (catalog or {}).get("resources") or []:
+        path = str((res or {}).get("path") or "")
+        if path.startswith("/api/") and path not in _SKIP_PATHS and path not in out:
+            out.append(path)
+    return out
+
+
+def child_paths(parent: str, payload: Optional[Dict[str, Any]], limit: int = _MAX_CHILDREN) -> List[str]:
+    """Child routes (``{parent}/<id>``) linked from a parent envelope's items."""
+    out: List[str] = []
+    prefix = parent.rstrip("/") + "/"
+    for item in (payload or {}).get("items") or []:
+        path = str((item or {}).get("path") or "")
+        if path.startswith(prefix) and path not in out:
+            out.append(path)
+        if len(out) >= limit:
+            break
+    return out
+
+
+class CatalogPrewarmer:
+    """Periodically GETs every parent route and its children through ``fetch``."""
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        *,
+        interval: float = _INTERVAL,
+        jitter: float = _JITTER,
+        max_children: int = _MAX_CHILDREN,
+    ) -> None:
+        self.fetch = fetch
+        self.interval = max(5.0, float(interval))
+        self.jitter = max(0.0, min(float(jitter), 0.9))
+        self.max_children = max(0, int(max_children))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last: Dict[str, Any] = {}
+        self._runs = 0
+
+    def run_once(self) -> Dict[str, Any]:
+        started = time.monotonic()
+        warmed: List[str] = []
+        failed: List[str] = []
+
+        def _get(path: str) -> Optional[Dict[str, Any]]:
+            try:
+                payload = self.fetch(path)
+            except Exception as e:
+                logger.debug("SBA prewarm %s failed: %s", path, e)
+                payload = None
+            (warmed if payload is not None else failed).append(path)
+            return payload
+
+        for parent in parent_paths(_get(CATALOG_PATH)):
+            if self._stop.is_set():
+                break
+            payload = _get(parent)
+            for child in child_paths(parent, payload, self.max_children):
+                if self._stop.is_set():
+                    break
+                _get(child)
+
+        self._runs += 1
+        self._last = {
+            "finished_at": time.time(),
+            "seconds": round(time.monotonic() - started, 2),
+            "warmed": len(warmed),
+            "failed": failed,
+        }
+        logger.info(
+            "SBA prewarm: %d routes warmed, %d failed in %.1fs",
+            len(warmed), len(failed), self._last["seconds"],
+        )
+        return dict(self._last)
+
+    def next_delay(self) -> float:
+        spread = self.interval * self.jitter
+        return max(1.0, self.interval + random.uniform(-spread, spread))
+
+    def start(self, initial_delay: Optional[float] = None) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        first = random.uniform(0, self.interval * self.jitter or 1.0) if initial_delay is None else initial_delay
+        self._thread = threading.Thread(
+            target=self._loop, args=(first,), name="sba-prewarm", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": bool(self._thread and self._thread.is_alive() and not self._stop.is_set()),
+            "interval_seconds": self.interval,
+            "jitter": self.jitter,
+            "runs": self._runs,
+            "last_run": dict(self._last) or None,
+        }
+
+    def _loop(self, delay: float) -> None:
+        while not self._stop.wait(delay):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning("SBA prewarm cycle failed: %s", e)
+            delay = self.next_delay()
+
+
+_active: Optional[CatalogPrewarmer] = None
+_lock_handle = None
+
+
+def prewarm_status() -> Dict[str, Any]:
+    """State of this process's prewarmer (``enabled: False`` when not running here)."""
+    if _active is None:
+        return {"enabled": False}
+    return {"enabled": True, **_active.status()}
+
+
+def _acquire_host_lock() -> bool:
+    """One in-process prewarmer per host: first worker to lock the file wins."""
+    global _lock_handle
+    try:
+        import fcntl
+    except ImportError:
+        return True  # no flock (Windows dev) — run anyway
+    try:
+        handle = open(_LOCK_PATH, "a+")
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    _lock_handle = handle  # keep the fd (and lock) for the life of the process
+    return True
+
+
+def _app_fetch(app) -> Fetch:
+    def fetch(path: str) -> Optional[Dict[str, Any]]:
+        # Low priority: shed when an upstream bucket is empty instead of taking users' tokens
+        with app.test_client() as client, priority_cap("low"):
+            resp = client.get(path)
+            if resp.status_code >= 500:
+                return None
+            return resp.get_json(silent=True)
+
+    return fetch
+
+
+def _http_fetch(base_url: str, timeout: float = 60) -> Fetch:
+    import requests
+
+    session = requests.Session()
+    base = base_url.rstrip("/")
+
+    def fetch(path: str) -> Optional[Dict[str, Any]]:
+        resp = session.get(base + path, timeout=timeout)
+        if resp.status_code >= 500:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
+    return fetch
+
+
+def start_prewarmer(app) -> Optional[CatalogPrewarmer]:
+    """Start the in-process prewarmer when ``SBA_PREWARM_ENABLED=true`` (soft)."""
+    global _active
+    if os.getenv("SBA_PREWARM_ENABLED", "false").lower() != "true":
+        return None
+    if _active is not None:
+        return _active
+    if not _acquire_host_lock():
+        logger.info("SBA prewarm already running in another worker on this host")
+        return None
+    _active = CatalogPrewarmer(_app_fetch(app))
+    _active.start()
+    logger.info("SBA prewarm started (every ~%.0fs)", _active.interval)
+    return _active
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-warm PocketPro SBA catalog routes.")
+    parser.add_argument("--base-url", default=os.getenv("SBA_PREWARM_BASE_URL", "http://localhost:5000"))
+    parser.add_argument("--interval", type=float, default=_INTERVAL)
+    parser.add_argument("--jitter", type=float, default=_JITTER)
+    parser.add_argument("--max-children", type=int, default=_MAX_CHILDREN)
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    warmer = CatalogPrewarmer(
+        _http_fetch(args.base_url),
+        interval=args.interval,
+        jitter=args.jitter,
+        max_children=args.max_children,
+    )
+    if args.once:
+        result = warmer.run_once()
+        return 1 if result["failed"] and not result["warmed"] else 0
+    try:
+        while True:
+            warmer.run_once()
+            time.sleep(warmer.next_delay())
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
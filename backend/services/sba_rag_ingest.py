@@ -13,18 +13,24 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
 import re
 import threading
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from backend.services import kb_index
+from backend.services.coalescing_queue import CoalescingQueue
+from backend.services.kb_writer import KBWriter
+
 logger = logging.getLogger(__name__)
 
 # Throttle re-ingest of same route (seconds)
 _MIN_REINGEST_SECONDS = 45
 _last_ingest: Dict[str, float] = {}
 _lock = threading.Lock()
+_kb_writer = KBWriter()
 
 
 def _kb_live_dir() -> Path:
@@ -197,6 +203,8 @@ def envelope_to_documents(
                     "route": route,
                     "child_path": child_path,
                     "item_id": str(raw.get("id") if raw.get("id") is not None else i),
+                    # Index / item-N placeholder rather than an upstream id
+                    "synthetic_id": _is_synthetic_id(raw.get("id")),
                     "title": str(raw.get("title") or raw.get("name") or "")[:200],
                     "type": str(raw.get("type") or "content")[:80],
                     "url": str(raw.get("url") or raw.get("link") or "")[:500],
@@ -234,12 +242,15 @@ def envelope_to_documents(
 
 
 def _write_kb_files(
-    route: str, docs: List[Tuple[str, Dict[str, Any]]]
+    route: str, docs: List[Tuple[str, Dict[str, Any]]], page: int = 1
 ) -> Dict[str, Any]:
-    """Persist combined + overview under knowledge_base/sba_api_live/."""
-    live = _kb_live_dir()
-    slug = _safe_slug(route or "sba")
-    written = []
+    """
+    Persist combined + overview + children under knowledge_base/sba_api_live/
+    (atomic, skip-unchanged). Files are named by ingest scope, so each page of
+    a route keeps its own set instead of overwriting page 1's.
+    """
+    slug = _safe_slug(_scope_key(route or "sba", page))
+    files: List[Tuple[str, str]] = []
     # Prefer combined + first overview
     by_kind = {}
     for text, meta in docs:
@@ -247,40 +258,90 @@ def _write_kb_files(
         by_kind.setdefault(kind, []).append((text, meta))
 
     if by_kind.get("combined"):
-        path = live / f"{slug}__combined.txt"
-        path.write_text(by_kind["combined"][0][0], encoding="utf-8")
-        written.append(str(path))
+        files.append((f"{slug}__combined.txt", by_kind["combined"][0][0]))
 
     if by_kind.get("topic_overview"):
-        path = live / f"{slug}__overview.txt"
-        path.write_text(by_kind["topic_overview"][0][0], encoding="utf-8")
-        written.append(str(path))
+        files.append((f"{slug}__overview.txt", by_kind["topic_overview"][0][0]))
 
     # Individual children (cap to keep disk light)
     children = by_kind.get("child_item") or []
     for text, meta in children[:40]:
         cid = _safe_slug(str(meta.get("item_id") or meta.get("title") or "item"))
-        path = live / f"{slug}__child_{cid}.txt"
-        path.write_text(text, encoding="utf-8")
-        written.append(str(path))
+        files.append((f"{slug}__child_{cid}.txt", text))
 
-    # Manifest for debugging / chat sources
-    manifest = live / f"{slug}__manifest.txt"
-    lines = [
-        f"route={route}",
-        f"chunks={len(docs)}",
-        f"files={len(written)}",
-        f"updated={time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}",
-    ]
-    for w in written:
-        lines.append(w)
-    manifest.write_text("\n".join(lines), encoding="utf-8")
-    written.append(str(manifest))
-    return {"dir": str(live), "files": written, "count": len(written)}
+    # Manifest (debugging / chat sources) and journal are written by the KB writer
+    return _kb_writer.write_route(_kb_live_dir(), slug, route, files, chunks=len(docs))
+
+
+def _is_synthetic_id(value: Any) -> bool:
+    return value in (None, "") or bool(re.fullmatch(r"item-\d+", str(value)))
+
+
+def _child_identity(chunk: str, meta: Dict[str, Any], page: int) -> str:
+    """
+    Deterministic identity of a child chunk within its route: its path, URL,
+    upstream id or title. Synthetic ids (list positions) are only unique per
+    page/view, so those fall back to the page plus a hash of the content.
+    """
+    for field in ("child_path", "url"):
+        if meta.get(field):
+            return f"{field}:{meta[field]}"
+    if meta.get("item_id") and not meta.get("synthetic_id"):
+        return f"id:{meta['item_id']}"
+    if meta.get("title"):
+        return f"title:{meta['title']}"
+    return f"page:{page}:{hashlib.sha1(chunk.encode('utf-8')).hexdigest()[:16]}"
+
+
+def chunk_id(route: str, kind: str, item_id: str = "") -> str:
+    """Stable Chroma id for one route chunk (same route/kind/item -> same id)."""
+    raw = f"{route}|{kind}|{item_id}"
+    return "sba:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24]
 
 
-def _ingest_chroma(docs: List[Tuple[str, Dict[str, Any]]], route: str) -> Dict[str, Any]:
-    """Soft-add documents to Chroma via RAGManager."""
+def _content_hash(chunk: str, meta: Dict[str, Any]) -> str:
+    stable = sorted((k, str(v)) for k, v in meta.items() if k not in ("ingested_at", "content_hash"))
+    return hashlib.sha1(f"{chunk}|{stable}".encode("utf-8")).hexdigest()[:16]
+
+
+def _chroma_chunks(
+    docs: List[Tuple[str, Dict[str, Any]]], route: str, page: int
+) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """id -> (chunk, metadata) for the chunks that go to Chroma."""
+    out: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    # Skip giant combined for vector store (duplicate content); keep overview + children
+    for text, meta in docs:
+        kind = (meta or {}).get("kind") or "chunk"
+        if kind == "combined":
+            continue
+        # Cap chunk size for chroma
+        chunk = text[:8000]
+        m = {k: v for k, v in (meta or {}).items() if isinstance(v, (str, int, float, bool))}
+        # Every page of a route has its own overview, so the page is part of
+        # the overview identity; ``prune`` also scopes deletes by ``page``
+        m["page"] = page
+        identity = _child_identity(chunk, m, page) if kind == "child_item" else f"page:{page}"
+        doc_id = chunk_id(route, kind, identity)
+        n = 1
+        while doc_id in out:  # repeated identities within one envelope
+            n += 1
+            doc_id = chunk_id(route, kind, f"{identity}#{n}")
+        m["content_hash"] = _content_hash(chunk, m)
+        # Kept for older debugging tooling that reads doc_hash
+        m["doc_hash"] = m["content_hash"]
+        out[doc_id] = (chunk, m)
+    return out
+
+
+def _ingest_chroma(
+    docs: List[Tuple[str, Dict[str, Any]]], route: str, *, page: int = 1, prune: bool = True
+) -> Dict[str, Any]:
+    """
+    Sync one route's chunks into Chroma idempotently: unchanged chunks are
+    skipped, new/changed ones upserted under stable ids, and (when ``prune``)
+    chunks of this route+page that are no longer present are deleted —
+    including pre-stable-id duplicates, which have no ``page``.
+    """
     try:
         from backend.services.rag import get_rag_manager
     except Exception as e:
@@ -290,29 +351,61 @@ def _ingest_chroma(docs: List[Tuple[str, Dict[str, Any]]], route: str) -> Dict[s
     if not rag or not rag.is_available():
         return {"ok": False, "reason": "chroma_unavailable", "added": 0}
 
-    added = 0
-    errors = 0
-    # Skip giant combined for vector store (duplicate content); keep overview + children
-    for text, meta in docs:
-        if (meta or {}).get("kind") == "combined":
-            continue
-        # Cap chunk size for chroma
-        chunk = text[:8000]
-        m = {k: v for k, v in (meta or {}).items() if isinstance(v, (str, int, float, bool))}
-        m["ingested_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        # Stable-ish id in metadata for debugging
-        m["doc_hash"] = hashlib.sha1(
-            f"{route}|{m.get('kind')}|{m.get('item_id')}|{chunk[:120]}".encode("utf-8")
-        ).hexdigest()[:16]
-        try:
-            result = rag.add_document(chunk, m)
-            if isinstance(result, dict) and result.get("error"):
-                errors += 1
-            else:
-                added += 1
-        except Exception:
-            errors += 1
-    return {"ok": added > 0, "added": added, "errors": errors}
+    wanted = _chroma_chunks(docs, route, page)
+    found = rag.get_document_metadata({"$and": [{"source": "sba_api"}, {"route": route}]})
+    if not isinstance(found, dict) or found.get("error"):
+        logger.debug("Chroma lookup for %s failed (%s); upserting all", route, (found or {}).get("error"))
+        existing: Dict[str, Dict[str, Any]] = {}
+    else:
+        existing = found.get("documents") or {}
+
+    changed = [
+        doc_id for doc_id, (_, meta) in wanted.items()
+        if (existing.get(doc_id) or {}).get("content_hash") != meta["content_hash"]
+    ]
+    stale = []
+    if prune:
+        stale = [
+            doc_id for doc_id, meta in existing.items()
+            if doc_id not in wanted and (meta or {}).get("page") in (None, page)
+        ]
+
+    upserted = deleted = errors = 0
+    if changed:
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        result = rag.upsert_documents(
+            [wanted[i][0] for i in changed],
+            [{**wanted[i][1], "ingested_at": now} for i in changed],
+            changed,
+        )
+        if isinstance(result, dict) and not result.get("error"):
+            upserted = int(result.get("count", len(changed)))
+        errors += len(changed) - upserted
+    if stale:
+        result = rag.delete_documents(stale)
+        if isinstance(result, dict) and not result.get("error"):
+            deleted = len(stale)
+        else:
+            errors += len(stale)
+    return {
+        "ok": errors == 0,
+        "added": upserted,
+        "unchanged": len(wanted) - len(changed),
+        "deleted": deleted,
+        "errors": errors,
+    }
+
+
+def _envelope_page(envelope: dict) -> int:
+    try:
+        return max(1, int(envelope.get("currentPage") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _scope_key(route: str, page: int) -> str:
+    """Throttle / queue key: pages of one route are separate envelopes."""
+    return route if page <= 1 else f"{route}?page={page}"
 
 
 def ingest_sba_envelope(
@@ -321,10 +414,12 @@ def ingest_sba_envelope(
     title: str = "",
     *,
     force: bool = False,
+    prune: bool = True,
 ) -> Dict[str, Any]:
     """
     Ingest one SBA API response into RAG (KB files + optional Chroma).
-    Safe to call on every parent/child fetch.
+    Safe to call on every parent/child fetch. ``prune=False`` (search /
+    filtered views) upserts without deleting chunks missing from this view.
     """
     route = str(route or (envelope or {}).get("path") or "").strip()
     if not route or not isinstance(envelope, dict):
@@ -336,9 +431,11 @@ def ingest_sba_envelope(
         if envelope.get("error") or envelope.get("degraded") and not items:
             return {"ok": False, "reason": "no_content"}
 
+    page = _envelope_page(envelope)
+    scope = _scope_key(route, page)
     now = time.time()
     with _lock:
-        last = _last_ingest.get(route, 0)
+        last = _last_ingest.get(scope, 0)
         if not force and (now - last) < _MIN_REINGEST_SECONDS:
             return {
                 "ok": True,
@@ -347,21 +444,27 @@ def ingest_sba_envelope(
                 "route": route,
                 "age_s": int(now - last),
             }
-        _last_ingest[route] = now
+        _last_ingest[scope] = now
 
     try:
         docs = envelope_to_documents(envelope, route=route, title=title)
         if not docs:
             return {"ok": False, "reason": "no_docs", "route": route}
 
-        kb = _write_kb_files(route, docs)
-        chroma = _ingest_chroma(docs, route)
+        kb = _write_kb_files(route, docs, page)
+        if kb.get("written"):
+            kb_index.notify_changed(kb.get("files") or [])
+        chroma = _ingest_chroma(docs, route, page=page, prune=prune)
         logger.info(
-            "SBA→RAG ingest route=%s docs=%s kb_files=%s chroma_added=%s",
+            "SBA→RAG ingest route=%s page=%s docs=%s kb_written=%s/%s chroma_added=%s unchanged=%s deleted=%s",
             route,
+            page,
             len(docs),
+            kb.get("written"),
             kb.get("count"),
             chroma.get("added"),
+            chroma.get("unchanged"),
+            chroma.get("deleted"),
         )
         return {
             "ok": True,
@@ -376,35 +479,51 @@ def ingest_sba_envelope(
         return {"ok": False, "reason": str(e), "route": route}
 
 
-def schedule_sba_rag_ingest(
-    envelope: dict, route: str = "", title: str = "", *, force: bool = False
-) -> None:
-    """Fire-and-forget ingest so API latency is not blocked on Chroma."""
+def _run_queued_ingest(scope: str, job: Tuple[dict, str, str, bool, bool]) -> None:
+    envelope, route, title, force, prune = job
+    ingest_sba_envelope(envelope, route=route, title=title, force=force, prune=prune)
+
+
+# Fixed pool + bounded queue instead of a thread per fetch; a route queued twice
+# keeps only its latest envelope, and a full queue drops its oldest route.
+_queue = CoalescingQueue(
+    _run_queued_ingest,
+    workers=int(os.getenv("SBA_INGEST_WORKERS", "2")),
+    max_pending=int(os.getenv("SBA_INGEST_QUEUE_MAX", "64")),
+    name="sba-rag-ingest",
+)
 
-    def _run():
-        try:
-            ingest_sba_envelope(envelope, route=route, title=title, force=force)
-        except Exception as e:
-            logger.warning("async SBA→RAG ingest failed: %s", e)
 
+def schedule_sba_rag_ingest(
+    envelope: dict, route: str = "", title: str = "", *, force: bool = False, prune: bool = True
+) -> None:
+    """Queue ingest so API latency is not blocked on KB writes / Chroma."""
+    route = str(route or (envelope or {}).get("path") or "").strip()
+    if not route or not isinstance(envelope, dict):
+        return
+    scope = _scope_key(route, _envelope_page(envelope))
+    if not force:
+        with _lock:
+            recent = (time.time() - _last_ingest.get(scope, 0)) < _MIN_REINGEST_SECONDS
+        if recent:
+            return  # would be throttled by ingest_sba_envelope anyway
     try:
-        t = threading.Thread(target=_run, name=f"sba-rag-{_safe_slug(route)[:40]}", daemon=True)
-        t.start()
+        _queue.submit(scope, (envelope, route, title, force, prune))
     except Exception as e:
         logger.warning("could not schedule SBA→RAG ingest: %s", e)
-        # Sync fallback (still soft)
-        try:
-            ingest_sba_envelope(envelope, route=route, title=title, force=force)
-        except Exception:
-            pass
 
 
 def ingest_status() -> Dict[str, Any]:
     live = _kb_live_dir()
+    index = kb_index.get_kb_index()
     files = list(live.glob("*.txt")) if live.exists() else []
     return {
         "live_dir": str(live),
         "file_count": len(files),
         "routes_cached": len(_last_ingest),
         "recent_routes": sorted(_last_ingest.keys())[-20:],
+        "queue": _queue.stats(),
+        "queued_routes": [str(r) for r in _queue.pending_keys()[:20]],
+        "kb_writes": _kb_writer.stats(),
+        "kb_index": index.stats() if index is not None else None,
     }
@@ -0,0 +1,188 @@
+"""
+Offline snapshot of last-known-live SBA route pages.
+
+Holds the normalized page (``_normalize_page`` output) of each browse route
+the last time it was built from live sources, with its ``retrieved_at``.
+A fresh worker — or one that cannot reach sba.gov — can answer from here
+instead of cold-fetching or degrading to the hard-coded static catalogs.
+
+File format (gzip-compressed JSON, written atomically via temp file + rename):
+
+  {
+    "format": "pocketpro-sba-snapshot",
+    "version": 1,
+    "written_at": <epoch seconds>,
+    "routes": {"<route key>": {"stored_at": <epoch>, "page": {...}}}
+  }
+
+A file with another format/version is ignored (treated as empty). Loading
+is lazy (first lookup); writes run on a background thread, throttled to
+``SBA_SNAPSHOT_WRITE_SECONDS``, and merge with whatever other workers wrote,
+newest entry per key wins.
+Never raises to callers.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMAT = "pocketpro-sba-snapshot"
+VERSION = 1
+
+_DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instance", "sba_snapshot.json.gz"
+)
+_WRITE_INTERVAL = float(os.getenv("SBA_SNAPSHOT_WRITE_SECONDS", "300"))
+
+
+def _read_file(path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            doc = json.load(fh)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("SBA snapshot unreadable (%s): %s", path, e)
+        return {}
+    if not isinstance(doc, dict) or doc.get("format") != FORMAT or doc.get("version") != VERSION:
+        logger.info("SBA snapshot %s has an unknown format/version; ignoring", path)
+        return {}
+    routes = doc.get("routes")
+    return routes if isinstance(routes, dict) else {}
+
+
+class SnapshotStore:
+    def __init__(self, path: str = _DEFAULT_PATH, write_interval: float = _WRITE_INTERVAL) -> None:
+        self.path = path
+        self.write_interval = max(0.0, float(write_interval))
+        self._routes: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._last_write = time.time()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._atexit = False
+        self._flush_pid: Optional[int] = None
+        self._flusher: Optional[threading.Thread] = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """{"stored_at", "page"} for ``key``, or None."""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._routes.get(key)
+        return entry if isinstance(entry, dict) and isinstance(entry.get("page"), dict) else None
+
+    def put(self, key: str, page: Dict[str, Any]) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._routes[key] = {"stored_at": time.time(), "page": page}
+            self._dirty = True
+            if not self._atexit:
+                atexit.register(self.flush)
+                self._atexit = True
+            # One background flush per process at a time (a pid from before a fork does not count)
+            due = (
+                time.time() - self._last_write >= self.write_interval
+                and self._flush_pid != os.getpid()
+            )
+            if due:
+                self._flush_pid = os.getpid()
+        if due:
+            # Off the request thread: the merge + gzip + rewrite must not delay build()
+            self._flusher = threading.Thread(target=self._background_flush, name="sba-snapshot-flush", daemon=True)
+            self._flusher.start()
+
+    def _background_flush(self) -> None:
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._flush_pid = None
+
+    def flush(self) -> bool:
+        """Write pending routes (merged with the file on disk). True when written."""
+        with self._write_lock:
+            # Only the copy happens under _lock; get()/put() are not blocked by the file I/O
+            with self._lock:
+                if not self._dirty or self._routes is None:
+                    return False
+                pending = dict(self._routes)
+                self._dirty = False
+            merged = _read_file(self.path)
+            for key, entry in pending.items():
+                other = merged.get(key)
+                if not isinstance(other, dict) or float(other.get("stored_at") or 0) <= entry["stored_at"]:
+                    merged[key] = entry
+            doc = {"format": FORMAT, "version": VERSION, "written_at": time.time(), "routes": merged}
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+                    json.dump(doc, fh, separators=(",", ":"), default=str)
+                os.replace(tmp, self.path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("SBA snapshot write failed (%s): %s", self.path, e)
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                with self._lock:
+                    self._dirty = True
+                return False
+            with self._lock:
+                # Keep anything put() stored while the file was being written
+                for key, entry in merged.items():
+                    current = self._routes.get(key)
+                    if current is None or current["stored_at"] < float(entry.get("stored_at") or 0):
+                        self._routes[key] = entry
+                self._last_write = time.time()
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "version": VERSION,
+                "loaded": self._routes is not None,
+                "routes": len(self._routes or {}),
+                "dirty": self._dirty,
+                "last_write": self._last_write,
+            }
+
+    def _ensure_loaded(self) -> None:
+        # Caller holds the lock
+        if self._routes is None:
+            self._routes = _read_file(self.path)
+            if self._routes:
+                logger.info("SBA snapshot loaded: %d routes from %s", len(self._routes), self.path)
+
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Process-wide store (None when ``SBA_SNAPSHOT_ENABLED=false``)."""
+    global _store
+    if os.getenv("SBA_SNAPSHOT_ENABLED", "true").lower() != "true":
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SnapshotStore(os.getenv("SBA_SNAPSHOT_PATH", _DEFAULT_PATH))
+    return _store
+
+
+def set_snapshot_store(store: Optional[SnapshotStore]) -> None:
+    """Swap the store (tests)."""
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,151 @@
+"""
+Sparse fieldsets and compact mode for JSON API responses.
+
+The default SBA envelope and chat/RAG bodies repeat content under several
+aliases for older clients (``items``/``results``, ``answer``/``response``/
+``message``, ``sources``/``context``, item ``url``/``link``) and the digest
+embeds item previews inside ``digestion.groups``. The prebuilt SPA depends
+on that shape, so it stays the default. Clients that opt in get less:
+
+- ``?fields=items.id,items.title,totalPages`` keeps only the listed (dotted)
+  paths; a path through a list applies to every element.
+- ``?compact=1`` drops aliases whose value equals the canonical key, item
+  fields that duplicate another field, and the group previews (groups keep
+  ``item_ids``).
+
+Both can be combined (projection first, then compaction). ``error`` is always
+kept so failures stay visible. Never raises: a malformed spec shapes nothing.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_FIELDS = 64
+MAX_DEPTH = 6
+
+# First key present is canonical; later keys are dropped when their value is equal
+ALIAS_GROUPS = (
+    ('items', 'results'),
+    ('answer', 'response', 'message'),
+    ('sources', 'context'),
+)
+ITEM_ALIASES = (
+    ('url', 'link'),
+    ('summary', 'description'),
+    ('title', 'name'),
+)
+ALWAYS_KEEP = ('error',)
+
+FieldTree = Dict[str, "FieldTree"]
+
+_TRUTHY = {'1', 'true', 'yes', 'on'}
+
+
+def parse_fields(spec: Any) -> Optional[FieldTree]:
+    """``'items.id,items.title,count'`` (or a list of such strings) -> nested key tree; None if empty."""
+    if not spec:
+        return None
+    parts: Iterable[str] = spec.split(',') if isinstance(spec, str) else (
+        p for s in spec if isinstance(s, str) for p in s.split(',')
+    )
+    tree: FieldTree = {}
+    for n, path in enumerate(p.strip() for p in parts if p and p.strip()):
+        if n >= MAX_FIELDS:
+            break
+        node = tree
+        for key in path.split('.')[:MAX_DEPTH]:
+            if key:
+                node = node.setdefault(key, {})
+    return tree or None
+
+
+def shape_options(req) -> Tuple[Optional[FieldTree], bool]:
+    """``(fields, compact)`` from a request's query string, or its JSON body for POSTs."""
+    try:
+        fields = req.args.getlist('fields')
+        compact = req.args.get('compact')
+        if (not fields or compact is None) and req.method == 'POST' and req.is_json:
+            body = req.get_json(silent=True) or {}
+            if isinstance(body, dict):
+                fields = fields or body.get('fields')
+                compact = body.get('compact') if compact is None else compact
+        return parse_fields(fields), str(compact).strip().lower() in _TRUTHY
+    except Exception as e:
+        logger.debug('Response shape options ignored: %s', e)
+        return None, False
+
+
+def project(value: Any, tree: Optional[FieldTree]) -> Any:
+    """Keep only the paths in ``tree`` (an empty subtree keeps the whole value)."""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {k: project(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+def _drop_aliases(obj: Dict[str, Any], groups) -> Dict[str, Any]:
+    out = dict(obj)
+    for group in groups:
+        canonical = next((k for k in group if k in out), None)
+        if canonical is None:
+            continue
+        for alias in group:
+            if alias != canonical and alias in out and (
+                out[alias] is out[canonical] or out[alias] == out[canonical]
+            ):
+                del out[alias]
+    return out
+
+
+def _compact_item(item: Any) -> Any:
+    if not isinstance(item, dict):
+        return item
+    return _drop_aliases(item, ITEM_ALIASES)
+
+
+def compact(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop top-level aliases, duplicate item fields and digest group previews."""
+    out = _drop_aliases(payload, ALIAS_GROUPS)
+    for key in ('items', 'results'):
+        if isinstance(out.get(key), list):
+            out[key] = [_compact_item(it) for it in out[key]]
+    digestion = out.get('digestion')
+    if isinstance(digestion, dict) and isinstance(digestion.get('groups'), list):
+        digestion = dict(digestion)
+        digestion['groups'] = [
+            {k: v for k, v in grp.items() if k != 'preview'} if isinstance(grp, dict) else grp
+            for grp in digestion['groups']
+        ]
+        out['digestion'] = digestion
+    return out
+
+
+def shape_payload(payload: Any, fields: Optional[FieldTree] = None, compact_mode: bool = False) -> Any:
+    """Apply ``fields`` then compact mode to a JSON object; anything else is returned as-is."""
+    if not isinstance(payload, dict) or not (fields or compact_mode):
+        return payload
+    try:
+        out = project(payload, fields) if fields else payload
+        if fields:
+            for key in ALWAYS_KEEP:
+                if key in payload and key not in out:
+                    out[key] = payload[key]
+        return compact(out) if compact_mode else out
+    except Exception as e:
+        logger.debug('Response shaping skipped: %s', e)
+        return payload
+
+
+def shape_from_request(payload: Any, req=None) -> Any:
+    """``shape_payload`` with options read from ``req`` (default: the current Flask request)."""
+    if req is None:
+        from flask import request as req
+    fields, compact_mode = shape_options(req)
+    return shape_payload(payload, fields, compact_mode)
@@ -0,0 +1,95 @@
+"""
+Batched vector-store writes.
+
+Ingest and uploads used to write one chunk per call — one embedding pass
+and one Chroma round trip each. ``write_batches`` splits a document list
+into ``batch_size`` slices, embeds each slice in one call (when an
+embedding function is given) and writes slices on up to ``concurrency``
+threads, so a 40-child envelope or a long upload is a few bulk requests.
+Embedding (ONNX) and HTTP both release the GIL, so slices overlap.
+
+Knobs: CHROMA_BATCH_SIZE (default 64), CHROMA_WRITE_CONCURRENCY (default 2).
+Never raises: failed slices are reported in the result.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("CHROMA_BATCH_SIZE", "64"))
+CONCURRENCY = int(os.getenv("CHROMA_WRITE_CONCURRENCY", "2"))
+
+# write(texts, metadatas, ids, embeddings_or_None) -> None (raises on failure)
+Write = Callable[[List[str], List[Dict[str, Any]], List[str], Optional[List[Any]]], None]
+Embed = Callable[[List[str]], List[Any]]
+
+
+def chunk_text(text: str, size: int = 800, overlap: int = 80) -> List[str]:
+    """Split ``text`` into ~``size``-char chunks on paragraph/sentence breaks, with overlap."""
+    text = (text or "").strip()
+    if len(text) <= size:
+        return [text] if text else []
+    chunks: List[str] = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + size)
+        if end < len(text):
+            window = text[start:end]
+            cut = max(window.rfind("\n\n"), window.rfind(". "), window.rfind("\n"))
+            if cut > size // 2:
+                end = start + cut + 1
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [c for c in chunks if c]
+
+
+def write_batches(
+    write: Write,
+    texts: Sequence[str],
+    metadatas: Sequence[Dict[str, Any]],
+    ids: Sequence[str],
+    *,
+    embed: Optional[Embed] = None,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Write in slices; ``{"success", "count", "ids", "batches", "errors"}``."""
+    size = max(1, int(batch_size or BATCH_SIZE))
+    slices = [(i, min(i + size, len(texts))) for i in range(0, len(texts), size)]
+
+    def _one(bounds):
+        lo, hi = bounds
+        batch = list(texts[lo:hi])
+        try:
+            vectors = embed(batch) if embed is not None else None
+            write(batch, list(metadatas[lo:hi]), list(ids[lo:hi]), vectors)
+            return hi - lo, None
+        except Exception as e:
+            logger.warning("Vector batch %d-%d failed: %s", lo, hi, e)
+            return 0, f"{lo}-{hi}: {e}"
+
+    workers = max(1, min(int(concurrency or CONCURRENCY), len(slices)))
+    if workers == 1:
+        outcomes = [_one(b) for b in slices]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vector-batch") as pool:
+            outcomes = list(pool.map(_one, slices))
+    errors = [err for _, err in outcomes if err]
+    result: Dict[str, Any] = {
+        "success": not errors,
+        "count": sum(n for n, _ in outcomes),
+        "ids": list(ids),
+        "batches": len(slices),
+    }
+    if errors:
+        result["errors"] = errors
+        if not result["count"]:
+            result["error"] = errors[0]
+    return result
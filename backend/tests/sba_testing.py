@@ -0,0 +1,32 @@
+"""
+Shared fixtures for the /api/sba route tests.
+
+Lives outside conftest.py because that conftest builds the full app
+(``create_app``), which needs services these route tests do not. Import
+both fixtures into a test module to use them:
+
+    from sba_testing import sba_app, sba_client  # noqa: F401
+"""
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from backend.routes.sba import sba_bp
+from backend.services.frozen_catalog import clear_prebuilt
+
+
+@pytest.fixture
+def sba_app():
+    """Bare Flask app with only the SBA blueprint; RAG ingest is not scheduled."""
+    clear_prebuilt()
+    app = Flask(__name__)
+    app.register_blueprint(sba_bp, url_prefix='/api/sba')
+    with patch('backend.services.sba_rag_ingest.schedule_sba_rag_ingest'):
+        yield app
+    clear_prebuilt()
+
+
+@pytest.fixture
+def sba_client(sba_app):
+    return sba_app.test_client()
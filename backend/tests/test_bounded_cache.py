@@ -0,0 +1,77 @@
+import time
+
+from backend.services.bounded_cache import BoundedTTLCache, approx_size
+
+
+class TestBoundedTTLCache:
+    def test_hit_miss_counters(self):
+        cache = BoundedTTLCache(max_bytes=1000)
+        assert cache.get('a') is None
+        cache.set('a', 'hello')
+        assert cache.get('a') == 'hello'
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['bytes'] == 5
+
+    def test_lru_eviction_respects_byte_budget(self):
+        cache = BoundedTTLCache(max_bytes=20)
+        cache.set('a', 'x' * 8)
+        cache.set('b', 'y' * 8)
+        cache.get('a')  # a is now most recently used
+        cache.set('c', 'z' * 8)
+        assert 'b' not in cache
+        assert cache.get('a') == 'x' * 8
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['bytes'] <= 20
+
+    def test_expired_entries_evicted_before_live_ones(self):
+        cache = BoundedTTLCache(max_bytes=20)
+        cache.set('old', 'x' * 8, ttl=-1)
+        cache.set('live', 'y' * 8)
+        cache.set('new', 'z' * 8)
+        assert 'old' not in cache
+        assert cache.get('live') == 'y' * 8
+        assert cache.stats()['evictions'] == 0
+
+    def test_ttl_expiry_on_read(self):
+        cache = BoundedTTLCache(max_bytes=1000)
+        cache.set('a', 'v', ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get('a') is None
+        assert cache.stats()['bytes'] == 0
+
+    def test_entry_limit_and_oversized_values(self):
+        cache = BoundedTTLCache(max_bytes=10, max_entries=2)
+        cache.set('big', 'x' * 50)
+        assert 'big' not in cache
+        assert cache.stats()['rejected'] == 1
+        for key in ('a', 'b', 'c'):
+            cache.set(key, '1')
+        assert len(cache) == 2
+
+    def test_replacing_key_updates_bytes(self):
+        cache = BoundedTTLCache(max_bytes=1000)
+        cache.set('a', 'x' * 10)
+        cache.set('a', 'x' * 3)
+        assert cache.stats()['bytes'] == 3
+
+    def test_caller_supplied_size(self):
+        cache = BoundedTTLCache(max_bytes=1000)
+        cache.set('a', {'large': 'x' * 500}, size=40)
+        assert cache.stats()['bytes'] == 40
+
+    def test_approx_size_json(self):
+        assert approx_size({'a': 1}) == len('{"a":1}')
+        assert approx_size(None) == 0
+
+    def test_clear_keeps_counters_until_reset(self):
+        cache = BoundedTTLCache(max_bytes=1000)
+        cache.set('a', '1')
+        cache.get('a')
+        cache.get('missing')
+        cache.clear()
+        stats = cache.stats()
+        assert stats['hits'] == stats['misses'] == 1 and stats['entries'] == 0
+        cache.reset_stats()
+        assert cache.stats()['hits'] == cache.stats()['misses'] == 0
@@ -0,0 +1,60 @@
+from backend.services.SBA_Content import _filter_items
+from backend.services.catalog_index import CatalogIndex, IndexCache, query_tokens, rank_items
+
+CARDS = [
+    {'title': 'SBA 7(a) loans', 'description': 'General purpose loans up to $5 million.'},
+    {'title': 'Microloans', 'description': 'Small loans through nonprofit intermediaries.'},
+    {'title': 'Lender Match', 'description': 'Connect with SBA lenders.'},
+    {'title': 'Disaster assistance', 'description': 'Recovery after declared disasters.'},
+]
+
+
+class TestCatalogIndex:
+    def test_query_tokens_drop_stopwords(self):
+        assert query_tokens('The SBA loans and grants') == ['loans', 'grants']
+
+    def test_prefix_matching(self):
+        ranked = rank_items(CARDS, 'lend')
+        assert ranked == [CARDS[2]]
+
+    def test_exact_and_title_matches_rank_first(self):
+        ranked = rank_items(CARDS, 'loans')
+        assert ranked[0] is CARDS[0]
+        assert CARDS[3] not in ranked
+
+    def test_multi_token_query_prefers_docs_matching_more_tokens(self):
+        ranked = rank_items(CARDS, 'disaster recovery loans')
+        assert ranked[0] is CARDS[3]
+
+    def test_no_usable_tokens(self):
+        assert rank_items(CARDS, 'a ?') is None
+
+    def test_positions_follow_input_order(self):
+        index = CatalogIndex(CARDS)
+        assert [pos for pos, _ in index.search(['match'])] == [2]
+
+
+class TestIndexCache:
+    def test_same_content_reuses_index(self):
+        cache = IndexCache()
+        cache.get([dict(c) for c in CARDS])
+        cache.get([dict(c) for c in CARDS])
+        assert cache.stats() == {'hits': 1, 'builds': 1, 'evictions': 0, 'entries': 1}
+
+    def test_changed_catalog_rebuilds(self):
+        cache = IndexCache(max_entries=1)
+        cache.get(CARDS)
+        cache.get(CARDS + [{'title': 'New card'}])
+        stats = cache.stats()
+        assert stats['builds'] == 2 and stats['evictions'] == 1
+
+
+class TestFilterItems:
+    def test_wildcard_returns_catalog(self):
+        assert _filter_items(CARDS, '*') is CARDS
+
+    def test_no_match_never_empties_catalog(self):
+        assert _filter_items(CARDS, 'zzzz') is CARDS
+
+    def test_ranked_subset(self):
+        assert _filter_items(CARDS, 'micro') == [CARDS[1]]
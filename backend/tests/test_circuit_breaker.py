@@ -0,0 +1,118 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, clear_sba_cache, reset_sba_breakers
+from backend.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from backend.services.sba_http_cache import MemoryHTTPCache, set_http_cache
+
+
+def _response(status=200, text='', json_data=None, headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = text
+    resp.headers = headers or {}
+    resp.json.return_value = json_data
+    resp.raise_for_status = MagicMock(
+        side_effect=requests.HTTPError(f'{status} error') if status >= 400 else None
+    )
+    return resp
+
+
+@pytest.fixture
+def fresh_state():
+    set_http_cache(MemoryHTTPCache())
+    clear_sba_cache()
+    reset_sba_breakers()
+    SBA_Content._RATE_LIMITER.reset()
+    yield
+    set_http_cache(None)
+    clear_sba_cache()
+    reset_sba_breakers()
+    SBA_Content._RATE_LIMITER.reset()
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker('x', failure_threshold=2, cooldown_seconds=60)
+        breaker.record_failure('boom')
+        assert breaker.state == CLOSED
+        breaker.record_failure('boom')
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+        assert breaker.snapshot()['short_circuited'] == 1
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker('x', failure_threshold=1, cooldown_seconds=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker('x', failure_threshold=3, cooldown_seconds=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow() is True
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+    def test_abandoned_probe_is_replaced_after_cooldown(self):
+        breaker = CircuitBreaker('x', failure_threshold=1, cooldown_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow() is True  # probe that never records an outcome
+        assert breaker.allow() is False
+        time.sleep(0.06)
+        assert breaker.allow() is True
+        assert breaker.snapshot()['abandoned_probes'] == 1
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker('x', failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+
+class TestSourceBreakers:
+    def test_legacy_404_opens_circuit_and_skips_network(self, fresh_state):
+        session = MagicMock()
+        session.get.return_value = _response(status=404)
+        api = SBAContentAPI(session=session)
+
+        api._legacy_search('articles', page=1)
+        assert session.get.call_count == 1
+        result = api._legacy_search('blogs', page=1)
+        assert result['error'] == 'circuit_open'
+        assert session.get.call_count == 1
+        assert api.get_source_status()['breakers']['legacy_json']['state'] == OPEN
+
+    def test_missing_html_page_negatively_cached_without_tripping(self, fresh_state):
+        session = MagicMock()
+        session.get.return_value = _response(status=404)
+        api = SBAContentAPI(session=session)
+
+        assert api._get_html('https://www.sba.gov/gone') is None
+        assert api._get_html('https://www.sba.gov/gone') is None
+        assert session.get.call_count == 1
+        assert SBA_Content._BREAKERS['sba_html'].state == CLOSED
+
+    def test_sbir_rate_limits_open_circuit(self, fresh_state):
+        session = MagicMock()
+        session.get.return_value = _response(status=429, headers={'Retry-After': '0'})
+        api = SBAContentAPI(session=session)
+
+        for rows in (1, 2, 3):
+            api._get_json(f'{SBA_Content.SBIR_API_BASE}/awards', params={'rows': rows})
+        assert session.get.call_count == 2
+        assert SBA_Content._BREAKERS['sbir'].state == OPEN
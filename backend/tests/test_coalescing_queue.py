@@ -0,0 +1,77 @@
+import threading
+import time
+from unittest.mock import patch
+
+from backend.services import sba_rag_ingest
+from backend.services.coalescing_queue import CoalescingQueue
+
+
+def _blocked_queue(**kwargs):
+    gate = threading.Event()
+    started = threading.Event()
+    seen = []
+
+    def handler(key, payload):
+        started.set()
+        gate.wait(2)
+        seen.append((key, payload))
+
+    return CoalescingQueue(handler, **kwargs), gate, started, seen
+
+
+class TestCoalescingQueue:
+    def test_latest_payload_wins_and_keeps_position(self):
+        queue, gate, started, seen = _blocked_queue(workers=1, max_pending=8)
+        queue.submit('busy', 0)
+        assert started.wait(2)  # the only worker is now held on 'busy'
+        queue.submit('loans', 1)
+        queue.submit('offices', 1)
+        assert queue.submit('loans', 2) is False
+        stats = queue.stats()
+        assert stats['depth'] == 2 and stats['coalesced'] == 1 and stats['busy'] == 1
+        assert stats['lag_seconds'] >= 0
+        gate.set()
+        assert queue.join(2)
+        assert seen == [('busy', 0), ('loans', 2), ('offices', 1)]
+
+    def test_full_queue_drops_oldest(self):
+        queue, gate, started, seen = _blocked_queue(workers=1, max_pending=2)
+        queue.submit('busy', 0)
+        assert started.wait(2)
+        for key in ('a', 'b', 'c'):
+            queue.submit(key, key)
+        assert queue.pending_keys() == ['b', 'c']
+        assert queue.stats()['dropped'] == 1
+        gate.set()
+        assert queue.join(2)
+        assert [k for k, _ in seen] == ['busy', 'b', 'c']
+
+    def test_fixed_worker_count_and_errors_counted(self):
+        def handler(key, payload):
+            if key == 'bad':
+                raise ValueError('boom')
+
+        queue = CoalescingQueue(handler, workers=2, max_pending=16, name='t')
+        before = threading.active_count()
+        for i in range(10):
+            queue.submit(i, i)
+        queue.submit('bad', None)
+        assert queue.join(2)
+        assert threading.active_count() - before <= 2
+        stats = queue.stats()
+        assert stats['processed'] == 11 and stats['errors'] == 1
+
+
+class TestScheduleIngest:
+    def test_routes_through_queue_and_skips_recent(self):
+        with patch.object(sba_rag_ingest, 'ingest_sba_envelope') as ingest:
+            sba_rag_ingest.schedule_sba_rag_ingest({'items': [1]}, route='/api/sba/content/test-queue')
+            assert sba_rag_ingest._queue.join(2)
+            ingest.assert_called_once()
+            sba_rag_ingest._last_ingest['/api/sba/content/test-queue'] = time.time()
+            sba_rag_ingest.schedule_sba_rag_ingest({'items': [2]}, route='/api/sba/content/test-queue')
+            assert sba_rag_ingest._queue.join(2)
+            assert ingest.call_count == 1
+        status = sba_rag_ingest.ingest_status()
+        assert status['queue']['depth'] == 0 and status['queue']['workers'] >= 1
+        sba_rag_ingest._last_ingest.pop('/api/sba/content/test-queue', None)
@@ -0,0 +1,55 @@
+import gzip
+import json
+
+import pytest
+from flask import jsonify
+
+from backend.services.compression import compression_stats, init_compression, reset_compression_stats
+
+from sba_testing import sba_app  # noqa: F401
+
+
+@pytest.fixture
+def client(sba_app):
+    reset_compression_stats()
+    init_compression(sba_app)
+
+    @sba_app.route('/big')
+    def big():
+        return jsonify({'answer': 'SBA 7(a) loans ' * 200})
+
+    @sba_app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    return sba_app.test_client()
+
+
+class TestCompression:
+    def test_gzip_negotiated_above_threshold(self, client):
+        resp = client.get('/big', headers={'Accept-Encoding': 'gzip, deflate'})
+        assert resp.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in resp.headers['Vary']
+        assert json.loads(gzip.decompress(resp.data))['answer'].startswith('SBA 7(a)')
+        stats = compression_stats()
+        assert stats['compressed'] == 1 and stats['bytes_saved'] > 0
+
+    def test_small_or_not_accepted_left_alone(self, client):
+        assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+        plain = client.get('/big', headers={'Accept-Encoding': 'identity'})
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.get_json()['answer']
+        assert compression_stats()['skipped_small'] == 1
+
+    def test_prebuilt_catalog_compressed_once(self, client):
+        first = client.get('/api/sba/programs', headers={'Accept-Encoding': 'gzip'})
+        second = client.get('/api/sba/programs', headers={'Accept-Encoding': 'gzip'})
+        assert first.headers['Content-Encoding'] == 'gzip'
+        assert first.data == second.data
+        assert first.headers['ETag'].startswith('W/')
+        assert compression_stats()['precompressed_hits'] == 1
+        revalidated = client.get(
+            '/api/sba/programs',
+            headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']},
+        )
+        assert revalidated.status_code == 304
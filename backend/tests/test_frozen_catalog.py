@@ -0,0 +1,76 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from backend.routes import sba as sba_routes
+from backend.services.frozen_catalog import (
+    FrozenCatalog,
+    catalog_version,
+    clear_prebuilt,
+    freeze,
+    prebuilt_response,
+)
+
+from sba_testing import sba_app, sba_client  # noqa: F401
+
+
+class TestFreeze:
+    def test_read_only_but_still_dict_and_list(self):
+        cards = freeze([{'id': 'start', 'resources': [{'name': 'Plan'}]}])
+        assert isinstance(cards, list) and isinstance(cards[0], dict)
+        assert isinstance(cards[0]['resources'], list)
+        with pytest.raises(TypeError):
+            cards[0]['id'] = 'x'
+        with pytest.raises(TypeError):
+            cards[0]['resources'].append({})
+        copy = dict(cards[0])
+        copy['id'] = 'x'
+        assert cards[0]['id'] == 'start'
+        assert json.loads(json.dumps(cards)) == [{'id': 'start', 'resources': [{'name': 'Plan'}]}]
+
+    def test_catalog_builds_once_with_content_version(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return [{'id': 'a'}]
+
+        catalog = FrozenCatalog(build, name='test-builds-once')
+        assert catalog() is catalog()
+        assert len(calls) == 1
+        other = FrozenCatalog(lambda: [{'id': 'b'}], name='test-other')
+        assert catalog.version and catalog.version != other.version
+
+    def test_prebuilt_response_serialized_once(self):
+        clear_prebuilt()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {'items': [1, 2]}
+
+        first = prebuilt_response('test', build, json.dumps)
+        second = prebuilt_response('test', build, json.dumps)
+        assert first is second and len(calls) == 1
+        assert first.body == b'{"items": [1, 2]}'
+        assert first.version == catalog_version()
+        clear_prebuilt()
+
+
+class TestPrebuiltRoutes:
+    @pytest.mark.parametrize('path', ['/api/sba/programs', '/api/sba/resources', '/api/sba/content/disaster'])
+    def test_catalog_routes_served_prebuilt(self, sba_client, path):
+        first = sba_client.get(path)
+        assert first.status_code == 200
+        assert first.headers['X-Catalog-Version'] == catalog_version()
+        assert not first.headers['ETag'].startswith('W/')
+        assert sba_client.get(path, headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    def test_envelope_built_once_per_process(self, sba_client):
+        with patch.object(sba_routes, '_envelope', wraps=sba_routes._envelope) as envelope:
+            a = sba_client.get('/api/sba/lifecycle')
+            b = sba_client.get('/api/sba/lifecycle')
+        assert envelope.call_count == 1
+        assert a.data == b.data
+        assert a.get_json()['items'][0]['has_children'] is True
@@ -0,0 +1,104 @@
+import os
+import time
+from unittest.mock import patch
+
+from backend.routes import rag as rag_routes
+from backend.services import kb_index
+from backend.services.kb_index import KBIndex, query_terms, tokenize
+
+
+def _kb(tmp_path):
+    (tmp_path / 'sba_docs').mkdir()
+    (tmp_path / 'sba_docs' / 'seven_a.txt').write_text(
+        'The SBA 7(a) program is the primary business lending program. Eligibility depends on size.')
+    (tmp_path / 'sba_docs' / 'micro.txt').write_text('Microloans provide up to $50,000 to small businesses.')
+    (tmp_path / 'sba_docs' / 'cdc.txt').write_text('504 loans finance real estate and major equipment.')
+    (tmp_path / 'sba_docs' / 'x__manifest.txt').write_text('route=/api/sba/content/loans microloans')
+    return KBIndex(lambda: [tmp_path, tmp_path / 'sba_docs'], refresh_seconds=3600)
+
+
+def _names(hits):
+    return [doc.name for _, doc in hits]
+
+
+def _bump(path, text):
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+def test_tokenize_normalizes_seven_a():
+    for spelling in ('7(a)', '7-a', '7 a', '7a', '7A'):
+        assert '7a' in tokenize(f'SBA {spelling} loans')
+    assert query_terms('What are SBA 7(a) loan rates?') == ['7a', 'rates']
+
+
+def test_build_skips_manifests_and_duplicate_roots(tmp_path):
+    index = _kb(tmp_path)
+    assert index.refresh()
+    assert index.stats()['files'] == 3
+    assert 'x__manifest.txt' not in [d.name for d in index.documents()]
+
+
+def test_search_ranks_and_matches_prefixes(tmp_path):
+    index = _kb(tmp_path)
+    index.refresh()
+    assert _names(index.search(['7a']))[0] == 'seven_a.txt'
+    assert _names(index.search(['microloan'])) == ['micro.txt']
+    assert _names(index.search(['504'])) == ['cdc.txt']
+    assert index.search(['nonexistent']) == []
+
+
+def test_refresh_is_incremental_and_throttled(tmp_path):
+    index = _kb(tmp_path)
+    index.refresh()
+    indexed = index.stats()['files_indexed']
+    _bump(tmp_path / 'sba_docs' / 'micro.txt', 'Community advantage lending.')
+    assert not index.refresh()  # within the refresh interval
+    assert index.refresh(force=True)
+    assert index.stats()['files_indexed'] == indexed + 1
+    assert _names(index.search(['community'])) == ['micro.txt']
+    assert index.search(['microloan']) == []
+
+    (tmp_path / 'sba_docs' / 'cdc.txt').unlink()
+    index.refresh(force=True)
+    assert index.search(['504']) == [] and index.stats()['files_removed'] == 1
+
+
+def test_update_paths_reindexes_immediately(tmp_path):
+    index = _kb(tmp_path)
+    index.refresh()
+    new = tmp_path / 'sba_docs' / 'live.txt'
+    new.write_text('Disaster assistance loans after hurricanes.')
+    assert index.update_paths([str(new), str(tmp_path / 'sba_docs' / 'x__manifest.txt')]) == 1
+    assert _names(index.search(['hurricane'])) == ['live.txt']
+
+
+def test_notify_changed_without_index_is_noop(tmp_path):
+    with patch.object(kb_index, '_index', None):
+        kb_index.notify_changed([str(tmp_path / 'missing.txt')])
+
+
+def test_refresher_thread_builds_index(tmp_path):
+    index = _kb(tmp_path)
+    index.ensure_refresher()
+    index.ensure_refresher()  # already running in this process
+    deadline = time.monotonic() + 5
+    while not index.stats()['builds'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert index.stats()['builds'] == 1
+    assert _names(index.search(['504'])) == ['cdc.txt']
+
+
+def test_local_kb_answer_uses_index(tmp_path):
+    index = _kb(tmp_path)
+    index.refresh()
+    with patch.object(rag_routes, '_kb_index', return_value=index), \
+            patch.object(KBIndex, '_scan', wraps=index._scan) as scan:
+        first = rag_routes._local_kb_sba_answer('Tell me about SBA 7(a) eligibility')
+        second = rag_routes._local_kb_sba_answer('microloans')
+    assert scan.call_count == 0  # queries never walk the knowledge base
+    assert first['mode'] == 'local_kb_fallback'
+    assert first['source_documents'][0]['metadata']['source'] == 'seven_a.txt'
+    assert '7(a)' in first['answer']
+    assert [s['metadata']['source'] for s in second['source_documents']] == ['micro.txt']
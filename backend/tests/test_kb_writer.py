@@ -0,0 +1,129 @@
+import json
+import threading
+from unittest.mock import patch
+
+from backend.services import sba_rag_ingest
+from backend.services.kb_writer import KBWriter
+
+ROUTE = '/api/sba/content/loans'
+SLUG = 'api_sba_content_loans'
+
+
+def _files(child_text='child one'):
+    return [
+        (f'{SLUG}__combined.txt', 'combined text'),
+        (f'{SLUG}__overview.txt', 'overview text'),
+        (f'{SLUG}__child_1.txt', child_text),
+    ]
+
+
+def _journal(tmp_path):
+    path = tmp_path / f'{SLUG}__journal.jsonl'
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_first_write_creates_files_manifest_and_journal(tmp_path):
+    writer = KBWriter()
+    result = writer.write_route(tmp_path, SLUG, ROUTE, _files(), chunks=3)
+    assert result['written'] == 4 and result['unchanged'] == 0 and result['count'] == 4
+    assert (tmp_path / f'{SLUG}__child_1.txt').read_text() == 'child one'
+    manifest = (tmp_path / f'{SLUG}__manifest.txt').read_text()
+    assert f'route={ROUTE}' in manifest and 'chunks=3' in manifest
+    entries = _journal(tmp_path)
+    assert len(entries) == 1 and entries[0]['route'] == ROUTE
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_unchanged_route_writes_nothing(tmp_path):
+    writer = KBWriter()
+    writer.write_route(tmp_path, SLUG, ROUTE, _files())
+    before = {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()}
+    result = writer.write_route(tmp_path, SLUG, ROUTE, _files())
+    assert result['written'] == 0 and result['unchanged'] == 3
+    assert {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()} == before
+    assert len(_journal(tmp_path)) == 1
+    assert writer.stats()['routes_unchanged'] == 1
+
+
+def test_changed_child_rewrites_only_it_and_manifest(tmp_path):
+    writer = KBWriter()
+    writer.write_route(tmp_path, SLUG, ROUTE, _files())
+    result = writer.write_route(tmp_path, SLUG, ROUTE, _files('child two'))
+    assert result['written'] == 2 and result['unchanged'] == 2
+    assert _journal(tmp_path)[-1]['written'] == [f'{SLUG}__child_1.txt', f'{SLUG}__manifest.txt']
+
+
+def test_change_by_another_writer_is_detected(tmp_path):
+    writer = KBWriter()
+    writer.write_route(tmp_path, SLUG, ROUTE, _files())
+    # e.g. another gunicorn worker rewrote the file with older content
+    KBWriter().write_route(tmp_path, SLUG, ROUTE, _files('stale child'))
+    result = writer.write_route(tmp_path, SLUG, ROUTE, _files())
+    assert result['written'] == 2
+    assert (tmp_path / f'{SLUG}__child_1.txt').read_text() == 'child one'
+
+
+def test_fresh_process_skips_files_already_on_disk(tmp_path):
+    KBWriter().write_route(tmp_path, SLUG, ROUTE, _files())
+    result = KBWriter().write_route(tmp_path, SLUG, ROUTE, _files())
+    assert result['written'] == 0
+
+
+def test_readers_only_see_complete_files(tmp_path):
+    writer = KBWriter()
+    versions = {('x' * 20000) + str(i) for i in range(2)}
+    path = tmp_path / f'{SLUG}__combined.txt'
+    writer.write_route(tmp_path, SLUG, ROUTE, [(path.name, sorted(versions)[0])])
+    stop = threading.Event()
+    seen = []
+
+    def read():
+        while not stop.is_set():
+            seen.append(path.read_text())
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    writers = [
+        threading.Thread(target=lambda v=v: [
+            KBWriter().write_route(tmp_path, SLUG, ROUTE, [(path.name, v)]) for _ in range(20)
+        ])
+        for v in versions
+    ]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    reader.join()
+    assert seen and set(seen) <= versions
+
+
+def test_journal_rotates(tmp_path):
+    writer = KBWriter(journal_max_bytes=300)
+    for i in range(6):
+        writer.write_route(tmp_path, SLUG, ROUTE, _files(f'child {i}'))
+    assert (tmp_path / f'{SLUG}__journal.jsonl.1').exists()
+    assert (tmp_path / f'{SLUG}__journal.jsonl').stat().st_size <= 300
+
+
+def test_failed_write_is_reported(tmp_path):
+    missing = tmp_path / 'missing'
+    result = KBWriter().write_route(missing, SLUG, ROUTE, _files())
+    assert result['errors'] == 4 and result['written'] == 0
+
+
+def test_route_pages_keep_separate_files(tmp_path):
+    def docs(title):
+        env = {'path': ROUTE, 'topic': {'title': 'SBA Loans', 'description': 'Loan programs for small businesses.'},
+               'items': [{'id': 'item-0', 'title': title, 'summary': f'{title} program details for borrowers'}]}
+        return sba_rag_ingest.envelope_to_documents(env, route=ROUTE)
+
+    with patch.object(sba_rag_ingest, '_kb_live_dir', return_value=tmp_path), \
+            patch.object(sba_rag_ingest, '_kb_writer', KBWriter()):
+        sba_rag_ingest._write_kb_files(ROUTE, docs('7(a)'), 1)
+        sba_rag_ingest._write_kb_files(ROUTE, docs('Express'), 2)
+        again = [sba_rag_ingest._write_kb_files(ROUTE, docs(t), p)['written'] for t, p in (('7(a)', 1), ('Express', 2))]
+    assert again == [0, 0]
+    assert '7(a)' in (tmp_path / f'{SLUG}__combined.txt').read_text()
+    assert 'Express' in (tmp_path / f'{SLUG}_page_2__combined.txt').read_text()
+    assert len(_journal(tmp_path)) == 1
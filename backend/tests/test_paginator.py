@@ -0,0 +1,151 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, clear_sba_cache, reset_sba_breakers
+from backend.services.paginator import decode_cursor, encode_cursor, prefetching_pages
+from backend.services.sba_http_cache import MemoryHTTPCache, set_http_cache
+from backend.services.sba_snapshot import set_snapshot_store
+
+
+@pytest.fixture
+def pool():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _rows(n):
+    return list(range(n))
+
+
+def _settle(seen, n, timeout=2.0):
+    # Read-ahead runs on the shared fetch pool; wait until it has fetched and cached
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(seen) >= n and SBA_Content._inflight.stats()['in_flight'] == 0:
+            return
+        time.sleep(0.01)
+
+
+class TestPrefetchingPages:
+    def test_reads_one_page_ahead(self, pool):
+        calls = []
+        lock = threading.Lock()
+
+        def fetch(offset, background):
+            with lock:
+                calls.append((offset, background))
+            return _rows(10 if offset < 30 else 4)
+
+        pages = prefetching_pages(fetch, len, first=0, step=10, executor=pool)
+        assert next(pages)[0] == 0
+        pool.submit(lambda: None).result()  # let the read-ahead land
+        assert (10, True) in calls
+        assert [offset for offset, _ in pages] == [10, 20, 30]
+        assert sorted(o for o, bg in calls if not bg) == [0]
+
+    def test_failed_read_ahead_is_retried_inline(self, pool):
+        def fetch(offset, background):
+            if background:
+                return None
+            return _rows(10 if offset == 0 else 3)
+
+        size = lambda r: None if r is None else len(r)
+        assert [(o, len(r)) for o, r in prefetching_pages(fetch, size, first=0, step=10, executor=pool)] == [
+            (0, 10),
+            (10, 3),
+        ]
+
+    def test_stops_on_failure_and_max_pages(self, pool):
+        failing = prefetching_pages(lambda o, bg: None, lambda r: None, first=0, step=5, executor=pool)
+        assert [o for o, _ in failing] == [0]
+        capped = prefetching_pages(lambda o, bg: _rows(5), len, first=5, step=5, executor=pool, max_pages=2)
+        assert [o for o, _ in capped] == [5, 10]
+
+
+class TestCursor:
+    def test_roundtrip(self):
+        state = {'query': 'solar', 'params': {'rows': 20, 'start': 40}}
+        token = encode_cursor(state)
+        assert '=' not in token
+        assert decode_cursor(token) == state
+
+    def test_bad_tokens_ignored(self):
+        assert decode_cursor(None) is None
+        assert decode_cursor('not-a-cursor!!') is None
+        assert decode_cursor(encode_cursor({'x': 1})[:-3] + 'abc') is None
+
+
+@pytest.fixture
+def sbir_api():
+    set_http_cache(MemoryHTTPCache())
+    set_snapshot_store(None)
+    clear_sba_cache()
+    reset_sba_breakers()
+    SBA_Content._RATE_LIMITER.reset()
+    seen = []
+
+    def get(url, params=None, timeout=None, headers=None):
+        seen.append(dict(params or {}))
+        start, rows = params['start'], params['rows']
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.headers = {}
+        resp.raise_for_status = MagicMock()
+        count = rows if start < 2 * rows else 1
+        resp.json.return_value = [
+            {'award_title': f'Award {start + i}', 'contract': f'C{start + i}', 'agency': 'DOE'} for i in range(count)
+        ]
+        return resp
+
+    session = MagicMock()
+    session.get.side_effect = get
+    yield SBAContentAPI(session=session), seen
+    set_http_cache(None)
+    clear_sba_cache()
+    reset_sba_breakers()
+
+
+class TestSbirCursor:
+    def test_cursor_scrolls_and_next_page_is_prefetched(self, sbir_api):
+        api, seen = sbir_api
+        first = api.search_sbir_awards(agency='DOE', rows=5)
+        assert [i['title'] for i in first['items']][:2] == ['Award 0', 'Award 1']
+        assert first['next_cursor']
+        _settle(seen, 2)
+
+        calls = len(seen)
+        second = api.search_sbir_awards(cursor=first['next_cursor'])
+        assert second['currentPage'] == 2
+        assert second['items'][0]['title'] == 'Award 5'
+        assert seen[calls - 1]['start'] == 5  # fetched ahead, not on demand
+        assert all(p['start'] != 5 for p in seen[calls:])
+
+        _settle(seen, 3)
+        third = api.search_sbir_awards(cursor=second['next_cursor'])
+        assert third['items'][0]['title'] == 'Award 10'
+        assert third['next_cursor'] is None
+        assert third['totalPages'] == 3
+
+    def test_iter_awards_walks_all_pages(self, sbir_api):
+        api, _ = sbir_api
+        titles = [item['title'] for item in api.iter_sbir_awards(agency='DOE', rows=5)]
+        assert titles == [f'Award {i}' for i in range(11)]
+
+
+class TestSbirAwardParams:
+    def test_offset_uses_capped_page_size(self):
+        params = SBAContentAPI._sbir_award_params(rows=100, page=2)
+        assert (params['rows'], params['start']) == (50, 50)
+
+    def test_zero_rows_still_pages(self):
+        params = SBAContentAPI._sbir_award_params(rows=0, page=3)
+        assert (params['rows'], params['start']) == (20, 40)
+
+    def test_explicit_start_wins(self):
+        assert SBAContentAPI._sbir_award_params(rows=10, start=7, page=4)['start'] == 7
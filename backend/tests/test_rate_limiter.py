@@ -0,0 +1,90 @@
+import time
+from email.utils import formatdate
+from unittest.mock import MagicMock
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, clear_sba_cache, reset_sba_breakers
+from backend.services.rate_limiter import HostRateLimiter, TokenBucket, parse_retry_after, priority_cap
+from backend.services.sba_http_cache import MemoryHTTPCache, set_http_cache
+
+
+class TestTokenBucket:
+    def test_burst_then_queue(self):
+        bucket = TokenBucket('h', rate=20, burst=2)
+        assert bucket.acquire() == (True, 0.0)
+        assert bucket.acquire() == (True, 0.0)
+        ok, waited = bucket.acquire()
+        assert ok and 0 < waited <= 0.06
+        assert bucket.snapshot()['queued'] == 1
+
+    def test_low_priority_is_shed_when_empty(self):
+        bucket = TokenBucket('h', rate=1, burst=1)
+        assert bucket.acquire('low')[0] is True
+        ok, waited = bucket.acquire('low')
+        assert ok is False and waited > 0
+        assert bucket.snapshot()['shed'] == 1
+
+    def test_priority_cap_lowers_acquires_in_scope(self):
+        bucket = TokenBucket('h', rate=1, burst=1)
+        assert bucket.acquire()[0] is True
+        with priority_cap('low'):
+            assert bucket.acquire('normal')[0] is False  # shed, not queued
+        ok, waited = bucket.reserve('normal')
+        assert ok and waited > 0  # outside the scope it queues again
+
+    def test_retry_after_blocks_bucket(self):
+        bucket = TokenBucket('h', rate=100, burst=10)
+        bucket.block_for(30)
+        ok, waited = bucket.acquire('high')
+        assert ok is False
+        assert waited > 29
+        assert bucket.snapshot()['blocked_for_seconds'] > 29
+
+    def test_callers_queued_behind_retry_after_are_spaced(self):
+        bucket = TokenBucket('h', rate=2, burst=4)
+        bucket.block_for(5)
+        waits = [bucket.reserve(max_wait=60)[1] for _ in range(4)]
+        assert 5 < waits[0] <= 5.5
+        gaps = [b - a for a, b in zip(waits, waits[1:])]
+        assert all(abs(gap - 0.5) < 0.01 for gap in gaps)
+
+
+class TestHelpers:
+    def test_parse_retry_after(self):
+        assert parse_retry_after('12') == 12.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('garbage') is None
+        future = formatdate(time.time() + 60, usegmt=True)
+        assert 55 < parse_retry_after(future) <= 61
+
+    def test_host_overrides(self):
+        limiter = HostRateLimiter({'a.test': (1, 2)}, default=(5, 5), overrides='b.test=0.5:1')
+        assert limiter.for_url('https://a.test/x').burst == 2
+        assert limiter.for_url('https://b.test/x').rate == 0.5
+        assert limiter.for_url('https://c.test/x').rate == 5
+
+
+def test_sbir_429_retry_after_pauses_host():
+    set_http_cache(MemoryHTTPCache())
+    clear_sba_cache()
+    reset_sba_breakers()
+    SBA_Content._RATE_LIMITER.reset()
+    try:
+        resp = MagicMock(status_code=429, headers={'Retry-After': '120'})
+        session = MagicMock()
+        session.get.return_value = resp
+        api = SBAContentAPI(session=session)
+
+        first = api._get_json(f'{SBA_Content.SBIR_API_BASE}/awards', params={'rows': 1})
+        assert first['retry_after'] == 120.0
+        second = api._get_json(f'{SBA_Content.SBIR_API_BASE}/awards', params={'rows': 2})
+        assert second['shed'] is True
+        assert session.get.call_count == 1
+        page = api.search_sbir_awards(rows=3)
+        assert page['source'] == 'static'
+        assert 'retry in' in page['message']
+    finally:
+        set_http_cache(None)
+        clear_sba_cache()
+        reset_sba_breakers()
+        SBA_Content._RATE_LIMITER.reset()
@@ -0,0 +1,164 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, clear_sba_cache, reset_sba_breakers
+from backend.services.sba_async_client import AsyncSBAContentAPI
+from backend.services.sba_http_cache import MemoryHTTPCache, set_http_cache
+from backend.services.sba_snapshot import set_snapshot_store
+
+PAGE = """<html><head><title>Learning</title></head><body><main>
+<h1>SBA Learning Platform</h1>
+<p>Free online courses to help you start and grow your small business with confidence.</p>
+<a href="/sba-learning-platform/start-business">Start your business course</a>
+<a href="/sba-learning-platform/finance">Financing your business course</a>
+</main></body></html>"""
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    set_http_cache(MemoryHTTPCache())
+    set_snapshot_store(None)
+    monkeypatch.setenv('SBA_SNAPSHOT_ENABLED', 'false')
+    clear_sba_cache()
+    reset_sba_breakers()
+    SBA_Content._RATE_LIMITER.reset()
+    yield
+    set_http_cache(None)
+    clear_sba_cache()
+    reset_sba_breakers()
+
+
+class _NoNetworkSync(SBAContentAPI):
+    """Sync builder whose requests session must never be used."""
+
+    def __init__(self):
+        super().__init__()
+
+        def _blocked(*a, **k):
+            raise AssertionError('sync client hit the network')
+
+        self.session.get = _blocked
+
+
+def _client(handler, **kwargs):
+    seen = []
+
+    async def _handle(request):
+        seen.append(str(request.url))
+        return await handler(request)
+
+    api = AsyncSBAContentAPI(
+        sync=_NoNetworkSync(),
+        client=httpx.AsyncClient(transport=httpx.MockTransport(_handle)),
+        **kwargs,
+    )
+    return api, seen
+
+
+async def _site(request):
+    if request.url.path.endswith('.json'):
+        return httpx.Response(404)
+    return httpx.Response(200, text=PAGE, headers={'ETag': '"v1"'})
+
+
+class TestAsyncClient:
+    def test_same_envelope_as_sync_without_sync_network(self):
+        api, seen = _client(_site)
+        result = asyncio.run(api.search_courses(page=1))
+
+        assert set(seen) >= set(SBAContentAPI.ROUTE_PAGES['courses'])
+        expected = api.sync.search_courses(page=1)
+        assert set(result) == set(expected)
+        assert [i.get('title') for i in result['items']] == [i.get('title') for i in expected['items']]
+        assert result['source'] == expected['source']
+
+    def test_warm_route_skips_transport(self):
+        api, seen = _client(_site)
+        asyncio.run(api.search_courses(page=1))
+        count = len(seen)
+        asyncio.run(api.search_courses(page=1))  # new loop: client state is rebuilt, caches reused
+        assert len(seen) == count
+        assert api.stats()['warm'] > 0
+
+    def test_concurrent_misses_share_one_request(self):
+        async def slow(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, text=PAGE)
+
+        api, seen = _client(slow)
+        url = SBAContentAPI.ROUTE_PAGES['blogs'][0]
+
+        async def run():
+            await asyncio.gather(*(api._prefetch(url, 'html') for _ in range(5)))
+
+        asyncio.run(run())
+        assert seen == [url]
+        assert api.stats()['coalesced'] == 4
+
+    def test_per_host_cap(self):
+        active = {'now': 0, 'max': 0}
+
+        async def tracked(request):
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+            await asyncio.sleep(0.02)
+            active['now'] -= 1
+            return httpx.Response(200, text=PAGE)
+
+        api, seen = _client(tracked, per_host=2)
+        urls = [f'https://www.sba.gov/page-{i}' for i in range(6)]
+
+        async def run():
+            await asyncio.gather(*(api._prefetch(u, 'html') for u in urls))
+
+        asyncio.run(run())
+        assert len(seen) == 6
+        assert active['max'] == 2
+
+    def test_missing_page_is_negative_cached(self):
+        async def gone(request):
+            return httpx.Response(404)
+
+        api, seen = _client(gone)
+        url = 'https://www.sba.gov/gone'
+        asyncio.run(api._prefetch(url, 'html'))
+        asyncio.run(api._prefetch(url, 'html'))
+        assert seen == [url]
+        assert api.sync._get_html(url) is None
+
+    def test_low_priority_is_shed_in_prefetch_and_fallback(self):
+        api, seen = _client(_site)
+        for url in SBAContentAPI.ROUTE_PAGES['courses']:
+            SBA_Content._RATE_LIMITER.for_url(url).block_for(2)
+        # _NoNetworkSync raises if the sync fallback queued for a token and fetched
+        result = asyncio.run(api.search_courses(page=1, priority='low'))
+        assert seen == []
+        assert isinstance(result, dict)
+        assert all(b['shed'] for b in SBA_Content._RATE_LIMITER.stats().values())
+
+    def test_unknown_route(self):
+        api, _ = _client(_site)
+        with pytest.raises(KeyError):
+            asyncio.run(api.search('nope'))
+
+
+def test_new_loop_closes_previous_client():
+    api = AsyncSBAContentAPI(sync=SBAContentAPI())
+
+    async def client():
+        return api._get_client()
+
+    first = asyncio.run(client())
+
+    async def second_loop():
+        second = api._get_client()
+        await asyncio.sleep(0)  # let the stale-client close task run
+        return second
+
+    second = asyncio.run(second_loop())
+    assert second is not first
+    assert first.is_closed
+    asyncio.run(api.aclose())
@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from flask import jsonify, request
+
+from backend.routes import sba as sba_routes
+from backend.services import sba_batch
+from backend.services.sba_batch import BatchResult, parse_entries, resolve_batch
+
+from sba_testing import sba_app, sba_client  # noqa: F401
+
+
+class TestParseEntries:
+    def test_paths_params_and_defaults(self):
+        entries, error = parse_entries({
+            'requests': ['/api/sba/programs', {'path': '/api/sba/content/articles?query=loan', 'params': {'page': 2}, 'key': 'a'}],
+            'compact': True,
+        })
+        assert error is None
+        assert entries[0].key == '/api/sba/programs?compact=1'
+        assert entries[1].key == 'a' and entries[1].query == 'query=loan&compact=1&page=2'
+
+    @pytest.mark.parametrize('payload', [None, {'requests': []}, {'requests': ['/api/rag']},
+                                         {'requests': ['/api/sba/batch']}, {'requests': ['/api/sba/x'] * 50}])
+    def test_rejected(self, payload):
+        entries, error = parse_entries(payload)
+        assert entries == [] and error
+
+    def test_duplicate_keys_rejected(self):
+        entries, error = parse_entries({'requests': [
+            {'path': '/api/sba/programs', 'key': 'k'}, {'path': '/api/sba/lifecycle', 'key': 'k'},
+        ]})
+        assert entries == [] and 'duplicate key' in error
+        entries, error = parse_entries({'requests': ['/api/sba/programs', '/api/sba/programs']})
+        assert error is None and len(entries) == 2  # identical unkeyed entries still collapse
+
+
+class TestResolveBatch:
+    def test_timeout_cancels_entries_not_yet_started(self):
+        release = threading.Event()
+        started = []
+
+        def resolve(app, entry, forwarded=()):
+            started.append(entry.path)
+            release.wait(5)
+            return BatchResult(200, b'{}', None)
+
+        entries, _ = parse_entries(['/api/sba/programs', '/api/sba/lifecycle'])
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            with patch.object(sba_batch, '_get_executor', return_value=pool), \
+                    patch.object(sba_batch, '_resolve_shared', side_effect=resolve):
+                results = resolve_batch(None, entries, timeout=0.1)
+            release.set()
+            pool.shutdown(wait=True)
+        finally:
+            release.set()
+        assert [r.status for r in results.values()] == [504, 504]
+        assert started == ['/api/sba/programs']  # the queued entry never ran
+
+    def test_each_entry_gets_its_own_timeout(self):
+        def resolve(app, entry, forwarded=()):
+            if entry.path == '/api/sba/programs':
+                time.sleep(0.3)
+            return BatchResult(200, b'{}', None)
+
+        entries, _ = parse_entries(['/api/sba/programs', '/api/sba/lifecycle'])
+        pool = ThreadPoolExecutor(max_workers=1)
+        with patch.object(sba_batch, '_get_executor', return_value=pool), \
+                patch.object(sba_batch, '_resolve_shared', side_effect=resolve):
+            started = time.monotonic()
+            results = resolve_batch(None, entries, timeout=5, entry_timeout=0.2)
+            elapsed = time.monotonic() - started
+        pool.shutdown(wait=True)
+        # The slow entry is cut off at its own limit; the one queued behind it still gets a full budget
+        assert [r.status for r in results.values()] == [504, 200]
+        assert elapsed < 1
+
+
+class TestBatchRoute:
+    def test_first_paint_in_one_round_trip(self, sba_client):
+        paths = ['/api/sba/resources', '/api/sba/programs', '/api/sba/lifecycle', '/api/sba/local-resources']
+        resp = sba_client.post('/api/sba/batch', json={'requests': paths})
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert list(body['responses']) == paths
+        assert body['count'] == 4 and body['failed'] == 0
+        for path in paths:
+            entry = body['responses'][path]
+            assert entry['status'] == 200
+            assert entry['body'] == sba_client.get(path).get_json()
+
+    def test_duplicates_resolved_once_and_etag_revalidates(self, sba_client):
+        calls = []
+        lock = threading.Lock()
+        page = {'items': [{'id': '7a', 'title': '7(a)'}], 'totalPages': 1, 'source': 'sba_html'}
+
+        def search(*args, **kwargs):
+            with lock:
+                calls.append(1)
+            return page
+
+        with patch.object(sba_routes, 'sba_api') as api:
+            api.search_articles.side_effect = search
+            body = sba_client.post('/api/sba/batch', json={'requests': [
+                {'path': '/api/sba/content/articles', 'key': 'one'},
+                {'path': '/api/sba/content/articles', 'key': 'two'},
+            ]}).get_json()
+            assert len(calls) == 1
+            etag = body['responses']['one']['etag']
+            again = sba_client.post('/api/sba/batch', json={'requests': [
+                {'path': '/api/sba/content/articles', 'etag': etag},
+            ]}).get_json()
+        entry = again['responses']['/api/sba/content/articles']
+        assert entry['status'] == 304 and entry['body'] is None
+
+    def test_allow_listed_headers_are_forwarded(self, sba_client):
+        sba_client.application.add_url_rule(
+            '/api/sba/echo-headers', 'echo_headers', lambda: jsonify(dict(request.headers)))
+        body = sba_client.post('/api/sba/batch', json={'requests': ['/api/sba/echo-headers']}, headers={
+            'Accept-Language': 'es', 'Authorization': 'Bearer t', 'X-Forwarded-Proto': 'https',
+            'Accept-Encoding': 'gzip', 'X-Custom': 'no',
+        }).get_json()
+        seen = body['responses']['/api/sba/echo-headers']['body']
+        assert seen['Accept-Language'] == 'es' and seen['Authorization'] == 'Bearer t'
+        assert seen['X-Forwarded-Proto'] == 'https'
+        assert 'Accept-Encoding' not in seen and 'X-Custom' not in seen
+
+    def test_unknown_route_is_a_failed_entry(self, sba_client):
+        body = sba_client.post('/api/sba/batch', json={'requests': ['/api/sba/nope', '/api/sba/programs']}).get_json()
+        assert body['failed'] == 1
+        assert body['responses']['/api/sba/nope']['status'] == 404
+        assert json.dumps(body['responses']['/api/sba/programs']['body'])
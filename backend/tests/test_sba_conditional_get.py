@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+from backend.routes import sba as sba_routes
+
+from sba_testing import sba_app, sba_client  # noqa: F401
+
+
+def _page(stamp='2026-01-01T00:00:00.123456+00:00', title='7(a) loans', **extra):
+    return {
+        'items': [{'id': '7a', 'title': title, 'summary': 'Loan program', 'retrieved_at': stamp}],
+        'totalPages': 1,
+        'source': 'sba_html',
+        'is_current': True,
+        'degraded': False,
+        'retrieved_at': stamp,
+        **extra,
+    }
+
+
+class TestConditionalGet:
+    def test_etag_and_304(self, sba_client):
+        with patch.object(sba_routes, 'sba_api') as api:
+            api.search_articles.return_value = _page()
+            first = sba_client.get('/api/sba/content/articles')
+            etag = first.headers['ETag']
+            assert etag.startswith('W/"')
+            assert 'max-age=' in first.headers['Cache-Control']
+
+            again = sba_client.get('/api/sba/content/articles', headers={'If-None-Match': etag})
+            assert again.status_code == 304
+            assert again.data == b''
+
+    def test_rebuild_timestamps_do_not_change_etag(self, sba_client):
+        with patch.object(sba_routes, 'sba_api') as api:
+            api.search_articles.return_value = _page()
+            etag = sba_client.get('/api/sba/content/articles').headers['ETag']
+            api.search_articles.return_value = _page(stamp='2026-01-01T00:05:00.654321+00:00')
+            assert sba_client.get('/api/sba/content/articles').headers['ETag'] == etag
+
+    def test_changed_content_gets_new_etag(self, sba_client):
+        with patch.object(sba_routes, 'sba_api') as api:
+            api.search_articles.return_value = _page()
+            etag = sba_client.get('/api/sba/content/articles').headers['ETag']
+            api.search_articles.return_value = _page(title='504 loans')
+            resp = sba_client.get('/api/sba/content/articles', headers={'If-None-Match': etag})
+            assert resp.status_code == 200
+            assert resp.headers['ETag'] != etag
+
+    def test_degraded_pages_must_revalidate(self, sba_client):
+        with patch.object(sba_routes, 'sba_api') as api:
+            api.search_articles.return_value = _page(source='static', is_current=False, degraded=True)
+            assert sba_client.get('/api/sba/content/articles').headers['Cache-Control'] == 'no-cache'
@@ -0,0 +1,45 @@
+from backend.routes import sba as sba_routes
+from backend.routes.sba import _DIGESTS, _digest_payload
+
+
+def _items():
+    return [
+        {'id': 'a', 'type': 'loan', 'title': '7(a)', 'path': '/api/sba/content/loans'},
+        {'id': 'b', 'type': 'program', 'title': 'SBIR', 'resources': [{'name': 'Guide'}]},
+        {'id': 'c', 'type': 'loan', 'title': '504', 'url': 'https://www.sba.gov/504'},
+        {'id': 'd', 'type': ' ', 'name': 'Untyped'},
+    ]
+
+
+class TestDigestPayload:
+    def setup_method(self):
+        _DIGESTS.clear()
+
+    def test_single_pass_groups_match_counts(self):
+        _, digestion = _digest_payload(_items(), route='/api/sba/content/articles')
+        groups = {g['id']: g for g in digestion['groups']}
+        assert [g['id'] for g in digestion['groups']] == ['loan', 'content', 'program']
+        assert groups['loan']['item_ids'] == ['a', 'c']
+        assert groups['content']['item_ids'] == ['d']  # blank type counted and grouped as content
+        assert all(g['count'] == len(g['item_ids']) for g in digestion['groups'])
+        assert digestion['stats']['items'] == 4
+        assert [r['path'] for r in digestion['related_routes']] == ['/api/sba/content/loans']
+
+    def test_memoized_by_content_and_params(self, monkeypatch):
+        calls = []
+        build = sba_routes._build_digest
+        monkeypatch.setattr(sba_routes, '_build_digest', lambda *a, **k: calls.append(1) or build(*a, **k))
+        _DIGESTS.reset_stats()
+
+        topic, digestion = _digest_payload(_items(), route='/r', page=1)
+        topic['official_url'] = 'https://example.invalid'  # callers edit top-level keys
+        again, _ = _digest_payload(_items(), route='/r', page=1)
+        assert len(calls) == 1
+        assert 'official_url' not in again
+
+        _digest_payload(_items(), route='/r', page=2)
+        changed = _items()
+        changed[0]['title'] = '7(a) Express'
+        _digest_payload(changed, route='/r', page=1)
+        assert len(calls) == 3
+        assert _DIGESTS.stats()['hits'] == 1
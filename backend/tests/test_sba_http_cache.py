@@ -0,0 +1,215 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, clear_sba_cache
+from backend.services.sba_http_cache import (
+    MemoryHTTPCache,
+    SQLiteHTTPCache,
+    conditional_headers,
+    make_entry,
+    set_http_cache,
+)
+
+
+def _response(status=200, text='', headers=None, json_data=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = text
+    resp.headers = headers or {}
+    resp.json.return_value = json_data
+    resp.raise_for_status = MagicMock()
+    return resp
+
+
+@pytest.fixture
+def shared_cache():
+    cache = MemoryHTTPCache()
+    set_http_cache(cache)
+    clear_sba_cache()
+    yield cache
+    set_http_cache(None)
+    clear_sba_cache()
+
+
+class TestSQLiteHTTPCache:
+    def test_roundtrip_and_touch(self, tmp_path):
+        cache = SQLiteHTTPCache(str(tmp_path / 'cache.sqlite3'))
+        cache.set('html:x', make_entry('<p>hi</p>', etag='"abc"', stored_at=time.time() - 500))
+        entry = cache.get('html:x')
+        assert entry['value'] == '<p>hi</p>'
+        assert entry['etag'] == '"abc"'
+        cache.touch('html:x')
+        assert time.time() - cache.get('html:x')['stored_at'] < 5
+
+    def test_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite3')
+        SQLiteHTTPCache(path).set('json:a', make_entry({'n': 1}))
+        assert SQLiteHTTPCache(path).get('json:a')['value'] == {'n': 1}
+
+
+class TestConditionalRevalidation:
+    def test_conditional_headers(self):
+        entry = make_entry('x', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+        assert conditional_headers(entry) == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+        }
+        assert conditional_headers(None) == {}
+
+    def test_fresh_shared_entry_skips_network(self, shared_cache):
+        shared_cache.set('html:https://example.test/a', make_entry('<p>shared</p>'))
+        session = MagicMock()
+        api = SBAContentAPI(session=session)
+        assert api._get_html('https://example.test/a') == '<p>shared</p>'
+        session.get.assert_not_called()
+
+    def test_304_reuses_stored_body(self, shared_cache):
+        key = 'html:https://example.test/b'
+        stale_at = time.time() - SBA_Content._CACHE_TTL - 10
+        shared_cache.set(key, make_entry('<p>old</p>', etag='"v1"', stored_at=stale_at))
+        session = MagicMock()
+        session.get.return_value = _response(status=304)
+        api = SBAContentAPI(session=session)
+
+        assert api._get_html('https://example.test/b') == '<p>old</p>'
+        sent = session.get.call_args.kwargs['headers']
+        assert sent['If-None-Match'] == '"v1"'
+        assert shared_cache.get(key)['stored_at'] > stale_at
+
+    def test_200_stores_validators(self, shared_cache):
+        session = MagicMock()
+        session.get.return_value = _response(
+            text='<p>new</p>', headers={'ETag': '"v2"', 'Last-Modified': 'Tue, 02 Jan 2024 00:00:00 GMT'},
+        )
+        api = SBAContentAPI(session=session)
+
+        assert api._get_html('https://example.test/c') == '<p>new</p>'
+        entry = shared_cache.get('html:https://example.test/c')
+        assert entry['etag'] == '"v2"'
+        assert entry['last_modified'] == 'Tue, 02 Jan 2024 00:00:00 GMT'
+
+    def test_json_304(self, shared_cache):
+        key = 'json:https://example.test/api?rows=1'
+        shared_cache.set(key, make_entry({'awards': []}, etag='"j1"', stored_at=time.time() - 10_000))
+        session = MagicMock()
+        session.get.return_value = _response(status=304)
+        api = SBAContentAPI(session=session)
+
+        assert api._get_json('https://example.test/api', params={'rows': 1}) == {'awards': []}
+
+
+class TestStaleWhileRevalidate:
+    def test_stale_entry_served_and_refreshed_in_background(self, shared_cache, monkeypatch):
+        key = 'html:https://example.test/stale'
+        stale_at = time.time() - SBA_Content._CACHE_TTL - 5
+        shared_cache.set(key, make_entry('<p>stale</p>', stored_at=stale_at))
+        scheduled = []
+        monkeypatch.setattr(SBA_Content, '_schedule_refresh', lambda k, fn: scheduled.append((k, fn)))
+        session = MagicMock()
+        session.get.return_value = _response(text='<p>fresh</p>')
+        api = SBAContentAPI(session=session)
+
+        assert api._get_html('https://example.test/stale') == '<p>stale</p>'
+        session.get.assert_not_called()
+        assert [k for k, _ in scheduled] == [key]
+
+        scheduled[0][1]()
+        assert shared_cache.get(key)['value'] == '<p>fresh</p>'
+        assert api._get_html('https://example.test/stale') == '<p>fresh</p>'
+
+    def test_hard_expired_entry_blocks_on_fetch(self, shared_cache):
+        key = 'html:https://example.test/old'
+        shared_cache.set(key, make_entry('<p>ancient</p>', stored_at=time.time() - SBA_Content._CACHE_STALE_SECONDS - 5))
+        session = MagicMock()
+        session.get.return_value = _response(text='<p>fresh</p>')
+        api = SBAContentAPI(session=session)
+
+        assert api._get_html('https://example.test/old') == '<p>fresh</p>'
+
+    def test_force_fresh_skips_stale(self, shared_cache):
+        key = 'html:https://example.test/forced'
+        shared_cache.set(key, make_entry('<p>cached</p>'))
+        session = MagicMock()
+        session.get.return_value = _response(text='<p>forced</p>')
+        api = SBAContentAPI(session=session)
+
+        assert api._get_html('https://example.test/forced', force_fresh=True) == '<p>forced</p>'
+
+
+class TestParallelFanOut:
+    def _slow_session(self, delay):
+        def get(url, **kwargs):
+            time.sleep(delay.get(url, 0.2))
+            return _response(text=f'<p>{url}</p>')
+
+        session = MagicMock()
+        session.get.side_effect = get
+        return session
+
+    def test_pages_fetched_concurrently_in_order(self, shared_cache):
+        urls = [f'https://example.test/p{i}' for i in range(4)]
+        delay = {urls[0]: 0.3, urls[1]: 0.05, urls[2]: 0.2, urls[3]: 0.1}
+        api = SBAContentAPI(session=self._slow_session(delay))
+
+        started = time.monotonic()
+        pages = api._get_html_many(urls)
+        elapsed = time.monotonic() - started
+
+        assert pages == [f'<p>{u}</p>' for u in urls]
+        assert elapsed < 0.6
+
+    def test_deadline_drops_slow_pages(self, shared_cache, monkeypatch):
+        urls = ['https://example.test/fast', 'https://example.test/slow']
+        delay = {urls[0]: 0.0, urls[1]: 1.0}
+        api = SBAContentAPI(session=self._slow_session(delay))
+        # Own pool: the abandoned slow fetch must finish (and store) before shared_cache is torn down
+        pool = ThreadPoolExecutor(max_workers=2)
+        monkeypatch.setattr(SBA_Content, '_get_fetch_executor', lambda: pool)
+        try:
+            assert api._get_html_many(urls, deadline=0.3) == ['<p>https://example.test/fast</p>', None]
+        finally:
+            pool.shutdown(wait=True)
+        assert shared_cache.get('html:https://example.test/slow')
+
+
+class TestParsedPageCache:
+    HTML = (
+        '<html><head><title>7(a) loans | SBA</title>'
+        '<meta name="description" content="The 7(a) loan program is the primary SBA program for '
+        'providing financial assistance to small businesses."></head>'
+        '<body><h1>7(a) loans</h1><a href="/funding-programs/loans/7a-loans">7(a) loans</a></body></html>'
+    )
+
+    def test_warm_request_skips_parsing(self, shared_cache, monkeypatch):
+        session = MagicMock()
+        session.get.return_value = _response(text=self.HTML)
+        api = SBAContentAPI(session=session)
+        parses = []
+        real_parse = api._parse_page
+        monkeypatch.setattr(api, '_parse_page', lambda html: parses.append(1) or real_parse(html))
+
+        first = api._get_page('https://example.test/7a')
+        second = api._get_page('https://example.test/7a')
+
+        assert first is second
+        assert first.title == '7(a) loans | SBA'
+        assert first.snippet.startswith('The 7(a) loan program')
+        assert len(parses) == 1
+        assert 'html:https://example.test/7a' not in SBA_Content._CACHE
+
+    def test_unchanged_body_reuses_model(self, shared_cache, monkeypatch):
+        session = MagicMock()
+        session.get.return_value = _response(text=self.HTML)
+        api = SBAContentAPI(session=session)
+        parses = []
+        real_parse = api._parse_page
+        monkeypatch.setattr(api, '_parse_page', lambda html: parses.append(1) or real_parse(html))
+
+        api._get_page('https://example.test/7a')
+        SBA_Content._CACHE.delete('page:https://example.test/7a')
+        api._get_page('https://example.test/7a')
+        assert len(parses) == 1
@@ -0,0 +1,77 @@
+from flask import Flask
+
+from backend.services import rate_limiter
+from backend.services.sba_prewarm import CatalogPrewarmer, _app_fetch, child_paths, parent_paths
+
+CATALOG = {
+    'resources': [
+        {'id': 'loans', 'path': '/api/sba/content/loans'},
+        {'id': 'sbir', 'path': '/api/sba/content/sbir'},
+        {'id': 'sources', 'path': '/api/sba/sources'},
+    ]
+}
+PAYLOADS = {
+    '/api/sba/resources': CATALOG,
+    '/api/sba/content/loans': {
+        'items': [
+            {'path': '/api/sba/content/loans/7a'},
+            {'path': '/api/sba/content/loans/504'},
+            {'path': '/api/sba/content/loans/7a'},
+            {'path': 'https://www.sba.gov/elsewhere'},
+        ]
+    },
+    '/api/sba/content/loans/7a': {'items': []},
+    '/api/sba/content/loans/504': {'items': []},
+    '/api/sba/content/sbir': None,
+}
+
+
+def test_parent_paths_skip_probes():
+    assert parent_paths(CATALOG) == ['/api/sba/content/loans', '/api/sba/content/sbir']
+
+
+def test_child_paths_are_deduped_and_limited():
+    children = child_paths('/api/sba/content/loans', PAYLOADS['/api/sba/content/loans'])
+    assert children == ['/api/sba/content/loans/7a', '/api/sba/content/loans/504']
+    assert child_paths('/api/sba/content/loans', PAYLOADS['/api/sba/content/loans'], limit=1) == [
+        '/api/sba/content/loans/7a'
+    ]
+
+
+def test_run_once_walks_parents_then_children():
+    seen = []
+
+    def fetch(path):
+        seen.append(path)
+        return PAYLOADS.get(path)
+
+    warmer = CatalogPrewarmer(fetch, interval=60, jitter=0.2)
+    result = warmer.run_once()
+
+    assert seen == [
+        '/api/sba/resources',
+        '/api/sba/content/loans',
+        '/api/sba/content/loans/7a',
+        '/api/sba/content/loans/504',
+        '/api/sba/content/sbir',
+    ]
+    assert result['warmed'] == 4
+    assert result['failed'] == ['/api/sba/content/sbir']
+    assert warmer.status()['runs'] == 1
+
+
+def test_jittered_delay_stays_in_band():
+    warmer = CatalogPrewarmer(lambda p: None, interval=100, jitter=0.2)
+    delays = [warmer.next_delay() for _ in range(50)]
+    assert all(80 <= d <= 120 for d in delays)
+
+
+def test_app_fetch_runs_at_low_priority():
+    app = Flask(__name__)
+
+    @app.route('/api/sba/resources')
+    def resources():
+        return {'cap': rate_limiter._priority_cap.get()}
+
+    assert _app_fetch(app)('/api/sba/resources') == {'cap': 'low'}
+    assert rate_limiter._priority_cap.get() is None
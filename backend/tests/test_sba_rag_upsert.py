@@ -0,0 +1,143 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from backend.services import sba_rag_ingest
+from backend.services.sba_rag_ingest import _ingest_chroma, chunk_id, envelope_to_documents
+
+ROUTE = '/api/sba/content/loans'
+
+
+class FakeRAG:
+    """In-memory stand-in for RAGManager's id-based document API."""
+
+    def __init__(self):
+        self.docs = {}
+        self.upserts = 0
+
+    def is_available(self):
+        return True
+
+    def upsert_documents(self, texts, metadatas, ids):
+        self.upserts += len(ids)
+        for text, meta, doc_id in zip(texts, metadatas, ids):
+            self.docs[doc_id] = (text, meta)
+        return {'success': True, 'count': len(ids)}
+
+    def get_document_metadata(self, where):
+        conds = where.get('$and', [where])
+        return {'success': True, 'documents': {
+            doc_id: meta for doc_id, (_, meta) in self.docs.items()
+            if all(meta.get(k) == v for c in conds for k, v in c.items())
+        }}
+
+    def delete_documents(self, ids):
+        for doc_id in ids:
+            self.docs.pop(doc_id, None)
+        return {'success': True, 'count': len(ids)}
+
+
+def _envelope(titles, page=1):
+    return {
+        'path': ROUTE,
+        'currentPage': page,
+        'topic': {'title': 'SBA Loans', 'description': 'Loan programs for small businesses and lenders.'},
+        'items': [{'id': t.lower(), 'title': t, 'summary': f'{t} loan program details for borrowers'} for t in titles],
+    }
+
+
+def _child(item_id):
+    return chunk_id(ROUTE, 'child_item', f'id:{item_id}')
+
+
+def _sync(rag, envelope, **kwargs):
+    docs = envelope_to_documents(envelope, route=ROUTE)
+    with patch('backend.services.rag.get_rag_manager', return_value=rag):
+        return _ingest_chroma(docs, ROUTE, page=envelope['currentPage'], **kwargs)
+
+
+@pytest.fixture
+def rag():
+    return FakeRAG()
+
+
+class TestIdempotentUpsert:
+    def test_reingest_of_same_content_writes_nothing(self, rag):
+        first = _sync(rag, _envelope(['7a', '504']))
+        assert first == {'ok': True, 'added': 3, 'unchanged': 0, 'deleted': 0, 'errors': 0}
+        again = _sync(rag, _envelope(['7a', '504']))
+        assert again['added'] == 0 and again['unchanged'] == 3
+        assert len(rag.docs) == 3 and rag.upserts == 3
+
+    def test_changed_upserted_and_stale_deleted(self, rag):
+        _sync(rag, _envelope(['7a', '504', 'Micro']))
+        env = _envelope(['7a', '504'])
+        env['items'][0]['summary'] = '7(a) program now with updated guaranty limits'
+        result = _sync(rag, env)
+        assert result['added'] == 1
+        assert result['deleted'] == 1
+        assert _child('micro') not in rag.docs
+
+    def test_pages_and_filtered_views_do_not_prune_each_other(self, rag):
+        _sync(rag, _envelope(['7a', '504']))
+        _sync(rag, _envelope(['Express'], page=2))
+        assert _child('7a') in rag.docs
+        result = _sync(rag, _envelope(['Micro']), prune=False)
+        assert result['deleted'] == 0
+        assert {_child(i) for i in ('7a', '504', 'express', 'micro')} <= set(rag.docs)
+
+    def test_each_page_keeps_its_own_overview(self, rag):
+        _sync(rag, _envelope(['7a'], page=1))
+        _sync(rag, _envelope(['Express'], page=2))
+        result = _sync(rag, _envelope(['7a'], page=1))
+        assert result['added'] == 0 and result['deleted'] == 0
+        overviews = [meta for _, meta in rag.docs.values() if meta['kind'] == 'topic_overview']
+        assert sorted(meta['page'] for meta in overviews) == [1, 2]
+
+    def test_synthetic_ids_do_not_collide_across_pages(self, rag):
+        def env(titles, page):
+            out = _envelope(titles, page=page)
+            for n, item in enumerate(out['items']):
+                item['id'] = f'item-{n}'
+                item.pop('title')
+            return out
+
+        _sync(rag, env(['7a'], 1))
+        _sync(rag, env(['Express'], 2))
+        _sync(rag, env(['Micro'], 1), prune=False)
+        texts = [text for text, meta in rag.docs.values() if meta.get('kind') == 'child_item']
+        assert len(texts) == 3
+
+    def test_ids_follow_path_or_url_not_item_id(self, rag):
+        first = _envelope(['7a'])
+        first['items'][0].update(id=1980170904, url='https://www.sba.gov/funding-programs/loans/7a-loans')
+        _sync(rag, first)
+        again = _envelope(['7a'])
+        again['items'][0].update(id=3312324436, url='https://www.sba.gov/funding-programs/loans/7a-loans')
+        result = _sync(rag, again)
+        assert result['added'] == 1 and result['deleted'] == 0  # only the changed item_id metadata
+
+    def test_legacy_random_id_duplicates_cleaned_up(self, rag):
+        legacy = {'source': 'sba_api', 'route': ROUTE, 'kind': 'child_item', 'item_id': '7a'}
+        rag.docs.update({f'uuid-{i}': ('dup', dict(legacy)) for i in range(5)})
+        result = _sync(rag, _envelope(['7a']))
+        assert result['deleted'] == 5
+        assert not [d for d in rag.docs if d.startswith('uuid-')]
+
+
+def test_pages_throttled_and_queued_separately():
+    assert sba_rag_ingest._scope_key(ROUTE, 1) == ROUTE
+    assert sba_rag_ingest._scope_key(ROUTE, 2) == f'{ROUTE}?page=2'
+
+
+def test_scraped_card_ids_are_stable_across_processes():
+    code = 'from backend.services.SBA_Content import _stable_id; print(_stable_id("page", "https://www.sba.gov/x"))'
+    out = {
+        subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                       env={**os.environ, 'PYTHONHASHSEED': seed}).stdout.strip().splitlines()[-1]
+        for seed in ('1', '2')
+    }
+    assert len(out) == 1
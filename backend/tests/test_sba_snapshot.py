@@ -0,0 +1,131 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, clear_sba_cache
+from backend.services.sba_snapshot import FORMAT, VERSION, SnapshotStore, set_snapshot_store
+
+LIVE = {'items': [{'title': 'Live card'}], 'is_current': True, 'degraded': False, 'source': 'sba_html',
+        'retrieved_at': '2026-01-01T00:00:00+00:00'}
+STATIC = {'items': [{'title': 'Static card'}], 'is_current': False, 'degraded': True, 'source': 'static'}
+
+
+class TestSnapshotStore:
+    def test_roundtrip_is_versioned_gzip(self, tmp_path):
+        path = str(tmp_path / 'snap.json.gz')
+        store = SnapshotStore(path, write_interval=0)
+        store.put('route:loans?page=1', LIVE)
+        store._flusher.join(5)
+
+        with gzip.open(path, 'rt') as fh:
+            doc = json.load(fh)
+        assert doc['format'] == FORMAT and doc['version'] == VERSION
+        assert SnapshotStore(path).get('route:loans?page=1')['page'] == LIVE
+
+    def test_unknown_version_ignored(self, tmp_path):
+        path = tmp_path / 'snap.json.gz'
+        with gzip.open(path, 'wt') as fh:
+            json.dump({'format': FORMAT, 'version': VERSION + 1, 'routes': {'k': {'page': LIVE}}}, fh)
+        assert SnapshotStore(str(path)).get('k') is None
+
+    def test_flush_merges_other_writers(self, tmp_path):
+        path = str(tmp_path / 'snap.json.gz')
+        a = SnapshotStore(path, write_interval=0)
+        b = SnapshotStore(path, write_interval=0)
+        a.put('route:a?page=1', LIVE)
+        a._flusher.join(5)
+        b.put('route:b?page=1', LIVE)
+        b._flusher.join(5)
+        fresh = SnapshotStore(path)
+        assert fresh.get('route:a?page=1') and fresh.get('route:b?page=1')
+
+    def test_writes_are_throttled(self, tmp_path):
+        path = tmp_path / 'snap.json.gz'
+        store = SnapshotStore(str(path), write_interval=3600)
+        store.put('k', LIVE)
+        assert not path.exists()
+        assert store.flush() is True
+        assert path.exists()
+
+    def test_flush_runs_off_the_caller_and_outside_the_lock(self, tmp_path, monkeypatch):
+        store = SnapshotStore(str(tmp_path / 'snap.json.gz'), write_interval=0)
+        store.put('k', LIVE)
+        store._flusher.join(5)
+        reading, release = threading.Event(), threading.Event()
+
+        def slow_read(path):
+            reading.set()
+            release.wait(5)
+            return {}
+
+        monkeypatch.setattr('backend.services.sba_snapshot._read_file', slow_read)
+        store.put('k2', LIVE)  # returns while the background flush is stuck in file I/O
+        assert reading.wait(5)
+        assert store.get('k')['page'] == LIVE
+        store.put('k3', LIVE)  # a flush is already running: no second thread
+        release.set()
+        store._flusher.join(5)
+        assert store.stats()['routes'] == 3
+
+
+class _Api(SBAContentAPI):
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+        self.calls = 0
+
+    @SBA_Content._snapshot_route('loans')
+    def search_loans(self, **params):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / 'snap.json.gz'), write_interval=0)
+    set_snapshot_store(store)
+    clear_sba_cache()
+    scheduled = []
+    monkeypatch.setattr(SBA_Content, '_schedule_refresh', lambda key, fn: scheduled.append(fn))
+    yield store, scheduled
+    set_snapshot_store(None)
+    clear_sba_cache()
+
+
+class TestSnapshotRoute:
+    def test_live_result_recorded(self, snapshot):
+        store, _ = snapshot
+        api = _Api(LIVE)
+        assert api.search_loans(query='', page=1) == LIVE
+        assert store.get('route:loans?page=1')['page'] == LIVE
+
+    def test_cold_worker_serves_snapshot_and_rebuilds(self, snapshot):
+        store, scheduled = snapshot
+        store.put('route:loans?page=1', LIVE)
+        api = _Api(LIVE)
+
+        page = api.search_loans(page=1)
+        assert page['freshness'] == 'snapshot'
+        assert page['is_current'] is True
+        assert api.calls == 0 and len(scheduled) == 1
+        scheduled[0]()
+        assert api.calls == 1
+        assert api.search_loans(page=1) == LIVE
+
+    def test_outage_prefers_snapshot_over_static(self, snapshot, monkeypatch):
+        store, _ = snapshot
+        store.put('route:loans?page=1', LIVE)
+        monkeypatch.setattr(SBA_Content, '_SNAPSHOT_MAX_AGE', -1)
+        page = _Api(STATIC).search_loans(page=1)
+        assert page['items'] == LIVE['items']
+        assert page['is_current'] is False and page['degraded'] is True
+        assert 'last-known live' in page['message']
+
+    def test_free_text_queries_bypass_snapshot(self, snapshot):
+        store, _ = snapshot
+        api = _Api(LIVE)
+        api.search_loans(query='504', page=1)
+        assert store.stats()['routes'] == 0
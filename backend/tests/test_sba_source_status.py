@@ -0,0 +1,95 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, reset_sba_breakers
+
+
+@pytest.fixture
+def clean_status(monkeypatch):
+    reset_sba_breakers()
+    SBA_Content._probe_results.clear()
+    SBA_Content._RATE_LIMITER.reset()
+    yield
+    SBA_Content._RATE_LIMITER.reset()
+    reset_sba_breakers()
+    SBA_Content._probe_results.clear()
+
+
+def _session(delay=0.0, status=200):
+    def get(*args, **kwargs):
+        time.sleep(delay)
+        return MagicMock(status_code=status)
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+def test_first_call_probes_concurrently(clean_status):
+    api = SBAContentAPI(session=_session(delay=0.3))
+    started = time.monotonic()
+    status = api.get_source_status()
+    assert time.monotonic() - started < 0.8
+    assert status['sbir_api']['ok'] is True
+    assert status['sbir_api']['via'] == 'probe'
+    assert api.session.get.call_count == 3
+
+
+def test_cached_probes_do_not_hit_network(clean_status):
+    api = SBAContentAPI(session=_session())
+    api.get_source_status()
+    api.get_source_status()
+    assert api.session.get.call_count == 3
+
+
+def test_passive_health_skips_probe(clean_status):
+    SBA_Content._BREAKERS['sbir'].record_failure('HTTP 503')
+    SBA_Content._BREAKERS['legacy_json'].record_success()
+    SBA_Content._BREAKERS['sba_html'].record_success()
+    api = SBAContentAPI(session=_session())
+
+    status = api.get_source_status()
+    assert api.session.get.call_count == 0
+    assert status['sbir_api']['ok'] is False
+    assert status['sbir_api']['via'] == 'passive'
+    assert status['sbir_api']['error'] == 'HTTP 503'
+
+
+def test_expired_probes_refresh_in_background(clean_status, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(SBA_Content, '_schedule_refresh', lambda key, fn: scheduled.append(key))
+    for name in SBA_Content._STATUS_SOURCES:
+        SBA_Content._probe_results[name] = {'ok': True, 'checked_at': time.time() - 3600}
+    api = SBAContentAPI(session=_session())
+
+    status = api.get_source_status()
+    assert api.session.get.call_count == 0
+    assert scheduled == ['status:probes']
+    assert status['sba_html']['ok'] is True
+
+
+def test_probe_skips_source_with_open_breaker(clean_status):
+    breaker = SBA_Content._BREAKERS['sbir']
+    for _ in range(20):
+        breaker.record_failure('HTTP 503')
+    assert breaker.state == 'open'
+    api = SBAContentAPI(session=_session())
+
+    result = api._probe_one('sbir_api')
+    assert api.session.get.call_count == 0
+    assert result['ok'] is False and result['error'] == 'circuit_open'
+
+
+def test_probe_shed_when_bucket_empty_keeps_previous_result(clean_status):
+    bucket = SBA_Content._RATE_LIMITER.for_url(SBA_Content.SBIR_API_BASE)
+    bucket.block_for(30)
+    previous = {'ok': True, 'checked_at': time.time() - 3600}
+    SBA_Content._probe_results['sbir_api'] = previous
+    api = SBAContentAPI(session=_session())
+
+    api._run_probes(['sbir_api'], deadline=1)
+    assert api.session.get.call_count == 0
+    assert SBA_Content._probe_results['sbir_api'] is previous
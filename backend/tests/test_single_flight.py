@@ -0,0 +1,83 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services import SBA_Content
+from backend.services.SBA_Content import SBAContentAPI, clear_sba_cache
+from backend.services.sba_http_cache import MemoryHTTPCache, set_http_cache
+from backend.services.single_flight import SingleFlight
+
+
+def _run_concurrently(n, target):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    return results
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = _run_concurrently(5, lambda: flight.do('k', slow))
+        assert results == ['value'] * 5
+        assert len(calls) == 1
+        stats = flight.stats()
+        assert stats['calls'] == 5
+        assert stats['leaders'] == 1
+        assert stats['coalesced'] == 4
+        assert stats['in_flight'] == 0
+
+    def test_error_propagates_to_waiters_and_key_is_released(self):
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            flight.do('k', lambda: (_ for _ in ()).throw(ValueError('boom')))
+        assert flight.do('k', lambda: 2) == 2
+        assert flight.stats()['errors'] == 1
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+        assert flight.do('a', lambda: 1) == 1
+        assert flight.do('a', lambda: 2) == 2
+        assert flight.stats()['coalesced'] == 0
+
+
+def test_concurrent_html_misses_fetch_once(monkeypatch):
+    set_http_cache(MemoryHTTPCache())
+    clear_sba_cache()
+    monkeypatch.setattr(SBA_Content, '_inflight', SingleFlight())
+    try:
+        def slow_get(*args, **kwargs):
+            time.sleep(0.2)
+            resp = MagicMock(status_code=200, text='<p>once</p>', headers={})
+            resp.raise_for_status = MagicMock()
+            return resp
+
+        session = MagicMock()
+        session.get.side_effect = slow_get
+        api = SBAContentAPI(session=session)
+
+        results = _run_concurrently(4, lambda: api._get_html('https://example.test/hot'))
+        assert results == ['<p>once</p>'] * 4
+        assert session.get.call_count == 1
+        assert api.get_source_status()['single_flight']['coalesced'] == 3
+    finally:
+        set_http_cache(None)
+        clear_sba_cache()
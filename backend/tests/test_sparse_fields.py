@@ -0,0 +1,76 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from backend.routes import rag as rag_routes
+from backend.routes import sba as sba_routes
+from backend.routes.rag import rag_bp
+from backend.services.sparse_fields import parse_fields, shape_payload
+
+from sba_testing import sba_app  # noqa: F401
+
+
+class TestShapePayload:
+    def test_parse_fields_tree(self):
+        assert parse_fields('items.id, items.title,count') == {'items': {'id': {}, 'title': {}}, 'count': {}}
+        assert parse_fields(['a', 'b.c']) == {'a': {}, 'b': {'c': {}}}
+        assert parse_fields('') is None and parse_fields(' , ') is None
+
+    def test_projection_walks_lists_and_keeps_error(self):
+        payload = {'items': [{'id': 1, 'title': 'A', 'body': 'x'}], 'count': 1, 'error': 'partial'}
+        out = shape_payload(payload, parse_fields('items.title'))
+        assert out == {'items': [{'title': 'A'}], 'error': 'partial'}
+
+    def test_compact_drops_only_equal_aliases(self):
+        items = [{'id': 'a', 'title': 'A', 'name': 'A', 'url': 'u', 'link': 'u', 'summary': 's', 'description': 'longer'}]
+        payload = {
+            'items': items, 'results': items, 'answer': 'hi', 'response': 'hi', 'message': 'other',
+            'digestion': {'groups': [{'id': 'loan', 'item_ids': ['a'], 'preview': [{'id': 'a'}]}]},
+        }
+        out = shape_payload(payload, compact_mode=True)
+        assert set(out) == {'items', 'answer', 'message', 'digestion'}
+        assert out['items'] == [{'id': 'a', 'title': 'A', 'url': 'u', 'summary': 's', 'description': 'longer'}]
+        assert out['digestion']['groups'] == [{'id': 'loan', 'item_ids': ['a']}]
+        assert 'results' in payload and 'preview' in payload['digestion']['groups'][0]
+
+    def test_no_options_is_identity(self):
+        payload = {'items': [], 'results': []}
+        assert shape_payload(payload) is payload
+
+
+@pytest.fixture
+def client(sba_app):
+    sba_app.register_blueprint(rag_bp, url_prefix='/api/rag')
+    return sba_app.test_client()
+
+
+class TestShapedRoutes:
+    def test_default_shape_unchanged_and_compact_smaller(self, client):
+        full = client.get('/api/sba/programs')
+        small = client.get('/api/sba/programs?compact=1')
+        assert full.get_json()['results'] == full.get_json()['items']
+        body = small.get_json()
+        assert 'results' not in body and body['items']
+        assert len(small.data) < 0.6 * len(full.data)
+        assert small.headers['ETag'] != full.headers['ETag']
+        again = client.get('/api/sba/programs?compact=1', headers={'If-None-Match': small.headers['ETag']})
+        assert again.status_code == 304
+
+    def test_fields_on_live_envelope(self, client):
+        page = {'items': [{'id': '7a', 'title': '7(a) loans'}], 'totalPages': 1, 'source': 'sba_html'}
+        with patch.object(sba_routes, 'sba_api') as api:
+            api.search_articles.return_value = page
+            resp = client.get('/api/sba/content/articles?fields=items.id,items.title,totalPages')
+        assert resp.get_json() == {'items': [{'id': '7a', 'title': '7(a) loans'}], 'totalPages': 1}
+        assert resp.headers['ETag'].startswith('W/')
+
+    def test_rag_compact_from_json_body(self, client):
+        kb = {'answer': 'Use the 7(a) program.', 'source_documents': [], 'mode': 'local_kb'}
+        with patch.object(rag_routes, '_local_kb_sba_answer', return_value=kb):
+            full = client.post('/api/rag', json={'query': '7a'}).get_json()
+            small = client.post('/api/rag', json={'query': '7a', 'compact': True}).get_json()
+        assert full['response'] == full['answer'] == full['message']
+        assert 'response' not in small and 'message' not in small and 'context' not in small
+        assert small['answer'] == full['answer']
+        assert json.dumps(small) != json.dumps(full)
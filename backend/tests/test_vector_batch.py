@@ -0,0 +1,157 @@
+import io
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from backend.routes import files
+from backend.services.chroma_fixed import ChromaService
+from backend.services.vector_batch import chunk_text, write_batches
+
+
+class FakeCollection:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def _record(self, op, documents, metadatas, ids, embeddings=None):
+        if self.fail_on and self.fail_on in ids:
+            raise RuntimeError('write rejected')
+        with self._lock:
+            self.calls.append((op, list(ids), embeddings))
+
+    def add(self, **kwargs):
+        self._record('add', **kwargs)
+
+    def upsert(self, **kwargs):
+        self._record('upsert', **kwargs)
+
+
+def _service(collection, embed=None):
+    svc = ChromaService.__new__(ChromaService)
+    svc.initialized = True
+    svc.collections = {'documents': collection}
+    svc.embedding_function = embed
+    return svc
+
+
+def _write_log():
+    calls = []
+
+    def write(texts, metadatas, ids, embeddings):
+        calls.append(list(ids))
+    return calls, write
+
+
+def test_write_batches_slices_and_counts():
+    calls, write = _write_log()
+    ids = [f'id{i}' for i in range(10)]
+    result = write_batches(write, ids, [{}] * 10, ids, batch_size=4, concurrency=1)
+    assert result['success'] and result['count'] == 10 and result['batches'] == 3
+    assert [len(c) for c in calls] == [4, 4, 2]
+
+
+def test_write_batches_embeds_once_per_slice():
+    embedded = []
+
+    def embed(texts):
+        embedded.append(len(texts))
+        return [[0.0] for _ in texts]
+
+    vectors = []
+    result = write_batches(lambda t, m, i, e: vectors.append(e), ['a'] * 5, [{}] * 5,
+                           list('abcde'), embed=embed, batch_size=2, concurrency=1)
+    assert result['count'] == 5
+    assert embedded == [2, 2, 1]
+    assert all(v is not None for v in vectors)
+
+
+def test_write_batches_runs_slices_concurrently():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def write(texts, metadatas, ids, embeddings):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    ids = [str(i) for i in range(8)]
+    result = write_batches(write, ids, [{}] * 8, ids, batch_size=2, concurrency=4)
+    assert result['count'] == 8
+    assert peak[0] > 1
+
+
+def test_write_batches_reports_partial_failure():
+    def write(texts, metadatas, ids, embeddings):
+        if 'bad' in ids:
+            raise RuntimeError('boom')
+
+    ids = ['a', 'b', 'bad', 'c']
+    result = write_batches(write, ids, [{}] * 4, ids, batch_size=2, concurrency=1)
+    assert not result['success']
+    assert result['count'] == 2
+    assert len(result['errors']) == 1 and 'error' not in result
+
+
+def test_write_batches_total_failure_sets_error():
+    def write(*args):
+        raise RuntimeError('down')
+
+    result = write_batches(write, ['a'], [{}], ['a'])
+    assert result['count'] == 0 and 'down' in result['error']
+
+
+def test_chunk_text_splits_with_overlap():
+    assert chunk_text('') == []
+    assert chunk_text('short') == ['short']
+    text = ' '.join(f'Sentence number {i} about SBA loans.' for i in range(100))
+    chunks = chunk_text(text, size=200, overlap=20)
+    assert len(chunks) > 1
+    assert all(len(c) <= 200 for c in chunks)
+    assert chunks[0].endswith('.')
+
+
+def test_chroma_service_batch_add_and_upsert():
+    collection = FakeCollection()
+    svc = _service(collection, embed=lambda texts: [[1.0] for _ in texts])
+    texts = [f'doc {i}' for i in range(5)]
+    result = svc.add_documents_batch(texts, ids=[f'd{i}' for i in range(5)], batch_size=2, concurrency=1)
+    assert result['success'] and result['count'] == 5
+    assert [op for op, _, _ in collection.calls] == ['add'] * 3
+    assert all(emb is not None for _, _, emb in collection.calls)
+
+    collection.calls.clear()
+    svc.upsert_documents(texts, [{}] * 5, [f'd{i}' for i in range(5)])
+    assert {op for op, _, _ in collection.calls} == {'upsert'}
+
+
+def test_chroma_service_batch_partial_failure():
+    svc = _service(FakeCollection(fail_on='d3'))
+    result = svc.add_documents_batch(['x'] * 4, [{}] * 4, ['d0', 'd1', 'd2', 'd3'], batch_size=2)
+    assert result['count'] == 2 and result['errors']
+
+
+def test_chroma_service_batch_uninitialized():
+    svc = _service(FakeCollection())
+    svc.initialized = False
+    assert 'error' in svc.add_documents_batch(['x'])
+
+
+def test_repeat_upload_gets_distinct_chunk_ids(tmp_path, monkeypatch):
+    monkeypatch.setattr(files, 'UPLOAD_FOLDER', str(tmp_path))
+    rag = MagicMock()
+    rag.is_available.return_value = True
+    rag.add_documents_batch.return_value = {'success': True, 'count': 1}
+    app = Flask(__name__)
+    with patch('backend.services.rag.get_rag_manager', return_value=rag):
+        for _ in range(2):
+            with app.test_request_context(method='POST', data={'file': (io.BytesIO(b'SBA notes'), 'notes.txt')}):
+                body, status = files.process_upload()
+                assert status == 200
+    ids = [call.args[2][0] for call in rag.add_documents_batch.call_args_list]
+    assert len(ids) == 2 and ids[0] != ids[1]
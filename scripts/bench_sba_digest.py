@@ -0,0 +1,58 @@
+"""
+Micro-benchmark for the /api/sba envelope digest (``_digest_payload``).
+
+Times one digest per envelope at catalog-sized item lists: ``cold`` clears
+the memo before every call (single-pass build + freeze), ``memo`` repeats the
+same items (the common case: every page view of a cached catalog).
+
+    python scripts/bench_sba_digest.py [--runs 200]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.routes.sba import _DIGESTS, _digest_payload  # noqa: E402
+
+TYPES = ['program', 'loan', 'guide', 'article', 'office', 'event', 'course', 'document']
+
+
+def _items(n):
+    return [
+        {
+            'id': f'item-{i}',
+            'type': TYPES[i % len(TYPES)],
+            'title': f'SBA resource {i}',
+            'path': f'/api/sba/content/{TYPES[i % len(TYPES)]}s' if i % 3 == 0 else '',
+            'url': f'https://www.sba.gov/resource/{i}',
+            'resources': [{'name': 'Guide'}] if i % 4 == 0 else [],
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    kwargs = dict(route='/api/sba/content/articles', title='Articles', source='sba_html', is_current=True)
+    print(f"{'items':>6} {'cold us':>10} {'memo us':>10} {'speedup':>8}")
+    for n in (20, 100, 500, 2000):
+        items = _items(n)
+
+        def cold():
+            _DIGESTS.clear()
+            _digest_payload(items, **kwargs)
+
+        cold_s = min(timeit.repeat(cold, number=args.runs, repeat=3)) / args.runs
+        _digest_payload(items, **kwargs)
+        memo_s = min(timeit.repeat(lambda: _digest_payload(items, **kwargs), number=args.runs, repeat=3)) / args.runs
+        print(f'{n:>6} {cold_s * 1e6:>10.1f} {memo_s * 1e6:>10.1f} {cold_s / memo_s:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
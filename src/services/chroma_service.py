@@ -141,24 +141,30 @@ class ChromaService:
                 "count": 0
             }
             
+        # Bounded slices: one embedding call + one write per CHROMA_BATCH_SIZE chunks
+        batch_size = max(1, config.CHROMA_BATCH_SIZE)
+        added = 0
         try:
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
-            print(f"Successfully added {len(documents)} documents to ChromaDB")
+            for start in range(0, len(documents), batch_size):
+                end = start + batch_size
+                self.collection.add(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
+                added += len(documents[start:end])
+            print(f"Successfully added {added} documents to ChromaDB")
             return {
                 "success": True,
-                "count": len(documents),
-                "message": f"Added {len(documents)} documents"
+                "count": added,
+                "message": f"Added {added} documents"
             }
         except Exception as e:
             print(f"Error adding documents to ChromaDB: {e}")
             return {
                 "success": False,
                 "error": str(e),
-                "count": 0
+                "count": added
             }
     
     def query_documents(self, 
@@ -54,13 +54,13 @@ class DocumentProcessor:
                 documents.append(chunk)
             
             # Add to ChromaDB
-            success = self.chroma_service.add_documents(
+            result = self.chroma_service.add_documents(
                 documents=documents,
                 metadatas=metadatas,
                 ids=ids
             )
             
-            if success:
+            if result.get("success"):
                 return {
                     "success": True,
                     "message": f"Successfully processed {filename}",
@@ -70,7 +70,7 @@ class DocumentProcessor:
             else:
                 return {
                     "success": False,
-                    "error": "Failed to add documents to vector database"
+                    "error": result.get("error") or "Failed to add documents to vector database"
                 }
         
         except Exception as e:
@@ -38,6 +38,7 @@ class Config:
     EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
     CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', '500'))
     CHUNK_OVERLAP = int(os.getenv('CHUNK_OVERLAP', '50'))
+    CHROMA_BATCH_SIZE = int(os.getenv('CHROMA_BATCH_SIZE', '64'))
     
     # Search Configuration
     DEFAULT_TOP_K = int(os.getenv('DEFAULT_TOP_K', '3'))